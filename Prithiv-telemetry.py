@@ -2,17 +2,16 @@
 import tkinter as tk
 from tkinter import ttk
 import time
-import serial
 import sys
-import os
-import csv
 
-TEMP_RANGE = (20, 40)
-HUM_RANGE = (30, 70)
+from groundstation.station import GroundStation
+from groundstation.telemetry_codec import HUM_RANGE, TEMP_RANGE
+
+UI_REFRESH_MS = 50  # telemetry widgets are updated at 20 Hz
 
 try:
-    ser = serial.Serial('COM11', 9600, timeout=0)
-    time.sleep(2)
+    # The station owns the port: ingest, logging and command writes run on its threads
+    station = GroundStation.connect('COM11', 9600).start()
 except Exception as e:
     print("Serial error:", e)
     sys.exit()
@@ -91,17 +90,17 @@ class RoverApp(tk.Tk):
 
             self.labels[key] = (value_lbl, rng)
 
-        # CSV
-        self.csv_path = "telemetry.csv"
-        self.fieldnames = ["timestamp"] + [key for key, _, _ in specs]
-        if not os.path.isfile(self.csv_path):
-            with open(self.csv_path, "w", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writeheader()
+        # Telemetry comes from the station. Its log is binary segments in telemetry/ with
+        # the link metrics, export with: python -m groundstation.telemetry_store telemetry -o telemetry.csv
+        self.station = station
+        self.codec = station.codec
+        self.telemetry = station.subscribe()
 
         # Status
         self.status_lbl = ttk.Label(control_frame, text="● Disconnected", style="Status.TLabel")
-        self.status_lbl.pack(pady=(0, 10))
+        self.status_lbl.pack(pady=(0, 4))
+        self.link_lbl = ttk.Label(control_frame, text="", style="Name.TLabel", wraplength=220)
+        self.link_lbl.pack(pady=(0, 10))
 
         # Controls
         ttk.Label(control_frame, text="Drive: W/A/S/D ● Brake: Space", style="Name.TLabel").pack(anchor="w")
@@ -129,9 +128,8 @@ class RoverApp(tk.Tk):
             self.bind(f"<KeyRelease-{k}>", self.on_release)
         self.focus_set()
 
-        self.after(10, self.read_serial)
+        self.after(UI_REFRESH_MS, self.apply_telemetry)
         self.after(200, self.check_conn)
-        self.after(10, self.send_cmd)
         self.after(50, self.update_servo_angles)
 
     def on_press(self, e):
@@ -151,10 +149,7 @@ class RoverApp(tk.Tk):
         else: c = 'F'
         self.current_cmd = c
         self.cmd_lbl["text"] = c
-
-    def send_cmd(self):
-        ser.write(self.current_cmd.encode())
-        self.after(10, self.send_cmd)
+        self.station.drive(c)
 
     def update_servo_angles(self):
         changed = False
@@ -162,27 +157,27 @@ class RoverApp(tk.Tk):
 
         if "o" in self.pressed:
             self.angle1 = max(0, self.angle1 - step)
-            ser.write(b"o")
+            self.station.servo(b"o")
             changed = True
         if "p" in self.pressed:
             self.angle1 = min(270, self.angle1 + step)
-            ser.write(b"p")
+            self.station.servo(b"p")
             changed = True
         if "k" in self.pressed:
             self.angle2 = max(0, self.angle2 - step)
-            ser.write(b"k")
+            self.station.servo(b"k")
             changed = True
         if "l" in self.pressed:
             self.angle2 = min(180, self.angle2 + step)
-            ser.write(b"l")
+            self.station.servo(b"l")
             changed = True
         if "n" in self.pressed:
             self.angle3 = max(0, self.angle3 - step)
-            ser.write(b"n")
+            self.station.servo(b"n")
             changed = True
         if "m" in self.pressed:
             self.angle3 = min(180, self.angle3 + step)
-            ser.write(b"mw")
+            self.station.servo(b"m")
             changed = True
 
         if changed:
@@ -192,46 +187,35 @@ class RoverApp(tk.Tk):
 
         self.after(50, self.update_servo_angles)
 
-    def read_serial(self):
-        raw = ser.read(ser.in_waiting or 1)
-        for packet in raw.decode(errors='ignore').splitlines():
-            line = packet.strip()
-            if not line:
-                continue
-            parts = dict(pair.split(":", 1) for pair in line.split(",") if ":" in pair)
-            row = {"timestamp": time.time()}
-            for k in self.fieldnames:
-                if k != "timestamp":
-                    row[k] = parts.get(k, "")
-            with open(self.csv_path, "a", newline="") as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writerow(row)
-
+    def apply_telemetry(self):
+        # Only the latest value per field since the last refresh reaches the widgets
+        latest, count = self.telemetry.drain()
+        if count:
             self.last_tel = time.time()
-            for keyval in line.split(","):
-                if ":" not in keyval:
-                    continue
-                k, v = keyval.split(":", 1)
+            for k, v in latest.items():
                 lbl_tuple = self.labels.get(k)
                 if not lbl_tuple:
                     continue
                 lbl, rng = lbl_tuple
                 lbl["text"] = v
                 if rng:
-                    try:
-                        val = float(v)
-                        lbl["background"] = "green" if rng[0] <= val <= rng[1] else "red"
+                    ok = self.codec.in_range(k, v)
+                    if ok is None:
+                        lbl["background"] = "yellow"  # Not a number
+                    else:
+                        lbl["background"] = "green" if ok else "red"
                         pb, (mn, mx) = self.bars[k]
-                        pb["value"] = max(0, min(val - mn, mx - mn))
-                    except:
-                        lbl["background"] = "yellow"
+                        pb["value"] = max(0, min(v - mn, mx - mn))
                 else:
                     lbl["background"] = "#3C3F41"
             self.status_lbl["text"] = "● Connected"
 
-        self.after(10, self.read_serial)
+        self.after(UI_REFRESH_MS, self.apply_telemetry)
 
     def check_conn(self):
+        self.title(f"FireFlies Rover Dashboard - link {self.station.utilization():.0%}, "
+                   f"{self.codec.malformed} malformed packets")
+        self.link_lbl["text"] = self.station.metrics.summary()
         if time.time() - self.last_tel > 3:
             self.status_lbl["text"] = "● Disconnected"
             for lbl, _ in self.labels.values():
@@ -242,8 +226,8 @@ class RoverApp(tk.Tk):
         self.after(200, self.check_conn)
 
     def on_close(self):
-        ser.write(b"F")
-        ser.close()
+        self.telemetry.close()
+        station.stop()
         self.destroy()
 
 if __name__ == "__main__":
@@ -1,10 +1,37 @@
+import os
+import sys
+import time
+from collections import namedtuple
+
 import cv2
 import cv2.aruco as aruco
 import numpy as np
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from detection.pose import estimate_marker_poses
+from detection.tag_utils import debounce_tag
+
+# How calibrated frames are corrected:
+#   "remap"  - undistort the whole frame with cached rectification maps
+#   "points" - leave the frame as is and undistort only the detected corners
+UNDISTORT_MODES = ("remap", "points")
+
+# Everything found in one detection pass:
+#   ids        (N,) int32
+#   corners    (N, 4, 2) float32 pixel corners
+#   rvecs      (N, 3) rotation vectors, None without calibration/marker_length
+#   tvecs      (N, 3) translations in marker_length units, None like rvecs
+#   dictionary ArUco dictionary constant that produced the hit (None on a miss)
+#   frame      annotated frame
+TagDetections = namedtuple("TagDetections", ["ids", "corners", "rvecs", "tvecs", "dictionary", "frame"])
+
 class ArUcoDetector:
-    def __init__(self, camera_id=1, calib_file=None):
-        self.cap = cv2.VideoCapture(camera_id)
+    def __init__(self, camera_id=1, calib_file=None, lock_on=False, miss_limit=5, sweep_budget=3,
+                 undistort_mode="remap", track=False, roi_padding=0.5, full_scan_every=15,
+                 roi_max_size=320, confirm_threshold=3, marker_length=None, source=None):
+        # Any object with the cv2.VideoCapture read/release/isOpened/get interface
+        # can replace the camera, see detection/frame_sources.py
+        self.cap = source if source is not None else cv2.VideoCapture(camera_id)
         if not self.cap.isOpened():
             raise Exception(f"Cannot open camera with ID {camera_id}")
 
@@ -31,6 +58,37 @@ class ArUcoDetector:
 
         self.parameters = aruco.DetectorParameters()
 
+        # Build every dictionary once instead of on every frame
+        self.dictionaries = [(dict_id, aruco.getPredefinedDictionary(dict_id)) for dict_id in self.aruco_dicts]
+
+        # Lock-on mode: stick to the dictionary that last produced a hit and only
+        # sweep the others (a few per frame, round-robin) after miss_limit misses
+        self.lock_on = lock_on
+        self.miss_limit = miss_limit
+        self.sweep_budget = sweep_budget
+        self.locked_index = None
+        self.miss_count = 0
+        self.sweep_pos = 0
+
+        # Tracking mode: once a tag is confirmed, search only a padded box around
+        # its last corners and fall back to a full-frame scan on a miss or every
+        # full_scan_every frames. ROIs larger than roi_max_size are pyrDown'ed.
+        self.track = track
+        self.roi_padding = roi_padding
+        self.full_scan_every = full_scan_every
+        self.roi_max_size = roi_max_size
+        self.confirm_threshold = confirm_threshold
+        self.track_box = None
+        self.track_index = None
+        self.frames_since_full_scan = 0
+        self.tracked_tag = None
+        self.tag_count = 0
+        self.tag_confirmed = False
+
+        # Dictionary index of the last hit and detection latency of the last frame in milliseconds
+        self.last_dict_index = None
+        self.last_latency_ms = None
+
         # Skip calibration if not provided
         self.use_calibration = calib_file is not None
         if self.use_calibration:
@@ -41,26 +99,221 @@ class ArUcoDetector:
             except Exception as e:
                 raise FileNotFoundError(f"❌ Failed to load calibration file: {e}")
 
+            if undistort_mode not in UNDISTORT_MODES:
+                raise ValueError(f"Unknown undistort mode: {undistort_mode}")
+            self.undistort_mode = undistort_mode
+
+            # Rectification maps keyed by (width, height), built once per resolution
+            self.undistort_maps = {}
+            width = int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+            height = int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+            if self.undistort_mode == "remap" and width > 0 and height > 0:
+                self._get_undistort_maps(width, height)
+
+        # Printed marker side length, enables pose estimation together with calibration
+        self.marker_length = marker_length
+
+        # Undistorted corners of the last detection (only set in "points" mode)
+        self.last_undistorted_corners = None
+
     def get_tag(self):
         ret, frame = self.cap.read()
         if not ret:
             print("[ERROR] Frame capture failed.")
             return None, None
+        return self.process_frame(frame)
 
-        if self.use_calibration:
-            frame = cv2.undistort(frame, self.camera_matrix, self.dist_coeffs)
+    def process_frame(self, frame):
+        """
+        Undistorts and runs detection on an already captured frame.
+        Returns (tag_id, frame) like get_tag.
+        """
+        tags = self.process_frame_tags(frame)
+        if len(tags.ids):
+            return tags.ids[0], tags.frame  # Return first found tag
+        return None, tags.frame
+
+    def get_tags(self):
+        """
+        Captures a frame and returns every detected marker (with poses when
+        possible) as TagDetections, or None if the capture failed.
+        """
+        ret, frame = self.cap.read()
+        if not ret:
+            print("[ERROR] Frame capture failed.")
+            return None
+        return self.process_frame_tags(frame)
+
+    def process_frame_tags(self, frame):
+        if self.use_calibration and self.undistort_mode == "remap":
+            frame = self.undistort(frame)
 
         gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
 
-        # Try all dictionaries one by one
-        for dict_id in self.aruco_dicts:
-            aruco_dict = aruco.getPredefinedDictionary(dict_id)
-            corners, ids, _ = aruco.detectMarkers(gray, aruco_dict, parameters=self.parameters)
+        corners, ids = self.detect(gray)
+        if ids is None:
+            self.last_undistorted_corners = None
+            return TagDetections(np.empty(0, dtype=np.int32), np.empty((0, 4, 2), dtype=np.float32),
+                                 None, None, None, frame)
+
+        aruco.drawDetectedMarkers(frame, corners, ids)
+        ids = ids.reshape(-1).astype(np.int32)
+        corners = np.asarray(corners, dtype=np.float32).reshape(-1, 4, 2)
+        dictionary = self.dictionaries[self.last_dict_index][0]
+
+        rvecs = tvecs = None
+        if self.use_calibration:
+            if self.undistort_mode == "points":
+                self.last_undistorted_corners = self.undistort_corners(corners)
+            if self.marker_length:
+                # Corners are distortion-free in both modes at this point
+                ideal = corners if self.undistort_mode == "remap" else self.last_undistorted_corners
+                rvecs, tvecs = estimate_marker_poses(ideal, self.marker_length, self.camera_matrix)
+        return TagDetections(ids, corners, rvecs, tvecs, dictionary, frame)
 
+    def _get_undistort_maps(self, width, height):
+        maps = self.undistort_maps.get((width, height))
+        if maps is None:
+            # Same mapping cv2.undistort computes internally, but only once
+            maps = cv2.initUndistortRectifyMap(
+                self.camera_matrix, self.dist_coeffs, None, self.camera_matrix,
+                (width, height), cv2.CV_16SC2
+            )
+            self.undistort_maps[(width, height)] = maps
+        return maps
+
+    def undistort(self, frame):
+        height, width = frame.shape[:2]
+        map1, map2 = self._get_undistort_maps(width, height)
+        return cv2.remap(frame, map1, map2, cv2.INTER_LINEAR)
+
+    def undistort_corners(self, corners):
+        """
+        Undistorts detected marker corners into pixel coordinates of the
+        corrected image. Returns an (N, 4, 2) float32 array.
+        """
+        points = np.asarray(corners, dtype=np.float32).reshape(-1, 1, 2)
+        points = cv2.undistortPoints(points, self.camera_matrix, self.dist_coeffs, P=self.camera_matrix)
+        return points.reshape(-1, 4, 2)
+
+    def detect(self, gray):
+        """
+        Runs marker detection on a grayscale frame and records its latency.
+        Returns (corners, ids), ids is None when nothing was found.
+        """
+        start = time.perf_counter()
+        index = corners = ids = None
+
+        if self.track and self.track_box is not None and self.frames_since_full_scan < self.full_scan_every:
+            index, corners, ids = self._detect_roi(gray)
+            self.frames_since_full_scan += 1
+
+        if ids is None:
+            index, corners, ids = self._detect_full(gray)
+            self.frames_since_full_scan = 0
+
+        self.last_dict_index = index
+        if self.track:
+            self._update_track(gray, index, corners, ids)
+        self.last_latency_ms = (time.perf_counter() - start) * 1000.0
+        return corners, ids
+
+    def _detect_full(self, gray):
+        if self.lock_on:
+            return self._detect_locked(gray)
+        return self._detect_sweep(gray, range(len(self.dictionaries)))
+
+    def _detect_roi(self, gray):
+        x0, y0, x1, y1 = self.track_box
+        roi = gray[y0:y1, x0:x1]
+
+        # Close-up tags: detect on a downscaled pyramid level of the ROI
+        scale = 1
+        while self.roi_max_size and max(roi.shape[:2]) > self.roi_max_size:
+            roi = cv2.pyrDown(roi)
+            scale *= 2
+
+        index, corners, ids = self._detect_sweep(roi, [self.track_index])
+        if ids is None:
+            return None, None, None
+        if self.lock_on and index == self.locked_index:
+            self.miss_count = 0
+
+        # Back to full-frame pixel coordinates
+        offset = np.array([x0, y0], dtype=np.float32)
+        corners = tuple((c * scale + offset).astype(np.float32) for c in corners)
+        return index, corners, ids
+
+    def _update_track(self, gray, index, corners, ids):
+        if ids is None:
+            self.track_box = None
+            self.tracked_tag = None
+            self.tag_count = 0
+            self.tag_confirmed = False
+            return
+
+        # Only start ROI tracking once the same tag was seen confirm_threshold times in a row
+        self.tracked_tag, self.tag_count, self.tag_confirmed = debounce_tag(
+            self.tracked_tag, ids[0][0], self.tag_count, self.confirm_threshold
+        )
+        if not self.tag_confirmed:
+            self.track_box = None
+            return
+
+        points = np.concatenate([c.reshape(-1, 2) for c in corners])
+        x_min, y_min = points.min(axis=0)
+        x_max, y_max = points.max(axis=0)
+        pad = self.roi_padding * max(x_max - x_min, y_max - y_min)
+        height, width = gray.shape[:2]
+        self.track_box = (
+            max(0, int(x_min - pad)),
+            max(0, int(y_min - pad)),
+            min(width, int(x_max + pad) + 1),
+            min(height, int(y_max + pad) + 1),
+        )
+        self.track_index = index
+
+    def _detect_sweep(self, gray, indices):
+        # Try the given dictionaries one by one, first hit wins
+        for index in indices:
+            _, aruco_dict = self.dictionaries[index]
+            corners, ids, _ = aruco.detectMarkers(gray, aruco_dict, parameters=self.parameters)
             if ids is not None:
-                aruco.drawDetectedMarkers(frame, corners, ids)
-                return ids[0][0], frame  # Return first found tag
-        return None, frame
+                return index, corners, ids
+        return None, None, None
+
+    def _detect_locked(self, gray):
+        count = len(self.dictionaries)
+
+        # Nothing locked yet: full sweep, lock onto whatever hits
+        if self.locked_index is None:
+            index, corners, ids = self._detect_sweep(gray, range(count))
+            if index is not None:
+                self.locked_index = index
+                self.miss_count = 0
+            return index, corners, ids
+
+        index, corners, ids = self._detect_sweep(gray, [self.locked_index])
+        if index is not None:
+            self.miss_count = 0
+            return index, corners, ids
+
+        self.miss_count += 1
+        if self.miss_count < self.miss_limit:
+            return None, None, None
+
+        # Locked dictionary keeps missing: try a few of the others this frame
+        others = [i for i in range(count) if i != self.locked_index]
+        budget = min(self.sweep_budget, len(others))
+        start = self.sweep_pos % len(others)
+        batch = [others[(start + i) % len(others)] for i in range(budget)]
+        self.sweep_pos = (start + budget) % len(others)
+
+        index, corners, ids = self._detect_sweep(gray, batch)
+        if index is not None:
+            self.locked_index = index
+            self.miss_count = 0
+        return index, corners, ids
 
     def release(self):
         self.cap.release()
@@ -68,13 +321,15 @@ class ArUcoDetector:
 
 # === Main Execution ===
 if __name__ == "__main__":
-    detector = ArUcoDetector(camera_id=0)  # 👈 no config file
+    detector = ArUcoDetector(camera_id=0, lock_on=True, track=True)  # 👈 no config file
 
     while True:
         tag_id, frame = detector.get_tag()
         if frame is not None:
             if tag_id is not None:
                 print(f"✅ Detected ArUco Tag ID: {tag_id}")
+            if detector.last_latency_ms is not None:
+                print(f"⏱️ Detection: {detector.last_latency_ms:.1f} ms", end='\r')
             cv2.imshow("ArUco Detection", frame)
 
         if cv2.waitKey(1) & 0xFF == 27:  # ESC key
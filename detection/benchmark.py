@@ -0,0 +1,91 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from detection.aruco_detector import ArUcoDetector
+from detection.frame_sources import open_source
+
+# Detector settings compared by the benchmark, "sweep" is the original behaviour
+MODES = {
+    "sweep": {},
+    "lock": {"lock_on": True},
+    "track": {"lock_on": True, "track": True},
+}
+
+
+def run_mode(source_spec, mode, max_frames=None, calib_file=None):
+    """
+    Runs one detector mode over a frame source.
+    Returns a dict with frames, fps, p50/p99 latency (ms) and detection rate.
+    """
+    source = open_source(source_spec)
+    detector = ArUcoDetector(calib_file=calib_file, source=source, **MODES[mode])
+
+    latencies = []
+    hits = 0
+    try:
+        while max_frames is None or len(latencies) < max_frames:
+            ret, frame = source.read()
+            if not ret:
+                break
+            start = time.perf_counter()
+            tags = detector.process_frame_tags(frame)
+            latencies.append(time.perf_counter() - start)
+            if len(tags.ids):
+                hits += 1
+    finally:
+        source.release()
+
+    if not latencies:
+        return None
+    latencies = np.array(latencies) * 1000.0
+    return {
+        "frames": len(latencies),
+        "fps": len(latencies) / (latencies.sum() / 1000.0),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+        "detection_rate": hits / len(latencies),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline ArUcoDetector benchmark")
+    parser.add_argument("source", nargs="?", default="synthetic",
+                        help="camera index, video file, image directory or synthetic[:count]")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma separated, from: " + ", ".join(MODES))
+    parser.add_argument("--frames", type=int, default=None, help="stop after this many frames per mode")
+    parser.add_argument("--calib", default=None, help="camera_config.npz to enable undistortion")
+    parser.add_argument("--min-fps", type=float, default=None, help="fail if any mode is slower than this")
+    args = parser.parse_args(argv)
+
+    failed = False
+    baseline = None
+    print(f"{'mode':<8} {'frames':>7} {'fps':>9} {'p50 ms':>8} {'p99 ms':>8} {'detect':>7} {'speedup':>8}")
+    for mode in args.modes.split(","):
+        if mode not in MODES:
+            print(f"[ERROR] Unknown mode: {mode}")
+            return 2
+        stats = run_mode(args.source, mode, args.frames, args.calib)
+        if stats is None:
+            print(f"[ERROR] No frames from source {args.source}")
+            return 2
+        if baseline is None:
+            baseline = stats["fps"]
+        print(f"{mode:<8} {stats['frames']:>7} {stats['fps']:>9.1f} {stats['p50_ms']:>8.2f} "
+              f"{stats['p99_ms']:>8.2f} {stats['detection_rate']:>7.1%} {stats['fps'] / baseline:>7.1f}x")
+        if args.min_fps is not None and stats["fps"] < args.min_fps:
+            failed = True
+
+    if failed:
+        print(f"❌ At least one mode is below {args.min_fps} fps")
+        return 1
+    return 0
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    sys.exit(main())
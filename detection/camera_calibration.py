@@ -1,33 +1,128 @@
 import cv2
 import numpy as np
 import os
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 
 # Settings
 CHESSBOARD_SIZE = (9, 6)
 CALIBRATION_IMAGES_DIR = "calibration_images"
 CALIBRATION_FILE = "camera_config.npz"
+CORNER_CACHE_FILE = os.path.join(CALIBRATION_IMAGES_DIR, "corner_cache.npz")
 
 criteria = (cv2.TERM_CRITERIA_EPS + cv2.TERM_CRITERIA_MAX_ITER, 30, 0.001)
+SUBPIX_WINDOW = (11, 11)
+SUBPIX_ZERO_ZONE = (-1, -1)
+# Everything the cached corners depend on besides the image itself
+DETECTION_SETTINGS = repr((CHESSBOARD_SIZE, criteria, SUBPIX_WINDOW, SUBPIX_ZERO_ZONE)).encode()
 objp = np.zeros((CHESSBOARD_SIZE[0]*CHESSBOARD_SIZE[1], 3), np.float32)
 objp[:, :2] = np.mgrid[0:CHESSBOARD_SIZE[0], 0:CHESSBOARD_SIZE[1]].T.reshape(-1, 2)
 
-objpoints = []
-imgpoints = []
 
-images = [f for f in os.listdir(CALIBRATION_IMAGES_DIR) if f.endswith(".jpg") or f.endswith(".png")]
-for fname in images:
-    img = cv2.imread(os.path.join(CALIBRATION_IMAGES_DIR, fname))
+def file_hash(path):
+    """Cache key: SHA1 of the detection settings and the image content."""
+    h = hashlib.sha1(DETECTION_SETTINGS)
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def find_corners(path):
+    """
+    Worker: returns (image_size, corners) for one image, corners is None
+    when no chessboard was found.
+    """
+    img = cv2.imread(path)
+    if img is None:
+        return None, None
     gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     ret, corners = cv2.findChessboardCorners(gray, CHESSBOARD_SIZE, None)
+    if not ret:
+        return gray.shape[::-1], None
+    corners2 = cv2.cornerSubPix(gray, corners, SUBPIX_WINDOW, SUBPIX_ZERO_ZONE, criteria)
+    return gray.shape[::-1], corners2
+
+
+def load_cache(path):
+    # {hash: (image_size, corners or None)}
+    cache = {}
+    if not os.path.isfile(path):
+        return cache
+    with np.load(path) as data:
+        for key in data.files:
+            if key.endswith("_size"):
+                h = key[:-len("_size")]
+                corners = data[h + "_corners"]
+                cache[h] = (tuple(int(v) for v in data[key]), corners if corners.size else None)
+    return cache
+
+
+def save_cache(path, cache):
+    arrays = {}
+    for h, (size, corners) in cache.items():
+        arrays[h + "_size"] = np.array(size)
+        arrays[h + "_corners"] = corners if corners is not None else np.empty((0, 1, 2), np.float32)
+    np.savez(path, **arrays)
+
+
+def detect_all(paths, workers=None):
+    """
+    Finds chessboard corners in all images, reusing cached results for
+    images whose content hash has been seen before with the same settings.
+    Returns a list of (name, image_size, corners) in the order of paths.
+    """
+    cache = load_cache(CORNER_CACHE_FILE)
+    hashes = [file_hash(p) for p in paths]
+    todo = [(p, h) for p, h in zip(paths, hashes) if h not in cache]
+    print(f"{len(paths) - len(todo)} cached, {len(todo)} new image(s) to process")
 
-    if ret:
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for (p, h), (size, corners) in zip(todo, pool.map(find_corners, [p for p, _ in todo])):
+                if size is None:
+                    print(f"[WARNING] Could not read {p}")
+                    continue
+                cache[h] = (size, corners)
+        save_cache(CORNER_CACHE_FILE, cache)
+
+    return [(os.path.basename(p),) + cache[h] for p, h in zip(paths, hashes) if h in cache]
+
+
+def main():
+    images = sorted(f for f in os.listdir(CALIBRATION_IMAGES_DIR) if f.endswith(".jpg") or f.endswith(".png"))
+    results = detect_all([os.path.join(CALIBRATION_IMAGES_DIR, f) for f in images])
+
+    names = []
+    objpoints = []
+    imgpoints = []
+    image_size = None
+    for name, size, corners in results:
+        if corners is None:
+            continue
+        names.append(name)
         objpoints.append(objp)
-        corners2 = cv2.cornerSubPix(gray, corners, (11,11), (-1,-1), criteria)
-        imgpoints.append(corners2)
+        imgpoints.append(corners)
+        image_size = size
+
+    if not imgpoints:
+        print("❌ No chessboard found in any calibration image.")
+        return
+
+    # Calibration
+    ret, camera_matrix, dist_coeffs, rvecs, tvecs = cv2.calibrateCamera(objpoints, imgpoints, image_size, None, None)
+
+    # Per-image reprojection error
+    print(f"Used {len(imgpoints)}/{len(images)} images, RMS reprojection error: {ret:.4f} px")
+    for name, points, rvec, tvec in zip(names, imgpoints, rvecs, tvecs):
+        projected, _ = cv2.projectPoints(objp, rvec, tvec, camera_matrix, dist_coeffs)
+        error = np.sqrt(np.mean(np.sum((projected - points) ** 2, axis=2)))
+        print(f"  {name}: {error:.4f} px")
+
+    # Save
+    np.savez(CALIBRATION_FILE, camera_matrix=camera_matrix, dist_coeffs=dist_coeffs)
+    print("Calibration complete. Saved to", CALIBRATION_FILE)
 
-# Calibration
-ret, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(objpoints, imgpoints, gray.shape[::-1], None, None)
 
-# Save
-np.savez(CALIBRATION_FILE, camera_matrix=camera_matrix, dist_coeffs=dist_coeffs)
-print("Calibration complete. Saved to", CALIBRATION_FILE)
+if __name__ == "__main__":
+    main()
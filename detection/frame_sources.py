@@ -0,0 +1,133 @@
+import os
+
+import cv2
+import cv2.aruco as aruco
+import numpy as np
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp")
+
+
+class FrameSource:
+    """
+    Minimal stand-in for cv2.VideoCapture so ArUcoDetector can run on
+    recorded or generated frames without a camera.
+    """
+
+    def __init__(self, frames=None, loop=False):
+        self.frames = frames if frames is not None else []
+        self.loop = loop
+        self.index = 0
+
+    def isOpened(self):
+        return len(self.frames) > 0
+
+    def read(self):
+        if self.index >= len(self.frames):
+            if not self.loop or not self.frames:
+                return False, None
+            self.index = 0
+        frame = self.frames[self.index]
+        self.index += 1
+        return True, frame.copy()
+
+    def get(self, prop):
+        if not self.frames:
+            return 0
+        if prop == cv2.CAP_PROP_FRAME_WIDTH:
+            return self.frames[0].shape[1]
+        if prop == cv2.CAP_PROP_FRAME_HEIGHT:
+            return self.frames[0].shape[0]
+        if prop == cv2.CAP_PROP_FRAME_COUNT:
+            return len(self.frames)
+        return 0
+
+    def release(self):
+        self.frames = []
+
+
+class ImageDirectorySource(FrameSource):
+    """Frames from every image in a directory, sorted by file name and preloaded."""
+
+    def __init__(self, path, loop=False):
+        names = sorted(f for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTENSIONS))
+        frames = []
+        for name in names:
+            img = cv2.imread(os.path.join(path, name))
+            if img is None:
+                print(f"[WARNING] Could not read {name}")
+                continue
+            frames.append(img)
+        super().__init__(frames, loop)
+
+
+class SyntheticMarkerSource(FrameSource):
+    """
+    Generated frames with a randomly placed, scaled and rotated marker on a
+    smooth random background. Frames come in scenes of `hold` frames where
+    the marker drifts slightly, like a rover camera approaching a tag; a
+    share of scenes (empty_ratio) has no marker at all.
+    The expected ids of each frame are kept in self.truth.
+    """
+
+    def __init__(self, count=300, size=(640, 480), dict_id=aruco.DICT_6X6_250, marker_ids=(0, 7, 23, 42),
+                 empty_ratio=0.2, hold=15, seed=0, loop=False):
+        rng = np.random.default_rng(seed)
+        aruco_dict = aruco.getPredefinedDictionary(dict_id)
+        width, height = size
+
+        frames = []
+        self.truth = []
+        for i in range(count):
+            if i % hold == 0:
+                coarse = rng.integers(80, 180, size=(height // 32 + 1, width // 32 + 1), dtype=np.uint8)
+                background = cv2.resize(coarse, (width, height), interpolation=cv2.INTER_LINEAR)
+                marker_id = None
+                if rng.random() >= empty_ratio:
+                    marker_id = int(rng.choice(marker_ids))
+                    side = int(rng.uniform(0.1, 0.3) * min(width, height))
+                    marker = aruco.generateImageMarker(aruco_dict, marker_id, side)
+                    angle = rng.uniform(-30, 30)
+                    position = rng.uniform(0.1, 0.6, size=2)
+
+            frame = background.copy()
+            ids = []
+            if marker_id is not None:
+                position = np.clip(position + rng.normal(0, 0.005, size=2), 0.0, 0.7)
+                self._paste_marker(frame, marker, angle, position)
+                ids.append(marker_id)
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR))
+            self.truth.append(ids)
+        super().__init__(frames, loop)
+
+    @staticmethod
+    def _paste_marker(frame, marker, angle, position):
+        height, width = frame.shape
+        side = marker.shape[0]
+        # White quiet zone around the marker so it stays detectable
+        border = side // 4
+        tile = cv2.copyMakeBorder(marker, border, border, border, border, cv2.BORDER_CONSTANT, value=255)
+        tile_side = tile.shape[0]
+
+        center = (tile_side / 2, tile_side / 2)
+        M = cv2.getRotationMatrix2D(center, angle, 1.0)
+        M[0, 2] += position[0] * (width - tile_side)
+        M[1, 2] += position[1] * (height - tile_side)
+        mask = cv2.warpAffine(np.full_like(tile, 255), M, (width, height))
+        warped = cv2.warpAffine(tile, M, (width, height))
+        frame[mask > 0] = warped[mask > 0]
+
+
+def open_source(spec, loop=False):
+    """
+    Opens a frame source from a command line style spec:
+    camera index ("0"), video file, image directory or "synthetic[:count]".
+    """
+    spec = str(spec)
+    if spec.isdigit():
+        return cv2.VideoCapture(int(spec))
+    if spec.startswith("synthetic"):
+        count = int(spec.split(":", 1)[1]) if ":" in spec else 300
+        return SyntheticMarkerSource(count=count, loop=loop)
+    if os.path.isdir(spec):
+        return ImageDirectorySource(spec, loop=loop)
+    return cv2.VideoCapture(spec)
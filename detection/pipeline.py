@@ -0,0 +1,137 @@
+import os
+import queue
+import sys
+import threading
+import time
+from collections import namedtuple
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from detection.aruco_detector import ArUcoDetector
+
+# One processed frame: tag id (or None), annotated frame, capture/processing
+# timestamps, capture index, detection latency in milliseconds and the full
+# TagDetections of the frame
+PipelineResult = namedtuple(
+    "PipelineResult",
+    ["tag_id", "frame", "captured_at", "processed_at", "frame_index", "latency_ms", "tags"],
+)
+
+
+class DetectionPipeline:
+    """
+    Runs camera capture and ArUco detection on two background threads so
+    capture latency overlaps with undistort + detection.
+
+    Frames go through a bounded queue where the newest frame wins: when the
+    detection worker falls behind, the oldest queued frame is dropped.
+    """
+
+    def __init__(self, detector, queue_size=1):
+        self.detector = detector
+        self.frames = queue.Queue(maxsize=queue_size)
+
+        self._result = None
+        self._lock = threading.Lock()
+        self._running = threading.Event()
+        self._threads = []
+
+        # Counters
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.capture_failures = 0
+
+    def start(self):
+        if self._running.is_set():
+            return self
+        self._running.set()
+        self._threads = [
+            threading.Thread(target=self._capture_loop, name="aruco-capture", daemon=True),
+            threading.Thread(target=self._detect_loop, name="aruco-detect", daemon=True),
+        ]
+        for t in self._threads:
+            t.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        for t in self._threads:
+            t.join(timeout=1.0)
+        self._threads = []
+
+    def _capture_loop(self):
+        while self._running.is_set():
+            ret, frame = self.detector.cap.read()
+            if not ret:
+                self.capture_failures += 1
+                time.sleep(0.01)
+                continue
+
+            item = (self.captured, time.time(), frame)
+            self.captured += 1
+            while True:
+                try:
+                    self.frames.put_nowait(item)
+                    break
+                except queue.Full:
+                    # Latest frame wins: throw away the oldest one
+                    try:
+                        self.frames.get_nowait()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _detect_loop(self):
+        while self._running.is_set():
+            try:
+                frame_index, captured_at, frame = self.frames.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            tags = self.detector.process_frame_tags(frame)
+            tag_id = tags.ids[0] if len(tags.ids) else None
+            result = PipelineResult(
+                tag_id, tags.frame, captured_at, time.time(), frame_index, self.detector.last_latency_ms, tags
+            )
+            with self._lock:
+                self._result = result
+                self.processed += 1
+
+    def latest_result(self):
+        """Returns the most recent PipelineResult without blocking (None before the first one)."""
+        with self._lock:
+            return self._result
+
+    def stats(self):
+        return {
+            "captured": self.captured,
+            "processed": self.processed,
+            "dropped": self.dropped,
+            "capture_failures": self.capture_failures,
+        }
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    detector = ArUcoDetector(camera_id=0, lock_on=True)
+    pipeline = DetectionPipeline(detector).start()
+
+    last_index = None
+    try:
+        while True:
+            result = pipeline.latest_result()
+            if result is not None and result.frame_index != last_index:
+                last_index = result.frame_index
+                if result.tag_id is not None:
+                    print(f"✅ Detected ArUco Tag ID: {result.tag_id}")
+                age_ms = (time.time() - result.captured_at) * 1000.0
+                print(f"⏱️ Age: {age_ms:.1f} ms | {pipeline.stats()}", end='\r')
+                cv2.imshow("ArUco Detection", result.frame)
+
+            if cv2.waitKey(1) & 0xFF == 27:  # ESC key
+                break
+    finally:
+        pipeline.stop()
+        detector.release()
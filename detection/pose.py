@@ -0,0 +1,87 @@
+import cv2
+import numpy as np
+
+
+def marker_object_points(marker_length):
+    """
+    3D corners of a square marker centred on the origin, in the same order
+    ArUco reports image corners (top-left, top-right, bottom-right, bottom-left).
+    """
+    half = marker_length / 2.0
+    return np.array([
+        [-half, half, 0.0],
+        [half, half, 0.0],
+        [half, -half, 0.0],
+        [-half, -half, 0.0],
+    ], dtype=np.float64)
+
+
+def _rotation_to_rvec(R):
+    # Vectorized Rodrigues: (N, 3, 3) rotation matrices -> (N, 3) rotation vectors
+    trace = np.trace(R, axis1=1, axis2=2)
+    cos_theta = np.clip((trace - 1.0) / 2.0, -1.0, 1.0)
+    theta = np.arccos(cos_theta)
+    w = np.stack([
+        R[:, 2, 1] - R[:, 1, 2],
+        R[:, 0, 2] - R[:, 2, 0],
+        R[:, 1, 0] - R[:, 0, 1],
+    ], axis=1)
+    sin_theta = np.sin(theta)
+
+    rvecs = w / 2.0  # small-angle limit
+    regular = sin_theta > 1e-6
+    rvecs[regular] = w[regular] * (theta[regular] / (2.0 * sin_theta[regular]))[:, None]
+
+    # Angles close to 180° are ill-conditioned for the formula above
+    for i in np.nonzero(~regular & (cos_theta < 0))[0]:
+        rvecs[i] = cv2.Rodrigues(R[i])[0].ravel()
+    return rvecs
+
+
+def estimate_marker_poses(corners, marker_length, camera_matrix, dist_coeffs=None):
+    """
+    Estimates the pose of every marker at once from its four image corners.
+
+    corners: (N, 4, 2) pixel coordinates. Pass dist_coeffs when the corners
+    come from a distorted image, leave it None when they are already undistorted.
+    Returns (rvecs, tvecs), both (N, 3) float64, tvecs in marker_length units.
+    """
+    corners = np.asarray(corners, dtype=np.float64).reshape(-1, 4, 2)
+    count = corners.shape[0]
+    if count == 0:
+        return np.empty((0, 3)), np.empty((0, 3))
+
+    # Normalized image coordinates for all corners in one call
+    if dist_coeffs is not None:
+        normalized = cv2.undistortPoints(corners.reshape(-1, 1, 2), camera_matrix, dist_coeffs)
+        normalized = normalized.reshape(count, 4, 2)
+    else:
+        fx, fy = camera_matrix[0, 0], camera_matrix[1, 1]
+        cx, cy = camera_matrix[0, 2], camera_matrix[1, 2]
+        normalized = (corners - (cx, cy)) / (fx, fy)
+
+    # Batched 4-point homography (h33 = 1) from the marker plane to the image
+    obj = marker_object_points(marker_length)[:, :2]
+    X, Y = obj[:, 0], obj[:, 1]
+    x, y = normalized[:, :, 0], normalized[:, :, 1]
+    zeros = np.zeros_like(x)
+    ones = np.ones_like(x)
+    rows_x = np.stack([X + zeros, Y + zeros, ones, zeros, zeros, zeros, -x * X, -x * Y], axis=2)
+    rows_y = np.stack([zeros, zeros, zeros, X + zeros, Y + zeros, ones, -y * X, -y * Y], axis=2)
+    A = np.concatenate([rows_x, rows_y], axis=1)
+    b = np.concatenate([x, y], axis=1)
+    h = np.linalg.solve(A, b[:, :, None])[:, :, 0]
+    H = np.concatenate([h, np.ones((count, 1))], axis=1).reshape(count, 3, 3)
+
+    # H ~ [r1 r2 t]
+    c1, c2, c3 = H[:, :, 0], H[:, :, 1], H[:, :, 2]
+    scale = 2.0 / (np.linalg.norm(c1, axis=1) + np.linalg.norm(c2, axis=1))
+    scale = np.where(c3[:, 2] < 0, -scale, scale)  # marker must be in front of the camera
+    r1 = c1 * scale[:, None]
+    r2 = c2 * scale[:, None]
+    tvecs = c3 * scale[:, None]
+
+    R = np.stack([r1, r2, np.cross(r1, r2)], axis=2)
+    U, _, Vt = np.linalg.svd(R)
+    R = U @ Vt
+    return _rotation_to_rvec(R), tvecs
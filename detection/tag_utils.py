@@ -1,3 +1,6 @@
+import numpy as np
+
+
 def debounce_tag(previous_tag, current_tag, count, threshold=3):
     """
     Returns confirmed tag if current tag appears 'threshold' times in a row.
@@ -9,3 +12,66 @@ def debounce_tag(previous_tag, current_tag, count, threshold=3):
     if count >= threshold:
         return current_tag, count, True
     return current_tag, count, False
+
+
+class TagDebouncer:
+    """
+    Debounces every marker id at once with array-backed state.
+
+    An id is confirmed after `threshold` sightings in a row; each frame it is
+    missing costs `decay` counts, and a confirmed id is only released once its
+    count falls below `release` (hysteresis). Counts saturate at `max_count`.
+    Missing ids are decayed lazily, so an update only touches the ids seen
+    in that frame.
+    """
+
+    def __init__(self, threshold=3, release=1, decay=1, max_count=None, max_id=1024):
+        self.threshold = threshold
+        self.release = release
+        self.decay = decay
+        self.max_count = max_count if max_count is not None else 2 * threshold
+        self.max_id = max_id
+
+        self.counts = np.zeros(max_id, dtype=np.int32)
+        self.last_seen = np.full(max_id, -(1 << 30), dtype=np.int64)
+        self.confirmed = np.zeros(max_id, dtype=bool)
+        self.frame = 0
+
+    def update(self, ids):
+        """
+        Feeds one frame of detections: an id array or the TagDetections
+        returned by ArUcoDetector.get_tags. Returns the confirmed ids.
+        """
+        ids = getattr(ids, "ids", ids)
+        self.frame += 1
+
+        ids = np.unique(np.asarray(ids if ids is not None else [], dtype=np.int64).ravel())
+        ids = ids[(ids >= 0) & (ids < self.max_id)]
+        if len(ids):
+            missed = self.frame - self.last_seen[ids] - 1
+            counts = np.maximum(self.counts[ids] - self.decay * missed, 0) + 1
+            counts = np.minimum(counts, self.max_count)
+            self.counts[ids] = counts
+            self.last_seen[ids] = self.frame
+            self.confirmed[ids] |= counts >= self.threshold
+        return self.confirmed_ids()
+
+    def effective_counts(self, ids):
+        # Counts with the decay of missed frames applied
+        ids = np.asarray(ids, dtype=np.int64)
+        missed = self.frame - self.last_seen[ids]
+        return np.maximum(self.counts[ids] - self.decay * np.maximum(missed, 0), 0)
+
+    def confirmed_ids(self):
+        active = np.flatnonzero(self.confirmed)
+        keep = self.effective_counts(active) >= self.release
+        self.confirmed[active[~keep]] = False
+        return active[keep]
+
+    def is_confirmed(self, tag_id):
+        return 0 <= tag_id < self.max_id and tag_id in self.confirmed_ids()
+
+    def reset(self):
+        self.counts[:] = 0
+        self.last_seen[:] = -(1 << 30)
+        self.confirmed[:] = False
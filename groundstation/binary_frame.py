@@ -0,0 +1,224 @@
+import argparse
+import binascii
+import struct
+from collections import namedtuple
+
+# === Frame layout (little endian, see telemetry_frame.h for the C side) ===
+#   sync    2 bytes  0xAA 0x55
+#   length  uint8    payload bytes
+#   type    uint8    FRAME_* below
+#   seq     uint16   sender's sequence number, wraps at 65536
+#   payload length bytes, packed fields of the type
+#   crc     uint16   CRC-16/CCITT-FALSE over length..payload
+# 8 bytes of overhead; MAX_PAYLOAD keeps a frame inside one 32 byte nRF24 packet.
+
+SYNC = b"\xAA\x55"
+HEADER = struct.Struct("<BBH")
+CRC = struct.Struct("<H")
+OVERHEAD = len(SYNC) + HEADER.size + CRC.size
+MAX_PAYLOAD = 32 - OVERHEAD
+
+FRAME_SENSORS = 0x01
+FRAME_TELEMETRY = 0x02
+FRAME_COMMAND = 0x03
+FRAME_ACK = 0x04
+
+# Decoded frame: type, sequence number and {field: value}
+Frame = namedtuple("Frame", ["type", "seq", "fields"])
+
+# type: (struct format, [(field, scale)]), values are sent as integers of value * scale
+FRAME_TYPES = {
+    # sendTelemetry() in sensor-Rf-motor-arm_integrated_code.ino
+    FRAME_SENSORS: ("<hHHHHHHii", [
+        ("TEMP", 10), ("HUM", 10), ("PRES", 10), ("GAS", 10), ("CH4", 1), ("LPG", 1), ("LIGHT", 1),
+        ("LAT", 10 ** 7), ("LON", 10 ** 7),
+    ]),
+    # struct TelemetryData / TELEMETRY,temperature,humidity,tagId,timestamp
+    FRAME_TELEMETRY: ("<hHhI", [("TEMP", 100), ("HUM", 100), ("TAG", 1), ("TIMESTAMP", 1)]),
+    # Drive/servo command byte (W/A/S/D/F, o/p/k/l/n/m)
+    FRAME_COMMAND: ("<c", [("CMD", None)]),
+    # Rover acknowledges the sequence number of a command frame (see LinkMetrics)
+    FRAME_ACK: ("<H", [("ACK", 1)]),
+}
+_STRUCTS = {t: (struct.Struct(fmt), fields) for t, (fmt, fields) in FRAME_TYPES.items()}
+for _t, (_s, _) in _STRUCTS.items():
+    assert _s.size <= MAX_PAYLOAD, f"frame type {_t} does not fit an nRF24 packet"
+
+
+def crc16(data, crc=0xFFFF):
+    """CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF), same as crc16_ccitt() in telemetry_frame.h."""
+    return binascii.crc_hqx(data, crc)
+
+
+def pack_payload(frame_type, fields):
+    packer, layout = _STRUCTS[frame_type]
+    values = []
+    for name, scale in layout:
+        value = fields.get(name, 0)
+        if scale is None:
+            values.append(value.encode() if isinstance(value, str) else bytes(value))
+        else:
+            values.append(int(round(value * scale)))
+    return packer.pack(*values)
+
+
+def unpack_payload(frame_type, payload):
+    packer, layout = _STRUCTS[frame_type]
+    fields = {}
+    for (name, scale), value in zip(layout, packer.unpack(payload)):
+        if scale is None:
+            fields[name] = value.decode(errors="replace")
+        elif scale == 1:
+            fields[name] = value
+        else:
+            fields[name] = value / scale
+    return fields
+
+
+def encode_frame(frame_type, seq, fields=None, payload=None):
+    """Builds a complete frame from fields (or a raw payload for unknown types)."""
+    if payload is None:
+        payload = pack_payload(frame_type, fields or {})
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"payload of {len(payload)} bytes is longer than {MAX_PAYLOAD}")
+    body = HEADER.pack(len(payload), frame_type, seq & 0xFFFF) + payload
+    return SYNC + body + CRC.pack(crc16(body))
+
+
+class FrameDecoder:
+    """
+    Streaming frame decoder: feed it whatever the serial port returned and
+    it yields the complete frames, keeping partial ones for the next call.
+    On a bad length or CRC it skips one byte and searches for the next
+    sync word, so a corrupted or truncated frame only costs that frame.
+
+    decode() returns the field dicts with the frame's sequence number as
+    "SEQ" and the decoder has .buffer and .malformed, so it can stand in
+    for TelemetryCodec in TelemetryIngest.
+    """
+
+    def __init__(self):
+        self.buffer = b""
+
+        # Counters
+        self.frames = 0
+        self.crc_errors = 0
+        self.length_errors = 0
+        self.unknown_types = 0
+        self.skipped_bytes = 0
+
+    @property
+    def malformed(self):
+        return self.crc_errors + self.length_errors + self.unknown_types
+
+    def feed(self, data):
+        buffer = self.buffer + data
+        frames = []
+        pos = 0
+        while True:
+            start = buffer.find(SYNC, pos)
+            if start < 0:
+                # Keep a trailing 0xAA, it may be the first half of the next sync word
+                keep = 1 if buffer.endswith(SYNC[:1]) else 0
+                self.skipped_bytes += len(buffer) - pos - keep
+                pos = len(buffer) - keep
+                break
+            self.skipped_bytes += start - pos
+            if len(buffer) - start < len(SYNC) + HEADER.size:
+                pos = start
+                break
+            length, frame_type, seq = HEADER.unpack_from(buffer, start + len(SYNC))
+            if length > MAX_PAYLOAD:
+                self.length_errors += 1
+                pos = start + 1
+                continue
+            end = start + len(SYNC) + HEADER.size + length + CRC.size
+            if end > len(buffer):
+                pos = start
+                break
+            body = buffer[start + len(SYNC):end - CRC.size]
+            crc, = CRC.unpack_from(buffer, end - CRC.size)
+            if crc != crc16(body):
+                self.crc_errors += 1
+                pos = start + 1  # Resynchronise on the next sync word
+                continue
+            payload = body[HEADER.size:]
+            layout = _STRUCTS.get(frame_type)
+            if layout is None or layout[0].size != length:
+                self.unknown_types += 1
+            else:
+                frames.append(Frame(frame_type, seq, unpack_payload(frame_type, payload)))
+                self.frames += 1
+            pos = end
+        self.buffer = buffer[pos:]
+        return frames
+
+    def decode(self, data):
+        return [dict(frame.fields, SEQ=frame.seq) for frame in self.feed(data)]
+
+    def stats(self):
+        return {
+            "frames": self.frames,
+            "crc_errors": self.crc_errors,
+            "length_errors": self.length_errors,
+            "unknown_types": self.unknown_types,
+            "skipped_bytes": self.skipped_bytes,
+        }
+
+
+# === Comparison with the ASCII telemetry ===
+
+def ascii_sensor_line(fields):
+    """The rfBuffer text sendTelemetry() builds today (plus the newline the link adds)."""
+    return ("T:%.1fC H:%.1f%% P:%.0fhPa G:%.1fk CH4~%.0f LPG~%.0f Lux:%.0f Lat:%.2f Lon:%.2f\n" % (
+        fields["TEMP"], fields["HUM"], fields["PRES"], fields["GAS"], fields["CH4"], fields["LPG"],
+        fields["LIGHT"], fields["LAT"], fields["LON"])).encode()
+
+
+def main(argv=None):
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Binary frame size, throughput and resync check")
+    parser.add_argument("--frames", type=int, default=20000)
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--corrupt", type=float, default=0.01, help="share of frames with a flipped byte")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    samples = [{
+        "TEMP": rng.uniform(15, 40), "HUM": rng.uniform(20, 80), "PRES": rng.uniform(990, 1030),
+        "GAS": rng.uniform(5, 200), "CH4": rng.randint(50, 500), "LPG": rng.randint(60, 600),
+        "LIGHT": rng.randint(0, 5000), "LAT": 52.4763 + rng.uniform(-1e-3, 1e-3),
+        "LON": 13.4578 + rng.uniform(-1e-3, 1e-3),
+    } for _ in range(args.frames)]
+
+    frames = [encode_frame(FRAME_SENSORS, i, s) for i, s in enumerate(samples)]
+    ascii_bytes = sum(len(ascii_sensor_line(s)) for s in samples) / len(samples)
+    frame_bytes = sum(len(f) for f in frames) / len(frames)
+    line_rate = args.baud / 10.0
+    print(f"ASCII rfBuffer: {ascii_bytes:.1f} B/packet -> {line_rate / ascii_bytes:.1f} packets/s at {args.baud} baud")
+    print(f"Binary frame:   {frame_bytes:.1f} B/packet -> {line_rate / frame_bytes:.1f} packets/s "
+          f"({ascii_bytes / frame_bytes:.1f}x)")
+
+    stream = bytearray()
+    corrupted = 0
+    for f in frames:
+        f = bytearray(f)
+        if rng.random() < args.corrupt:
+            f[rng.randrange(len(f))] ^= 1 << rng.randrange(8)
+            corrupted += 1
+        stream += f
+    decoder = FrameDecoder()
+    start = time.perf_counter()
+    decoded = []
+    for i in range(0, len(stream), 64):
+        decoded.extend(decoder.feed(bytes(stream[i:i + 64])))
+    elapsed = time.perf_counter() - start
+    print(f"Decoded {len(decoded)}/{len(frames)} frames with {corrupted} corrupted, "
+          f"{len(decoded) / elapsed:.0f} frames/s, {decoder.stats()}")
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import time
+from collections import deque
+
+from groundstation.binary_frame import FRAME_COMMAND, encode_frame
+
+BRAKE = b"F"
+
+
+class CommandChannel:
+    """
+    Rate limited command writer for the rover radio link.
+
+    Drive commands are coalesced: a command is only written when it
+    changes, plus a keepalive resend every `keepalive` seconds so the
+    rover keeps its last command alive. Brake (F) always goes out
+    immediately; other changes respect `min_interval`. Auxiliary bytes
+    (servo steps) are queued and only sent while the link stays under
+    `max_utilization` of its capacity, so they cannot starve telemetry.
+
+    poll() does the actual writing and should be called often (the Tk
+    dashboard calls it every 10 ms).
+
+    With framed=True every command byte goes out as a sequence numbered
+    FRAME_COMMAND frame (binary_frame.py) that the rover acknowledges;
+    writes are reported to `metrics` (a LinkMetrics) either way.
+    """
+
+    def __init__(self, serial_port, baud=9600, keepalive=0.5, min_interval=0.02, max_utilization=0.25,
+                 window=1.0, clock=time.monotonic, metrics=None, framed=False):
+        self.serial_port = serial_port
+        self.capacity = baud / 10.0  # bytes per second, 8N1
+        self.keepalive = keepalive
+        self.min_interval = min_interval
+        self.max_utilization = max_utilization
+        self.window = window
+        self.clock = clock
+        self.metrics = metrics
+        self.framed = framed
+        self.seq = 0
+
+        self.drive = BRAKE
+        self.last_sent = None
+        self.last_sent_at = None
+        self.aux = deque()
+        self.history = deque()  # (time, bytes) of recent writes
+
+        # Counters
+        self.requested = 0
+        self.coalesced = 0
+        self.keepalives = 0
+        self.bytes_sent = 0
+        self.aux_deferred = 0
+
+    def set_drive(self, cmd):
+        """Sets the current drive command (W/A/S/D/F); brake is written right away."""
+        cmd = cmd.encode() if isinstance(cmd, str) else bytes(cmd)
+        self.requested += 1
+        if cmd == self.drive:
+            self.coalesced += 1
+            return
+        self.drive = cmd
+        if cmd == BRAKE:
+            self._write(cmd, self.clock())
+
+    def send_aux(self, data):
+        """Queues bytes that are not drive commands (servo steps etc.)."""
+        self.aux.append(data.encode() if isinstance(data, str) else bytes(data))
+
+    def brake(self):
+        self.drive = BRAKE
+        self.aux.clear()
+        self._write(BRAKE, self.clock())
+
+    def _write(self, data, now):
+        if self.framed:
+            frames = []
+            for i in range(len(data)):
+                frames.append(encode_frame(FRAME_COMMAND, self.seq, {"CMD": data[i:i + 1]}))
+                if self.metrics is not None:
+                    self.metrics.command_sent(len(frames[-1]), self.seq)
+                self.seq = (self.seq + 1) & 0xFFFF
+            raw = b"".join(frames)
+        else:
+            raw = data
+            if self.metrics is not None:
+                self.metrics.command_sent(len(raw))
+        self.serial_port.write(raw)
+        self.bytes_sent += len(raw)
+        self.history.append((now, len(raw)))
+        if data in (b"W", b"A", b"S", b"D", BRAKE):
+            self.last_sent = data
+            self.last_sent_at = now
+
+    def _trim(self, now):
+        while self.history and now - self.history[0][0] > self.window:
+            self.history.popleft()
+
+    def utilization(self, now=None):
+        """Share of the link capacity used by commands over the last window."""
+        now = self.clock() if now is None else now
+        self._trim(now)
+        return sum(n for _, n in self.history) / (self.capacity * self.window)
+
+    def poll(self):
+        now = self.clock()
+        if self.drive != self.last_sent:
+            if self.last_sent_at is None or now - self.last_sent_at >= self.min_interval:
+                self._write(self.drive, now)
+        elif self.last_sent_at is None or now - self.last_sent_at >= self.keepalive:
+            self._write(self.drive, now)
+            self.keepalives += 1
+
+        while self.aux:
+            if self.utilization(now) >= self.max_utilization:
+                self.aux_deferred += 1
+                break
+            self._write(self.aux.popleft(), now)
+
+    def stats(self):
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "keepalives": self.keepalives,
+            "bytes_sent": self.bytes_sent,
+            "aux_queued": len(self.aux),
+            "aux_deferred": self.aux_deferred,
+            "utilization": self.utilization(),
+        }
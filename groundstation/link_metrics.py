@@ -0,0 +1,199 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+SEQ_MODULO = 1 << 16
+
+# Link health. Latencies (ms, None before the first ack), telemetry_loss (fraction
+# of expected packets) and rates (bytes/s) cover the last window seconds; the
+# ack_timeouts, received/lost, duplicates, reordered and resyncs counts are totals.
+LinkSnapshot = namedtuple("LinkSnapshot", [
+    "rtt_ms", "rtt_mean_ms", "rtt_p95_ms", "acks_pending", "ack_timeouts",
+    "telemetry_received", "telemetry_lost", "telemetry_loss", "duplicates", "reordered", "resyncs",
+    "tx_bps", "rx_bps", "rx_buffer", "tx_buffer", "last_rx_age",
+])
+
+# Columns logged next to the telemetry (see TelemetryRecorder)
+LINK_FIELDS = ["LINK_RTT_MS", "LINK_LOSS", "LINK_TX_BPS", "LINK_RX_BPS", "LINK_RX_BUFFER"]
+
+
+class LinkMetrics:
+    """
+    Live link-quality numbers for the command/telemetry radio path.
+
+    The command side reports what it writes (command_sent, with the
+    frame sequence number when there is one), the telemetry side reports
+    what it reads (bytes_received, telemetry_received with the packet's
+    sequence number, ack_received for acknowledged commands) and the
+    serial buffer depth. snapshot() turns that into round-trip latency,
+    telemetry loss, duplicates, bytes/s in each direction and buffer
+    depth. Methods are thread safe: the ingest thread and the Tk thread
+    both report into one object.
+
+    A telemetry packet up to reorder_window sequence numbers behind the
+    newest one is a duplicate or a late packet; anything further back
+    means the rover restarted its counter and the tracking starts over.
+    """
+
+    def __init__(self, window=5.0, ack_timeout=2.0, reorder_window=32, clock=time.monotonic):
+        self.window = window
+        self.ack_timeout = ack_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+
+        self.pending = {}  # command seq -> send time
+        self.rtts = deque()  # (time, rtt seconds)
+        self.tx = deque()  # (time, bytes)
+        self.rx = deque()
+        self.sequence = deque()  # (time, packets counted as lost) per received telemetry packet
+        self.recent = deque(maxlen=reorder_window)  # recently received telemetry seqs
+        self.recent_set = set()
+        self.last_seq = None
+        self.last_rx = None
+        self.rx_buffer = 0
+        self.tx_buffer = 0
+
+        # Counters
+        self.commands_sent = 0
+        self.acks = 0
+        self.ack_timeouts = 0
+        self.telemetry = 0
+        self.lost = 0
+        self.duplicates = 0
+        self.reordered = 0
+        self.resyncs = 0
+
+    # === Command direction ===
+
+    def command_sent(self, nbytes, seq=None, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self.tx.append((now, nbytes))
+            self.commands_sent += 1
+            if seq is not None:
+                self.pending[seq % SEQ_MODULO] = now
+
+    def ack_received(self, seq, now=None):
+        """Rover acknowledged command seq; returns the round trip in seconds (None if unknown)."""
+        now = self.clock() if now is None else now
+        with self._lock:
+            sent = self.pending.pop(seq % SEQ_MODULO, None)
+            if sent is None:
+                return None
+            rtt = now - sent
+            self.rtts.append((now, rtt))
+            self.acks += 1
+            return rtt
+
+    # === Telemetry direction ===
+
+    def bytes_received(self, nbytes, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self.rx.append((now, nbytes))
+            self.last_rx = now
+
+    def telemetry_received(self, seq, now=None):
+        """Counts a telemetry packet by sequence number: gaps are losses, repeats are duplicates."""
+        now = self.clock() if now is None else now
+        seq %= SEQ_MODULO
+        with self._lock:
+            lost = 0
+            if self.last_seq is not None:
+                gap = (seq - self.last_seq) % SEQ_MODULO
+                behind = SEQ_MODULO - gap if gap >= SEQ_MODULO // 2 else 0
+                if behind > self.recent.maxlen:
+                    # Rover restarted its counter
+                    self.resyncs += 1
+                    self.recent.clear()
+                    self.recent_set.clear()
+                    self.last_seq = seq
+                elif seq in self.recent_set:
+                    self.duplicates += 1
+                    return
+                elif behind:
+                    # Older than the newest one: arrived late, it was counted as lost
+                    self.reordered += 1
+                    lost = -1 if self.lost > 0 else 0
+                else:
+                    lost = gap - 1
+                    self.last_seq = seq
+            else:
+                self.last_seq = seq
+            self.lost += lost
+            self.telemetry += 1
+            self.sequence.append((now, lost))
+            if len(self.recent) == self.recent.maxlen:
+                self.recent_set.discard(self.recent[0])
+            self.recent.append(seq)
+            self.recent_set.add(seq)
+
+    def buffer_depth(self, rx_waiting=None, tx_waiting=None):
+        """Serial buffer depths in bytes (port.in_waiting / port.out_waiting)."""
+        with self._lock:
+            if rx_waiting is not None:
+                self.rx_buffer = rx_waiting
+            if tx_waiting is not None:
+                self.tx_buffer = tx_waiting
+
+    def sample_port(self, serial_port):
+        try:
+            self.buffer_depth(serial_port.in_waiting, getattr(serial_port, "out_waiting", None))
+        except Exception:
+            pass  # Port closed or does not report its buffers
+
+    # === Reporting ===
+
+    def _trim(self, now):
+        cutoff = now - self.window
+        for samples in (self.rtts, self.tx, self.rx, self.sequence):
+            while samples and samples[0][0] < cutoff:
+                samples.popleft()
+        for seq, sent in list(self.pending.items()):
+            if now - sent > self.ack_timeout:
+                del self.pending[seq]
+                self.ack_timeouts += 1
+
+    def snapshot(self, now=None):
+        now = self.clock() if now is None else now
+        with self._lock:
+            self._trim(now)
+            rtts = sorted(r for _, r in self.rtts)
+            lost = max(0, sum(n for _, n in self.sequence))
+            expected = len(self.sequence) + lost
+            span = self.window
+            return LinkSnapshot(
+                rtt_ms=self.rtts[-1][1] * 1000 if self.rtts else None,
+                rtt_mean_ms=sum(rtts) / len(rtts) * 1000 if rtts else None,
+                rtt_p95_ms=rtts[min(len(rtts) - 1, int(0.95 * len(rtts)))] * 1000 if rtts else None,
+                acks_pending=len(self.pending),
+                ack_timeouts=self.ack_timeouts,
+                telemetry_received=self.telemetry,
+                telemetry_lost=self.lost,
+                telemetry_loss=lost / expected if expected else 0.0,
+                duplicates=self.duplicates,
+                reordered=self.reordered,
+                resyncs=self.resyncs,
+                tx_bps=sum(n for _, n in self.tx) / span,
+                rx_bps=sum(n for _, n in self.rx) / span,
+                rx_buffer=self.rx_buffer,
+                tx_buffer=self.tx_buffer,
+                last_rx_age=now - self.last_rx if self.last_rx is not None else None,
+            )
+
+    def log_fields(self, now=None):
+        """The LINK_FIELDS values, for logging next to a telemetry record."""
+        s = self.snapshot(now)
+        return {
+            "LINK_RTT_MS": s.rtt_ms if s.rtt_ms is not None else "",
+            "LINK_LOSS": s.telemetry_loss,
+            "LINK_TX_BPS": s.tx_bps,
+            "LINK_RX_BPS": s.rx_bps,
+            "LINK_RX_BUFFER": s.rx_buffer,
+        }
+
+    def summary(self, now=None):
+        s = self.snapshot(now)
+        rtt = f"{s.rtt_mean_ms:.0f} ms" if s.rtt_mean_ms is not None else "--"
+        return (f"RTT {rtt}, loss {s.telemetry_loss:.1%}, dup {s.duplicates}, "
+                f"tx {s.tx_bps:.0f} B/s, rx {s.rx_bps:.0f} B/s, buf {s.rx_buffer}")
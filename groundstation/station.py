@@ -0,0 +1,271 @@
+import argparse
+import queue
+import sys
+import threading
+import time
+
+from groundstation.binary_frame import FrameDecoder
+from groundstation.command_channel import CommandChannel
+from groundstation.link_metrics import LINK_FIELDS, LinkMetrics
+from groundstation.telemetry_codec import TelemetryCodec
+from groundstation.telemetry_ingest import TelemetryIngest
+from groundstation.telemetry_store import NUMERIC_FIELDS, TelemetryRecorder
+
+COMMAND_TICK = 0.01  # CommandChannel.poll() period, same as the old root.after(10, ...)
+DRIVE_KEYS = "WASDF"
+SERVO_KEYS = "opklnm"
+
+
+def open_serial(port, baud=9600, reset_delay=2.0):
+    """Opens the radio port non-blocking and waits for the Arduino to reset."""
+    import serial
+
+    ser = serial.Serial(port, baud, timeout=0)
+    time.sleep(reset_delay)
+    return ser
+
+
+class Subscription:
+    """
+    A frontend's view of the telemetry stream.
+
+    Either a callback, run on the station's dispatch thread for every
+    record, or a bounded queue the frontend empties with drain() from its
+    own loop (Tk after(), pygame frame). A slow frontend only loses its
+    own oldest records.
+    """
+
+    def __init__(self, station, callback=None, queue_size=1000):
+        self.station = station
+        self.callback = callback
+        self.records = queue.Queue(maxsize=queue_size)
+
+        # Counters
+        self.delivered = 0
+        self.dropped = 0
+
+    def _deliver(self, record):
+        self.delivered += 1
+        if self.callback is not None:
+            self.callback(record)
+            return
+        while True:
+            try:
+                self.records.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.records.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def drain(self):
+        """Latest value per field and the number of records since the last call, like TelemetryIngest.drain()."""
+        latest = {}
+        count = 0
+        while True:
+            try:
+                record = self.records.get_nowait()
+            except queue.Empty:
+                return latest, count
+            latest.update(record.fields)
+            count += 1
+
+    def close(self):
+        self.station.unsubscribe(self)
+
+
+class GroundStation:
+    """
+    Headless ground station: owns the serial link and runs telemetry
+    ingest and logging (TelemetryIngest + TelemetryRecorder), command
+    scheduling (CommandChannel, polled every COMMAND_TICK) and link
+    metrics on worker threads.
+
+    Frontends (Tk dashboard, pygame controller, the CLI below) subscribe
+    for telemetry and call drive()/servo()/brake(); they never touch the
+    port, so they can be attached and detached while the link keeps
+    running at its own rate.
+
+    With framed=True both directions use the binary frames
+    (binary_frame.py): commands go out sequence numbered and telemetry is
+    decoded by a FrameDecoder, so the link metrics see the rover's frame
+    sequence numbers and command acks.
+    """
+
+    def __init__(self, serial_port, log_dir="telemetry", codec=None, metrics=None, framed=False, baud=9600,
+                 command_tick=COMMAND_TICK):
+        self.serial_port = serial_port
+        self.command_tick = command_tick
+        self.metrics = metrics or LinkMetrics()
+        self.codec = codec or (FrameDecoder() if framed else TelemetryCodec())
+        self.recorder = TelemetryRecorder(log_dir, numeric=NUMERIC_FIELDS + LINK_FIELDS) if log_dir else None
+        self.ingest = TelemetryIngest(serial_port, recorder=self.recorder, codec=self.codec, metrics=self.metrics)
+        self.commands = CommandChannel(serial_port, baud=baud, metrics=self.metrics, framed=framed)
+
+        self.subscribers = []
+        self._subscribers_lock = threading.Lock()
+        self._commands_lock = threading.Lock()  # CommandChannel is used from frontends and the command thread
+        self._running = threading.Event()
+        self._threads = []
+        self._stopped = False
+
+    @classmethod
+    def connect(cls, port, baud=9600, **kwargs):
+        return cls(open_serial(port, baud), baud=baud, **kwargs)
+
+    # === Lifecycle ===
+
+    def start(self):
+        if self._running.is_set():
+            return self
+        self._running.set()
+        self.ingest.start()
+        for name, target in (("station-commands", self._command_loop), ("station-dispatch", self._dispatch_loop)):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        """Brakes, stops the workers, flushes the log and closes the port (also when never started)."""
+        if self._stopped:
+            return
+        self._stopped = True
+        try:
+            self.brake()
+        except Exception as e:
+            print(f"[WARNING] Could not send brake: {e}")
+        self._running.clear()
+        for thread in self._threads:
+            thread.join(timeout=2.0)
+        self._threads = []
+        self.ingest.stop()  # Also closes the recorder
+        try:
+            self.serial_port.close()
+        except Exception as e:
+            print(f"[WARNING] Closing serial port: {e}")
+
+    def _command_loop(self):
+        while self._running.is_set():
+            with self._commands_lock:
+                try:
+                    self.commands.poll()
+                except Exception as e:
+                    print(f"[WARNING] Command write error: {e}")
+            time.sleep(self.command_tick)
+
+    def _dispatch_loop(self):
+        while self._running.is_set():
+            try:
+                record = self.ingest.records.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            with self._subscribers_lock:
+                subscribers = list(self.subscribers)
+            for subscription in subscribers:
+                try:
+                    subscription._deliver(record)
+                except Exception as e:
+                    print(f"[WARNING] Telemetry subscriber failed: {e}")
+
+    # === Frontends ===
+
+    def subscribe(self, callback=None, queue_size=1000):
+        subscription = Subscription(self, callback, queue_size)
+        with self._subscribers_lock:
+            self.subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._subscribers_lock:
+            if subscription in self.subscribers:
+                self.subscribers.remove(subscription)
+
+    def drive(self, cmd):
+        """W/A/S/D/F; coalesced and kept alive by the command thread."""
+        with self._commands_lock:
+            self.commands.set_drive(cmd)
+
+    def servo(self, key):
+        """One servo step (o/p, k/l, n/m), sent when the link has room."""
+        key = key.decode() if isinstance(key, bytes) else key
+        if len(key) != 1 or key not in SERVO_KEYS:
+            # A drive letter sneaking in here would move the rover until the next keepalive
+            raise ValueError(f"not a servo step: {key!r}")
+        with self._commands_lock:
+            self.commands.send_aux(key)
+
+    def brake(self):
+        with self._commands_lock:
+            self.commands.brake()
+
+    def utilization(self):
+        with self._commands_lock:
+            return self.commands.utilization()
+
+    def stats(self):
+        with self._commands_lock:
+            commands = self.commands.stats()
+        return {
+            "telemetry_packets": self.ingest.packets,
+            "telemetry_dropped": self.ingest.dropped,
+            "malformed": self.codec.malformed,
+            "subscribers": len(self.subscribers),
+            "commands": commands,
+            "link": self.metrics.snapshot()._asdict(),
+        }
+
+
+# === CLI frontend ===
+
+def _read_commands(station, done):
+    """Lines on stdin: w/a/s/d/f drive, o/p/k/l/n/m servo steps, q quits."""
+    for line in sys.stdin:
+        for key in line.strip():
+            if key.upper() in DRIVE_KEYS:
+                station.drive(key.upper())
+            elif key in SERVO_KEYS:
+                station.servo(key)
+            elif key.lower() == "q":
+                done.set()
+                return
+    done.set()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless ground station with a console frontend")
+    parser.add_argument("--port", default="COM11")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--log-dir", default="telemetry")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between status lines")
+    parser.add_argument("--framed", action="store_true", help="binary frames for commands and telemetry")
+    args = parser.parse_args(argv)
+
+    try:
+        station = GroundStation.connect(args.port, args.baud, log_dir=args.log_dir, framed=args.framed).start()
+    except Exception as e:
+        print("Serial error:", e)
+        sys.exit(1)
+    subscription = station.subscribe()
+    done = threading.Event()
+    threading.Thread(target=_read_commands, args=(station, done), daemon=True).start()
+    print("🔧 Commands: w/a/s/d/f + Enter to drive, o/p k/l n/m for servos, q to quit")
+
+    try:
+        while not done.wait(args.interval):
+            latest, count = subscription.drain()
+            values = ", ".join(f"{k}:{v}" for k, v in latest.items()) or "no telemetry"
+            print(f"📡 {count} packets | {values} | {station.metrics.summary()}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscription.close()
+        station.stop()
+        print("\n🛑 Stopped.")
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+import argparse
+import random
+import time
+from collections import namedtuple
+
+# One telemetry field: name, Python type the value is coerced to and the
+# (low, high) safe range, or None
+Field = namedtuple("Field", ["name", "type", "range"])
+
+# Safe ranges the dashboards colour against
+TEMP_RANGE = (20, 40)
+HUM_RANGE = (30, 70)
+
+# KEY:VALUE packets of the dashboard firmware
+DASHBOARD_FIELDS = [
+    Field("TEMP", float, TEMP_RANGE),
+    Field("HUM", float, HUM_RANGE),
+    Field("GPS", str, None),
+    Field("LIGHT", float, None),
+    Field("ORI", str, None),
+    Field("BME", str, None),
+    Field("MQ2_RAW", int, None),
+    Field("MQ2_V", float, None),
+    Field("TAG", int, None),
+    Field("TIMESTAMP", int, None),
+    # Link bookkeeping: packet sequence number and acknowledged command (see LinkMetrics)
+    Field("SEQ", int, None),
+    Field("ACK", int, None),
+]
+
+# Positional packets "PREFIX,v1,v2,..." (see groundstation/RoverCommunicationDoc.md)
+POSITIONAL_FORMATS = {
+    "TELEMETRY": ["TEMP", "HUM", "TAG", "TIMESTAMP"],
+}
+
+
+def _int(text):
+    # Firmware prints some integer counters with a decimal point
+    try:
+        return int(text)
+    except ValueError:
+        return int(float(text))
+
+
+class TelemetryCodec:
+    """
+    Single pass decoder for both telemetry formats:
+
+      KEY:VALUE,KEY:VALUE,...           (dashboard firmware)
+      TELEMETRY,temp,hum,tagId,time     (rover_communication.ino)
+
+    Values are coerced to the schema's types while splitting, so every
+    packet is parsed exactly once. decode() takes raw bytes from the port,
+    frames whole lines in one go and keeps the incomplete tail for the next
+    call. Values that do not fit their type are kept as the raw string and
+    counted in bad_values; lines that are neither format count as malformed.
+    """
+
+    def __init__(self, fields=DASHBOARD_FIELDS, positional=POSITIONAL_FORMATS, ranges=None):
+        self.fields = {f.name: f for f in fields}
+        if ranges:
+            for name, rng in ranges.items():
+                base = self.fields.get(name, Field(name, float, None))
+                self.fields[name] = base._replace(range=rng)
+        self.converters = {f.name: (_int if f.type is int else f.type) for f in self.fields.values()}
+        self.positional = {prefix: [(name, self.converters.get(name, str)) for name in names]
+                           for prefix, names in positional.items()}
+        self.buffer = b""
+
+        # Counters
+        self.packets = 0
+        self.malformed = 0
+        self.bad_values = 0
+        self.unknown_keys = 0
+
+    def decode_line(self, line):
+        """Decodes one text line. Returns {field: value} or None when malformed."""
+        parts = line.split(",")
+        layout = self.positional.get(parts[0])
+        if layout is not None:
+            if len(parts) != len(layout) + 1:
+                self.malformed += 1
+                return None
+            record = {}
+            for (name, convert), text in zip(layout, parts[1:]):
+                try:
+                    record[name] = convert(text)
+                except ValueError:
+                    record[name] = text
+                    self.bad_values += 1
+            self.packets += 1
+            return record
+
+        converters = self.converters
+        record = {}
+        for part in parts:
+            key, sep, text = part.partition(":")
+            if not sep:
+                continue
+            convert = converters.get(key)
+            if convert is None:
+                self.unknown_keys += 1
+                record[key] = text
+                continue
+            try:
+                record[key] = convert(text)
+            except ValueError:
+                record[key] = text
+                self.bad_values += 1
+        if not record:
+            self.malformed += 1
+            return None
+        self.packets += 1
+        return record
+
+    def decode(self, data):
+        """Decodes every complete line in data (bytes). Returns a list of records."""
+        buffer = self.buffer + data
+        if b"\n" not in data:
+            self.buffer = buffer
+            return []
+        end = buffer.rindex(b"\n")
+        self.buffer = buffer[end + 1:]
+        records = []
+        decode_line = self.decode_line
+        for line in buffer[:end].decode(errors="ignore").split("\n"):
+            line = line.strip()
+            if line:
+                record = decode_line(line)
+                if record is not None:
+                    records.append(record)
+        return records
+
+    def in_range(self, name, value):
+        """True/False against the field's range, None when it has none or the value is not a number."""
+        field = self.fields.get(name)
+        if field is None or field.range is None or not isinstance(value, (int, float)):
+            return None
+        return field.range[0] <= value <= field.range[1]
+
+    def stats(self):
+        return {
+            "packets": self.packets,
+            "malformed": self.malformed,
+            "bad_values": self.bad_values,
+            "unknown_keys": self.unknown_keys,
+        }
+
+
+# === Benchmark ===
+
+def legacy_decode(raw, fieldnames):
+    """The old RoverApp.read_serial parsing: a dict for the CSV row plus a second split for the labels."""
+    values = 0
+    for packet in raw.decode(errors='ignore').splitlines():
+        line = packet.strip()
+        if not line:
+            continue
+        parts = dict(pair.split(":", 1) for pair in line.split(",") if ":" in pair)
+        row = {"timestamp": time.time()}
+        for k in fieldnames:
+            if k != "timestamp":
+                row[k] = parts.get(k, "")
+        for keyval in line.split(","):
+            if ":" not in keyval:
+                continue
+            k, v = keyval.split(":", 1)
+            try:
+                float(v)
+                values += 1
+            except:
+                pass
+    return values
+
+
+def synthetic_stream(count, seed=0, bad_ratio=0.01):
+    rng = random.Random(seed)
+    lines = []
+    for i in range(count):
+        roll = rng.random()
+        if roll < bad_ratio:
+            lines.append("GARBAGE#%d" % i)
+        elif roll < 0.2:
+            lines.append(f"TELEMETRY,{rng.uniform(15, 45):.2f},{rng.uniform(20, 80):.2f},{rng.randint(0, 50)},{i * 100}")
+        else:
+            lines.append(f"TEMP:{rng.uniform(15, 45):.2f},HUM:{rng.uniform(20, 80):.2f},GPS:FIX,"
+                         f"LIGHT:{rng.uniform(0, 900):.1f},ORI:0.1/2.3/45.6,BME:OK,"
+                         f"MQ2_RAW:{rng.randint(100, 900)},MQ2_V:{rng.uniform(0.5, 4):.2f}")
+    return ("\n".join(lines) + "\n").encode()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the telemetry codec against the old parsing path")
+    parser.add_argument("--packets", type=int, default=100000)
+    parser.add_argument("--chunk", type=int, default=64, help="bytes per serial read")
+    args = parser.parse_args(argv)
+
+    raw = synthetic_stream(args.packets)
+    fieldnames = ["timestamp"] + [f.name for f in DASHBOARD_FIELDS[:8]]
+    chunks = [raw[i:i + args.chunk] for i in range(0, len(raw), args.chunk)]
+
+    start = time.perf_counter()
+    legacy_decode(raw, fieldnames)
+    legacy = time.perf_counter() - start
+
+    codec = TelemetryCodec()
+    start = time.perf_counter()
+    records = codec.decode(raw)
+    bulk = time.perf_counter() - start
+
+    chunked_codec = TelemetryCodec()
+    start = time.perf_counter()
+    chunked = sum(len(chunked_codec.decode(chunk)) for chunk in chunks)
+    streamed = time.perf_counter() - start
+
+    print(f"{args.packets} packets ({len(raw) / 1024:.0f} KiB)")
+    print(f"  old read_serial parsing     {args.packets / legacy:10.0f} packets/s")
+    print(f"  codec, whole buffer         {args.packets / bulk:10.0f} packets/s")
+    print(f"  codec, {args.chunk} byte reads       {args.packets / streamed:10.0f} packets/s")
+    print(f"  decoded {len(records)} (chunked {chunked}), {codec.stats()}")
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+// Binary telemetry frames shared by the rover firmware and the ground station
+// (Python side: groundstation/binary_frame.py). Keep both in sync.
+//
+// Frame, little endian:
+//   sync    0xAA 0x55
+//   length  uint8    payload bytes
+//   type    uint8    FRAME_*
+//   seq     uint16   sequence number, wraps
+//   payload length bytes (one of the structs below)
+//   crc     uint16   CRC-16/CCITT-FALSE over length..payload
+//
+// 8 bytes of overhead, payloads up to 24 bytes so a frame fits one 32 byte nRF24 packet.
+
+#ifndef TELEMETRY_FRAME_H
+#define TELEMETRY_FRAME_H
+
+#include <stdint.h>
+#include <string.h>
+
+#define FRAME_SYNC0 0xAA
+#define FRAME_SYNC1 0x55
+#define FRAME_OVERHEAD 8
+#define FRAME_MAX_PAYLOAD 24
+
+#define FRAME_SENSORS   0x01
+#define FRAME_TELEMETRY 0x02
+#define FRAME_COMMAND   0x03
+#define FRAME_ACK       0x04
+
+// sendTelemetry(): values are scaled integers
+struct __attribute__((packed)) SensorsPayload {
+  int16_t  temperature_dC;   // 0.1 °C
+  uint16_t humidity_dPct;    // 0.1 %
+  uint16_t pressure_dhPa;    // 0.1 hPa
+  uint16_t gas_dkOhm;        // 0.1 kOhm
+  uint16_t ppm_ch4;
+  uint16_t ppm_lpg;
+  uint16_t lux;
+  int32_t  lat_e7;           // degrees * 1e7
+  int32_t  lon_e7;           // degrees * 1e7
+};
+
+// struct TelemetryData / "TELEMETRY,temperature,humidity,tagId,timestamp"
+struct __attribute__((packed)) TelemetryPayload {
+  int16_t  temperature_cC;   // 0.01 °C
+  uint16_t humidity_cPct;    // 0.01 %
+  int16_t  tag_id;
+  uint32_t timestamp;
+};
+
+// Drive/servo command byte (W/A/S/D/F, o/p/k/l/n/m)
+struct __attribute__((packed)) CommandPayload {
+  char cmd;
+};
+
+// Sent back for every FRAME_COMMAND, carries the command's seq (round trip in LinkMetrics)
+struct __attribute__((packed)) AckPayload {
+  uint16_t seq;
+};
+
+// CRC-16/CCITT-FALSE: poly 0x1021, init 0xFFFF, no reflection ("123456789" -> 0x29B1)
+static inline uint16_t crc16_ccitt(const uint8_t *data, uint8_t len, uint16_t crc = 0xFFFF) {
+  while (len--) {
+    crc ^= (uint16_t)(*data++) << 8;
+    for (uint8_t i = 0; i < 8; i++) {
+      crc = (crc & 0x8000) ? (crc << 1) ^ 0x1021 : crc << 1;
+    }
+  }
+  return crc;
+}
+
+// Writes a complete frame into out (at least FRAME_OVERHEAD + len bytes), returns its size
+static inline uint8_t frame_encode(uint8_t *out, uint8_t type, uint16_t seq, const void *payload, uint8_t len) {
+  out[0] = FRAME_SYNC0;
+  out[1] = FRAME_SYNC1;
+  out[2] = len;
+  out[3] = type;
+  out[4] = seq & 0xFF;
+  out[5] = seq >> 8;
+  memcpy(out + 6, payload, len);
+  uint16_t crc = crc16_ccitt(out + 2, len + 4);
+  out[6 + len] = crc & 0xFF;
+  out[7 + len] = crc >> 8;
+  return len + FRAME_OVERHEAD;
+}
+
+// Usage in sendTelemetry():
+//   SensorsPayload p = { (int16_t)lroundf(bme.temperature * 10), ... };
+//   uint8_t frame[FRAME_OVERHEAD + sizeof(p)];
+//   radio.write(frame, frame_encode(frame, FRAME_SENSORS, seq++, &p, sizeof(p)));
+// and on a received FRAME_COMMAND with sequence number cmdSeq:
+//   AckPayload ack = { cmdSeq };
+//   radio.write(frame, frame_encode(frame, FRAME_ACK, seq++, &ack, sizeof(ack)));
+
+#endif
@@ -0,0 +1,165 @@
+import os
+import queue
+import threading
+import time
+from collections import namedtuple
+
+from groundstation.telemetry_codec import TelemetryCodec
+from navigation.csv_logger import BufferedCsvLogger
+
+# One telemetry packet: arrival time and its decoded fields
+TelemetryRecord = namedtuple("TelemetryRecord", ["timestamp", "fields"])
+
+# Link bookkeeping fields; a packet with nothing else (a binary FRAME_ACK) is not telemetry
+LINK_KEYS = frozenset(["SEQ", "ACK"])
+
+
+class TelemetryIngest:
+    """
+    Reads the telemetry link on a background thread: bytes are read in
+    bulk, decoded by a TelemetryCodec, logged and pushed
+    into a bounded queue (oldest records are dropped when the UI falls
+    behind).
+
+    Records are logged either to a CSV file (csv_path + fieldnames) or to
+    a TelemetryRecorder (groundstation/telemetry_store.py).
+
+    With a LinkMetrics (groundstation/link_metrics.py) the ingest reports
+    received bytes, packet SEQ/ACK numbers and the port's buffer depth, and
+    logs the LINK_FIELDS next to every record (refreshed every
+    metrics_interval seconds). Packets that only carry SEQ/ACK are
+    reported to the metrics but not logged or queued.
+
+    The Tk side calls drain() at its own refresh rate and gets only the
+    latest value per field, so a burst of packets costs one widget
+    update instead of one per packet.
+    """
+
+    def __init__(self, serial_port, csv_path=None, fieldnames=None, queue_size=1000, max_buffer=4096, recorder=None,
+                 codec=None, metrics=None, metrics_interval=1.0):
+        self.serial_port = serial_port
+        self.fieldnames = list(fieldnames) if fieldnames else None
+        self.records = queue.Queue(maxsize=queue_size)
+        self.max_buffer = max_buffer
+        self.recorder = recorder
+        self.codec = codec or TelemetryCodec()
+        self.metrics = metrics
+        self.metrics_interval = metrics_interval
+        self.link_fields = {}
+        self.link_fields_at = None
+
+        self.csv = None
+        if csv_path and self.fieldnames:
+            new_file = not os.path.isfile(csv_path)
+            self.csv = BufferedCsvLogger(csv_path, ["timestamp"] + self.fieldnames if new_file else None, mode="a")
+
+        self._running = threading.Event()
+        self._thread = None
+
+        # Counters
+        self.bytes_read = 0
+        self.packets = 0
+        self.link_packets = 0
+        self.dropped = 0
+        self.last_packet = None
+
+    def start(self):
+        if self._running.is_set():
+            return self
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="telemetry-ingest", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if self.csv is not None:
+            self.csv.close()
+        if self.recorder is not None:
+            self.recorder.close()
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                # Blocks for at most the port timeout when nothing is waiting
+                waiting = self.serial_port.in_waiting
+                if self.metrics is not None:
+                    self.metrics.buffer_depth(waiting, getattr(self.serial_port, "out_waiting", None))
+                data = self.serial_port.read(waiting or 1)
+            except Exception as e:
+                print(f"[WARNING] Telemetry read error: {e}")
+                time.sleep(0.1)
+                continue
+            if data:
+                self.feed(data)
+            else:
+                time.sleep(0.005)  # Non-blocking port (timeout=0) with nothing to read
+
+    def feed(self, data, now=None):
+        """Decodes raw bytes into packets, logs and queues them."""
+        now = time.time() if now is None else now
+        self.bytes_read += len(data)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.bytes_received(len(data))
+        records = self.codec.decode(data)
+        if len(self.codec.buffer) > self.max_buffer:
+            # No newline for too long: drop the oldest bytes
+            self.codec.buffer = self.codec.buffer[-self.max_buffer:]
+
+        for fields in records:
+            self.last_packet = now
+            if metrics is not None:
+                seq, ack = fields.get("SEQ"), fields.get("ACK")
+                if isinstance(seq, int):
+                    metrics.telemetry_received(seq)
+                if isinstance(ack, int):
+                    metrics.ack_received(ack)
+            if fields.keys() <= LINK_KEYS:
+                self.link_packets += 1
+                continue
+            self.packets += 1
+            logged = fields
+            if metrics is not None:
+                logged = dict(fields, **self._link_fields(now))
+            if self.csv is not None:
+                self.csv.log([now] + [logged.get(k, "") for k in self.fieldnames])
+            if self.recorder is not None:
+                self.recorder.log(now, logged)
+            self._put(TelemetryRecord(now, fields))
+
+    def _link_fields(self, now):
+        if self.link_fields_at is None or now - self.link_fields_at >= self.metrics_interval:
+            self.link_fields = self.metrics.log_fields()
+            self.link_fields_at = now
+        return self.link_fields
+
+    def _put(self, record):
+        while True:
+            try:
+                self.records.put_nowait(record)
+                return
+            except queue.Full:
+                try:
+                    self.records.get_nowait()
+                    self.dropped += 1
+                except queue.Empty:
+                    pass
+
+    def drain(self):
+        """
+        Takes everything queued since the last call.
+        Returns (latest value per field, number of records), ({}, 0) when idle.
+        """
+        latest = {}
+        count = 0
+        while True:
+            try:
+                record = self.records.get_nowait()
+            except queue.Empty:
+                return latest, count
+            latest.update(record.fields)
+            count += 1
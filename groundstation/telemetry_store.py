@@ -0,0 +1,315 @@
+import argparse
+import atexit
+import csv
+import glob
+import math
+import os
+import struct
+import threading
+import time
+
+import numpy as np
+
+# Dashboard fields: numbers are stored as float32 columns, the rest as
+# dictionary-encoded text (status strings repeat a lot)
+NUMERIC_FIELDS = ["TEMP", "HUM", "LIGHT", "MQ2_RAW", "MQ2_V"]
+TEXT_FIELDS = ["GPS", "ORI", "BME"]
+# Column order of the CSV the dashboard used to write (export_csv keeps it)
+CSV_FIELDS = ["TEMP", "HUM", "GPS", "LIGHT", "ORI", "BME", "MQ2_RAW", "MQ2_V"]
+# Text column holding "KEY:value,..." for numeric fields whose value was not a number
+RAW_FIELD = "_raw"
+
+MAGIC = b"TLM1"
+SEGMENT_SUFFIX = ".tlm"
+
+# === Segment format ===
+# header:  MAGIC, uint16 numeric count, uint16 text count, field names (uint8 length + utf-8)
+# block:   uint32 rows, float64 timestamps[rows], float32 column[rows] per numeric field,
+#          per text field: uint16 dictionary size, entries (uint16 length + utf-8), uint16 codes[rows]
+# All little endian. A segment is a header followed by any number of blocks.
+
+
+def _name_bytes(name):
+    data = name.encode()
+    return struct.pack("<B", len(data)) + data
+
+
+def _to_float(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def _parse_raw(text):
+    return dict(part.split(":", 1) for part in text.split(",") if ":" in part) if text else {}
+
+
+def encode_block(timestamps, numeric_columns, text_columns):
+    parts = [struct.pack("<I", len(timestamps)), np.asarray(timestamps, dtype="<f8").tobytes()]
+    for column in numeric_columns:
+        parts.append(np.asarray(column, dtype="<f4").tobytes())
+    for column in text_columns:
+        dictionary = {}
+        codes = np.array([dictionary.setdefault(v, len(dictionary)) for v in column], dtype="<u2")
+        parts.append(struct.pack("<H", len(dictionary)))
+        for value in dictionary:
+            data = value.encode()
+            parts.append(struct.pack("<H", len(data)) + data)
+        parts.append(codes.tobytes())
+    return b"".join(parts)
+
+
+def read_header(path):
+    """Field names of a segment without reading its blocks: (numeric names, text names)."""
+    with open(path, "rb") as f:
+        data = f.read(8)
+        if data[:4] != MAGIC:
+            raise ValueError(f"{path} is not a telemetry segment")
+        n_numeric, n_text = struct.unpack_from("<HH", data, 4)
+        names = []
+        for _ in range(n_numeric + n_text):
+            length = f.read(1)[0]
+            names.append(f.read(length).decode())
+    return names[:n_numeric], names[n_numeric:]
+
+
+def read_segment(path):
+    """
+    Reads a whole segment file.
+    Returns (numeric names, text names, columns) with columns mapping
+    "timestamp" and every field name to an array.
+    """
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a telemetry segment")
+    n_numeric, n_text = struct.unpack_from("<HH", data, 4)
+    offset = 8
+    names = []
+    for _ in range(n_numeric + n_text):
+        length = data[offset]
+        names.append(data[offset + 1:offset + 1 + length].decode())
+        offset += 1 + length
+    numeric, text = names[:n_numeric], names[n_numeric:]
+
+    chunks = {name: [] for name in ["timestamp"] + names}
+    while offset + 4 <= len(data):
+        # Parse a whole block before keeping it: a crash while writing leaves a truncated last block
+        try:
+            rows, = struct.unpack_from("<I", data, offset)
+            offset += 4
+            if offset + rows * (8 + 4 * n_numeric) > len(data):
+                break
+            block = {"timestamp": np.frombuffer(data, "<f8", rows, offset)}
+            offset += 8 * rows
+            for name in numeric:
+                block[name] = np.frombuffer(data, "<f4", rows, offset)
+                offset += 4 * rows
+            for name in text:
+                size, = struct.unpack_from("<H", data, offset)
+                offset += 2
+                dictionary = []
+                for _ in range(size):
+                    length, = struct.unpack_from("<H", data, offset)
+                    dictionary.append(data[offset + 2:offset + 2 + length].decode())
+                    offset += 2 + length
+                codes = np.frombuffer(data, "<u2", rows, offset)
+                offset += 2 * rows
+                block[name] = np.array(dictionary, dtype=object)[codes] if size else np.full(rows, "", object)
+        except (struct.error, ValueError, IndexError):
+            break
+        for name, column in block.items():
+            chunks[name].append(column)
+
+    columns = {}
+    for name, parts in chunks.items():
+        dtype = object if name in text else ("<f8" if name == "timestamp" else "<f4")
+        columns[name] = np.concatenate(parts) if parts else np.empty(0, dtype)
+    return numeric, text, columns
+
+
+class TelemetryRecorder:
+    """
+    Append-only telemetry log in compact binary segments.
+
+    log() only buffers the row; a background thread encodes the buffered
+    rows as one columnar block once flush_rows rows are waiting or every
+    flush_interval seconds, into a segment file kept open between blocks.
+    A new segment is started every segment_seconds (or segment_bytes), so
+    a crash costs at most the rows of the last block.
+
+    Numeric fields that arrive as something other than a number are kept
+    as text in the RAW_FIELD column, so nothing the rover sent is lost.
+    """
+
+    def __init__(self, directory="telemetry", numeric=NUMERIC_FIELDS, text=TEXT_FIELDS, flush_rows=200,
+                 flush_interval=2.0, segment_seconds=600, segment_bytes=None, prefix="telemetry"):
+        self.directory = directory
+        self.numeric = list(numeric)
+        self.text = list(text) + [RAW_FIELD]
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.segment_seconds = segment_seconds
+        self.segment_bytes = segment_bytes
+        self.prefix = prefix
+        os.makedirs(directory, exist_ok=True)
+
+        self.file = None
+        self.segment_path = None
+        self.segment_started = None
+        self.segments = []
+
+        self._rows = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        # Counters
+        self.rows_written = 0
+        self.bytes_written = 0
+
+        self._thread = threading.Thread(target=self._run, name="telemetry-recorder", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, timestamp, fields):
+        numbers = []
+        raw = []
+        for k in self.numeric:
+            value = _to_float(fields.get(k))
+            if math.isnan(value) and fields.get(k) not in (None, ""):
+                raw.append(f"{k}:{fields[k]}")
+            numbers.append(value)
+        row = (timestamp,
+               numbers,
+               [str(fields.get(k, "")) for k in self.text[:-1]] + [",".join(raw)])
+        with self._lock:
+            self._rows.append(row)
+            pending = len(self._rows)
+        if pending >= self.flush_rows:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def _open_segment(self, now):
+        if self.file is not None:
+            self.file.close()
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(now))
+        self.segment_path = os.path.join(self.directory, f"{self.prefix}-{stamp}-{len(self.segments):03d}{SEGMENT_SUFFIX}")
+        self.file = open(self.segment_path, "ab")
+        header = MAGIC + struct.pack("<HH", len(self.numeric), len(self.text))
+        header += b"".join(_name_bytes(name) for name in self.numeric + self.text)
+        self.file.write(header)
+        self.bytes_written += len(header)
+        self.segment_started = now
+        self.segments.append(self.segment_path)
+
+    def _needs_rollover(self, now):
+        if self.file is None:
+            return True
+        if self.segment_seconds and now - self.segment_started >= self.segment_seconds:
+            return True
+        return bool(self.segment_bytes) and self.file.tell() >= self.segment_bytes
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        timestamps = [r[0] for r in rows]
+        numeric = np.array([r[1] for r in rows], dtype=np.float32).reshape(len(rows), len(self.numeric)).T
+        text = [[r[2][i] for r in rows] for i in range(len(self.text))]
+        block = encode_block(timestamps, numeric, text)
+        with self._io_lock:
+            now = time.time()
+            if self._needs_rollover(now):
+                self._open_segment(now)
+            self.file.write(block)
+            self.file.flush()
+            self.rows_written += len(rows)
+            self.bytes_written += len(block)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+        if self.file is not None:
+            self.file.close()
+        atexit.unregister(self.close)
+
+
+def segment_paths(inputs):
+    """Expands files and directories into a time ordered list of segment files."""
+    paths = []
+    for item in inputs:
+        if os.path.isdir(item):
+            paths.extend(glob.glob(os.path.join(item, "*" + SEGMENT_SUFFIX)))
+        else:
+            paths.extend(glob.glob(item) or [item])
+    return sorted(paths)
+
+
+def export_csv(paths, out_path):
+    """
+    Writes the segments as one CSV in the old telemetry.csv layout:
+    timestamp, the CSV_FIELDS in their old order, then any other fields
+    (link metrics etc.) of any segment. Returns the row count.
+    """
+    seen = []
+    for path in paths:
+        numeric, text = read_header(path)
+        seen.extend(name for name in numeric + text if name not in seen and name != RAW_FIELD)
+    header = [name for name in CSV_FIELDS if name in seen] + [name for name in seen if name not in CSV_FIELDS]
+
+    rows = 0
+    with open(out_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp"] + header)
+        for path in paths:
+            numeric, text, columns = read_segment(path)
+            numeric = set(numeric)
+            raw = columns.get(RAW_FIELD)
+            for i in range(len(columns["timestamp"])):
+                overrides = _parse_raw(raw[i]) if raw is not None else {}
+                row = [repr(float(columns["timestamp"][i]))]
+                for name in header:
+                    if name in overrides:
+                        row.append(overrides[name])
+                    elif name not in columns:
+                        row.append("")
+                    elif name in numeric:
+                        value = float(columns[name][i])
+                        row.append("" if math.isnan(value) else f"{value:.6g}")
+                    else:
+                        row.append(columns[name][i])
+                writer.writerow(row)
+            rows += len(columns["timestamp"])
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export binary telemetry segments to CSV")
+    parser.add_argument("inputs", nargs="+", help="segment files or directories")
+    parser.add_argument("-o", "--output", default="telemetry.csv")
+    args = parser.parse_args(argv)
+
+    paths = segment_paths(args.inputs)
+    if not paths:
+        print("❌ No telemetry segments found.")
+        return 1
+    rows = export_csv(paths, args.output)
+    print(f"Exported {rows} rows from {len(paths)} segment(s) to {args.output}")
+    return 0
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,70 +1,83 @@
-import pygame
-import time
+import argparse
+import os
 import sys
-import serial
 
-# === SERIAL SETUP ===
-try:
-    ser = serial.Serial('/dev/ttyACM0', 9600, timeout=1)  # Adjust port if needed
-    time.sleep(2)  # Allow time for Arduino to reset
-    print(" Serial connection established with Arduino.")
-except serial.SerialException as e:
-    print(f" Could not connect to serial port: {e}")
-    sys.exit()
+import pygame
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from groundstation.station import GroundStation
+
+FPS = 20  # Key scan rate; command writes run on the station's own thread
+
+DRIVE_KEYS = [(pygame.K_w, 'W'), (pygame.K_s, 'S'), (pygame.K_a, 'A'), (pygame.K_d, 'D'), (pygame.K_f, 'F')]
+# Servo steps while held: 1 (o/p), 2 (k/l), 3 (n/m)
+SERVO_KEYS = [(pygame.K_o, 'o'), (pygame.K_p, 'p'), (pygame.K_k, 'k'), (pygame.K_l, 'l'), (pygame.K_n, 'n'),
+              (pygame.K_m, 'm')]
 
-# === PYGAME SETUP ===
-pygame.init()
-screen = pygame.display.set_mode((300, 100))
-pygame.display.set_caption("WASD + F Rover Controller")
 
-font = pygame.font.SysFont(None, 24)
-clock = pygame.time.Clock()
+def run(station, caption="WASD + F Rover Controller"):
+    """pygame frontend for a running GroundStation. Brakes when the window closes."""
+    pygame.init()
+    screen = pygame.display.set_mode((420, 120))
+    pygame.display.set_caption(caption)
+    font = pygame.font.SysFont(None, 24)
+    clock = pygame.time.Clock()
+    telemetry = station.subscribe()
+    latest = {}
 
-print("🔧 Control: W/A/S/D = Move, F = Brake")
+    print("🔧 Control: W/A/S/D = Move, F = Brake, o/p k/l n/m = Servos")
+    try:
+        running = True
+        while running:
+            for event in pygame.event.get():
+                if event.type == pygame.QUIT:
+                    running = False
 
-last_command = None
+            keys = pygame.key.get_pressed()
+            cmd = next((c for key, c in DRIVE_KEYS if keys[key]), 'F')  # Brake when no key is pressed
+            station.drive(cmd)
+            for key, step in SERVO_KEYS:
+                if keys[key]:
+                    station.servo(step)
 
-def send_command(cmd):
-    global last_command
-    if cmd != last_command:
-        ser.write(cmd.encode())  # Send as byte
-        print(f"📤 Sent Command: {cmd}       ", end='\r')
-        last_command = cmd
+            fields, _ = telemetry.drain()
+            latest.update(fields)
 
-try:
-    while True:
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                send_command('F')  # Brake before exiting
-                ser.close()
-                pygame.quit()
-                sys.exit()
+            screen.fill((30, 30, 30))
+            lines = [f"Cmd: {cmd}",
+                     " ".join(f"{k}:{latest[k]}" for k in ("TEMP", "HUM", "TAG") if k in latest) or "No telemetry",
+                     station.metrics.summary()]
+            for i, line in enumerate(lines):
+                screen.blit(font.render(line, True, (255, 255, 255)), (10, 10 + 30 * i))
+            pygame.display.flip()
+            clock.tick(FPS)
+    except KeyboardInterrupt:
+        print("\n Interrupted. Sending brake command.")
+    finally:
+        telemetry.close()
+        station.brake()
+        pygame.quit()
 
-        keys = pygame.key.get_pressed()
 
-        if keys[pygame.K_w]:
-            send_command('W')
-        elif keys[pygame.K_s]:
-            send_command('S')
-        elif keys[pygame.K_a]:
-            send_command('A')
-        elif keys[pygame.K_d]:
-            send_command('D')
-        elif keys[pygame.K_f]:
-            send_command('F')
-        else:
-            send_command('F')  # Default to Brake when no key is pressed
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="pygame WASD controller on the ground station")
+    parser.add_argument("--port", default="/dev/ttyACM0")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--log-dir", default="telemetry")
+    args = parser.parse_args(argv)
 
-        screen.fill((30, 30, 30))
-        text = font.render(f"Last Cmd: {last_command or 'None'}", True, (255, 255, 255))
-        screen.blit(text, (10, 40))
+    try:
+        station = GroundStation.connect(args.port, args.baud, log_dir=args.log_dir).start()
+        print(" Serial connection established with Arduino.")
+    except Exception as e:
+        print(f" Could not connect to serial port: {e}")
+        sys.exit()
+    try:
+        run(station)
+    finally:
+        station.stop()
 
-        pygame.display.flip()
-        clock.tick(20)  # Limit loop to 20 FPS
 
-except KeyboardInterrupt:
-    print("\n Interrupted. Sending brake command.")
-    send_command('F')
-    ser.close()
-    pygame.quit()
-    sys.exit()
+# === Main Execution ===
+if __name__ == "__main__":
+    main()
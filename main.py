@@ -1,67 +1,180 @@
+import os
 import serial
 import time
-from navigation.distance_bearing import haversine, calculate_bearing
+from navigation import nmea
+from navigation.heading_filter import HeadingEstimator
+from navigation.mission import Mission
 from navigation.headinglogic import decide_movement
-from motor_control import RoverMotorController, execute_movement  # Import motor control
+from navigation.steering import SteeringController, DutyCycleEncoder
+from navigation.waypoint_store import WaypointStore, Geofence
+
+# Turn rate of the rover pivoting on the spot (deg/s), used to dead-reckon the
+# heading between fixes. Measure it on the real rover.
+PIVOT_TURN_RATE = 60.0
+TURN_RATES = {"left": -PIVOT_TURN_RATE, "right": PIVOT_TURN_RATE}
+
+# The steering setpoint is duty cycled onto the W/A/D commands in ticks
+CONTROL_TICK = 0.1  # seconds
+CONTROL_TICKS = 5  # ticks per position update
+
+WAYPOINT_FILE = 'gpslocations/sample-gpslocations.txt'
+GEOFENCE_FILE = 'gpslocations/geofence.txt'  # optional, "lat, lon" polygon vertices in order
 
 def load_gps_waypoints(filename):
-    waypoints = []
-    with open(filename, 'r') as file:
-        for line in file:
-            line = line.strip()
-            if not line or ',' not in line:
-                continue  # skip empty or bad lines
-            try:
-                lat, lon = map(float, line.split(','))
-                waypoints.append((lat, lon))
-            except ValueError:
-                print(f"[WARNING] Skipping malformed line: {line}")
-    return waypoints
+    # Goes through the binary cache next to the file after the first load
+    store = WaypointStore.from_file(filename)
+    return [(lat, lon) for lat, lon, _ in store.as_waypoints()]
 
 def parse_nmea_gpgga(nmea_sentence):
     if not nmea_sentence.startswith("$GPGGA"):
         return None
-    parts = nmea_sentence.split(",")
-    if len(parts) < 6 or parts[2] == '' or parts[4] == '':
-        return None
-    
-    def convert_to_decimal(coord, direction):
-        if len(coord) < 4:  # Add safety check
-            return None
-        degrees = int(coord[:2])
-        minutes = float(coord[2:])
-        decimal = degrees + minutes / 60
-        if direction in ['S', 'W']:
-            decimal *= -1
-        return decimal
-    
-    try:
-        lat = convert_to_decimal(parts[2], parts[3])
-        lon = convert_to_decimal(parts[4], parts[5])
-        if lat is None or lon is None:
-            return None
-        return lat, lon
-    except (ValueError, IndexError):
+    record = nmea.parse_sentence(nmea_sentence)
+    if record is None:
         return None
+    return nmea.position(record)
 
-def get_current_position(serial_conn, timeout=10):
-    start_time = time.time()
-    while time.time() - start_time < timeout:
+def get_current_position(serial_conn, timeout=10, clock=time, estimator=None):
+    start_time = clock.time()
+    while clock.time() - start_time < timeout:
         try:
             line = serial_conn.readline().decode(errors='ignore').strip()
-            result = parse_nmea_gpgga(line)
-            if result:
-                return result
+            record = nmea.parse_sentence(line)
+            if record is None:
+                continue
+            # Course over ground (RMC/VTG) feeds the heading estimate on the way
+            if estimator is not None and isinstance(record, (nmea.RMC, nmea.VTG)) and record.speed_knots is not None:
+                estimator.update_course(record.course, record.speed_knots * nmea.KNOTS_TO_MPS)
+            if isinstance(record, nmea.GGA):
+                result = nmea.position(record)
+                if result:
+                    return result
         except Exception as e:
             print(f"[WARNING] GPS reading error: {e}")
             continue
     print("[WARNING] GPS timeout - no valid position received")
     return None
 
-def get_current_heading(prev_lat, prev_lon, curr_lat, curr_lon):
-    return calculate_bearing(prev_lat, prev_lon, curr_lat, curr_lon)
+def navigate(ser, waypoints, motor_controller, execute_movement, clock=time, verbose=True, steering=True,
+             geofence=None):
+    """
+    Drives through the waypoints using fixes read from ser.
+    clock provides time()/sleep() (the time module, or a simulated clock
+    for replays, see navigation/replay.py). With steering=False the old
+    bang-bang ±20° decision is used instead of the steering controller.
+    The waypoints are driven as one mission (navigation/mission.py):
+    duplicates are skipped and intermediate waypoints are rounded with a
+    lookahead instead of stopping at each. If a Geofence is given the rover
+    stops as soon as a fix falls outside it. Returns the number of waypoints reached.
+    """
+    print("🚗 Starting Autonomous Navigation...\n")
+    mission = Mission(waypoints)
+    if mission.skipped:
+        print(f"[WARNING] Skipping {mission.skipped} duplicate waypoint(s)")
+
+    def report(event):
+        if event.kind == "waypoint":
+            print(f"✅ Reached waypoint {event.index + 1}/{len(mission.waypoints)}\n")
+    mission.add_listener(report)
+
+    estimator = HeadingEstimator()
+    controller = SteeringController()
+    encoder = DutyCycleEncoder()
+    turn_rate = 0.0
+    last_update = clock.time()
+    last_fix_time = None
+    gps_fail_count = 0
+    max_gps_fails = 5
+
+    while not mission.done:
+        try:
+            position = get_current_position(ser, timeout=5, clock=clock, estimator=estimator)
+            if position is None:
+                gps_fail_count += 1
+                print(f"[WARNING] GPS read failed ({gps_fail_count}/{max_gps_fails})")
+                if gps_fail_count >= max_gps_fails:
+                    print("❌ Too many GPS failures. Stopping rover.")
+                    break
+                motor_controller.stop()
+                turn_rate = 0.0
+                clock.sleep(2)
+                continue
+
+            gps_fail_count = 0  # Reset on successful read
+            lat, lon = position
+            if geofence is not None and not geofence.contains(lat, lon):
+                print(f"❌ Outside geofence '{geofence.name}' at ({lat:.6f}, {lon:.6f}). Stopping rover.")
+                break
+
+            # Dead-reckon the turn since the last update, then correct with the fix
+            now = clock.time()
+            estimator.predict(turn_rate, now - last_update)
+            last_update = now
+            estimator.update_fix(lat, lon, now)
+            current_heading = estimator.heading
+
+            guidance = mission.update(lat, lon, now)
+            if guidance is None:
+                break
+            target_lat, target_lon = guidance.target
+            target_bearing = guidance.bearing
+            distance = mission.remaining_distance(lat, lon)
+            if current_heading is None:
+                # No heading yet: drive straight until the fixes give one
+                decisions = ["forward"] * CONTROL_TICKS
+                action = "FORWARD"
+            elif steering:
+                setpoint = controller.update(current_heading, target_bearing,
+                                             now - last_fix_time if last_fix_time is not None else 0.0)
+                decisions = [encoder.next(setpoint) for _ in range(CONTROL_TICKS)]
+                action = f"throttle {setpoint.throttle:.2f}, steer {setpoint.steer:+.2f}"
+                if setpoint.throttle == 0.0:
+                    estimator.reset_anchor()  # Turning in place, the next displacement starts here
+            else:
+                decisions = [decide_movement(current_heading, target_bearing)] * CONTROL_TICKS
+                action = decisions[0].upper()
+                if decisions[0] in TURN_RATES:
+                    estimator.reset_anchor()
+            last_fix_time = now
+
+            if verbose:
+                print(f"📍 Current: ({lat:.6f}, {lon:.6f})")
+                print(f"🎯 Target:  ({target_lat:.6f}, {target_lon:.6f})")
+                print(f"📏 Distance: {distance:.2f} m to go, waypoint {guidance.index + 1}/{len(mission.waypoints)}")
+                print(f"🧭 Heading:  {current_heading:.2f}°" if current_heading is not None else "🧭 Heading:  unknown")
+                print(f"🧭 Bearing:  {target_bearing:.2f}°")
+                print(f"🦾 Action:   {action}  {''.join(d[0].upper() for d in decisions)}")
+                print("-" * 40)
+
+            # Execute the movement decisions, dead-reckoning the heading at every change
+            previous = None
+            for decision in decisions:
+                if decision != previous:
+                    now = clock.time()
+                    estimator.predict(turn_rate, now - last_update)
+                    last_update = now
+                    execute_movement(decision, motor_controller)
+                    turn_rate = TURN_RATES.get(decision, 0.0)
+                    previous = decision
+                clock.sleep(CONTROL_TICK)
+
+        except KeyboardInterrupt:
+            print("\n🛑 Stopped by user.")
+            break
+        except Exception as e:
+            print(f"❌ Unexpected error: {e}")
+            motor_controller.stop()
+            turn_rate = 0.0
+            clock.sleep(1)
+            continue
+
+    # Only the end of the mission is a stop
+    motor_controller.stop()
+    return mission.reached
 
 def main():
+    # Only needed on the rover itself, replays bring their own motor model
+    from motor_control import RoverMotorController, execute_movement
+
     port = "COM8"  # Change this depending on what port you use
     baud_rate = 9600  # This too
     
@@ -76,76 +189,15 @@ def main():
         motor_controller.cleanup()
         return
     
-    waypoints = load_gps_waypoints('gpslocations/sample-gpslocations.txt')
+    waypoints = load_gps_waypoints(WAYPOINT_FILE)
     if not waypoints:
         print("❌ No GPS waypoints loaded.")
         motor_controller.cleanup()
         return
-    
-    print("🚗 Starting Autonomous Navigation...\n")
-    waypoint_index = 0
-    prev_lat, prev_lon = None, None
-    gps_fail_count = 0
-    max_gps_fails = 5
+    geofence = Geofence.from_file(GEOFENCE_FILE) if os.path.isfile(GEOFENCE_FILE) else None
     
     try:
-        while waypoint_index < len(waypoints):
-            try:
-                position = get_current_position(ser, timeout=5)
-                if position is None:
-                    gps_fail_count += 1
-                    print(f"[WARNING] GPS read failed ({gps_fail_count}/{max_gps_fails})")
-                    if gps_fail_count >= max_gps_fails:
-                        print("❌ Too many GPS failures. Stopping rover.")
-                        break
-                    motor_controller.stop()
-                    time.sleep(2)
-                    continue
-                
-                gps_fail_count = 0  # Reset on successful read
-                lat, lon = position
-                
-                if prev_lat is None:
-                    prev_lat, prev_lon = lat, lon
-                    print("⏳ Waiting for movement to calculate heading...")
-                    time.sleep(1)
-                    continue
-                
-                target_lat, target_lon = waypoints[waypoint_index]
-                distance = haversine(lat, lon, target_lat, target_lon)
-                current_heading = get_current_heading(prev_lat, prev_lon, lat, lon)
-                target_bearing = calculate_bearing(lat, lon, target_lat, target_lon)
-                decision = decide_movement(current_heading, target_bearing)
-                
-                print(f"📍 Current: ({lat:.6f}, {lon:.6f})")
-                print(f"🎯 Target:  ({target_lat:.6f}, {target_lon:.6f})")
-                print(f"📏 Distance: {distance:.2f} m")
-                print(f"🧭 Heading:  {current_heading:.2f}°")
-                print(f"🧭 Bearing:  {target_bearing:.2f}°")
-                print(f"🦾 Action:   {decision.upper()}")
-                print("-" * 40)
-                
-                # Execute the movement decision
-                execute_movement(decision, motor_controller)
-                
-                if distance < 3.0:  # Slightly relaxed threshold
-                    print(f"✅ Reached waypoint {waypoint_index + 1}/{len(waypoints)}\n")
-                    waypoint_index += 1
-                    motor_controller.stop()
-                    time.sleep(2)  # Pause between waypoints
-                
-                prev_lat, prev_lon = lat, lon
-                time.sleep(0.5)  # Reduced sleep time for more responsive control
-                
-            except KeyboardInterrupt:
-                print("\n🛑 Stopped by user.")
-                break
-            except Exception as e:
-                print(f"❌ Unexpected error: {e}")
-                motor_controller.stop()
-                time.sleep(1)
-                continue
-                
+        navigate(ser, waypoints, motor_controller, execute_movement, geofence=geofence)
     finally:
         motor_controller.cleanup()
         ser.close()
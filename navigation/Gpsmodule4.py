@@ -1,8 +1,14 @@
 import serial
 import time
-import csv
 from datetime import datetime
-from math import radians, cos, sin, asin, sqrt, atan2, degrees
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navigation import nmea
+from navigation.csv_logger import BufferedCsvLogger
+from navigation.distance_bearing import haversine, calculate_bearing
+from navigation.serial_reader import SerialLineReader
 
 # SETTINGS
 COMPASS_PORT = "COM12"       # Make sure this matches your Arduino port
@@ -21,62 +27,17 @@ def init_serial():
     serial_port = serial.Serial(COMPASS_PORT, COMPASS_BAUD, timeout=1)
     print(f"Connected to Arduino on {COMPASS_PORT}")
 
-def read_from_serial():
-    try:
-        return serial_port.readline().decode('utf-8', errors='ignore').strip()
-    except:
-        return ""
-
 # GPS Parser
 def parse_gps_line(line):
-    try:
-        if line.startswith("$GPGGA"):
-            parts = line.split(",")
-            if len(parts) > 9:  # Ensure we have enough fields
-                # Check if we have valid latitude data
-                if parts[2] and parts[3] and parts[4] and parts[5]:
-                    # Latitude format: DDMM.MMMMM
-                    lat_str = parts[2]
-                    lat_dir = parts[3]
-                    # Longitude format: DDDMM.MMMMM
-                    lon_str = parts[4]
-                    lon_dir = parts[5]
-                    
-                    # Convert latitude
-                    lat_deg = float(lat_str[:2]) if len(lat_str) > 2 else 0.0
-                    lat_min = float(lat_str[2:]) if len(lat_str) > 2 else 0.0
-                    lat = lat_deg + lat_min / 60.0
-                    if lat_dir == 'S':
-                        lat = -lat
-                    
-                    # Convert longitude
-                    lon_deg = float(lon_str[:3]) if len(lon_str) > 3 else 0.0
-                    lon_min = float(lon_str[3:]) if len(lon_str) > 3 else 0.0
-                    lon = lon_deg + lon_min / 60.0
-                    if lon_dir == 'W':
-                        lon = -lon
-                    
-                    date_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-                    return lat, lon, date_str
-    except Exception as e:
-        print(f"GPS parsing error: {e}")
-    return None, None, None
+    record = nmea.parse_sentence(line)
+    if not isinstance(record, nmea.GGA) or record.lat is None or record.lon is None:
+        return None, None, None
+    return record.lat, record.lon, nmea.format_time(record)
 
-def convert_to_decimal(raw, direction):
-    try:
-        # Handle empty raw values
-        if not raw:
-            return 0.0
-            
-        # Convert DDDMM.MMMMM to decimal degrees
-        deg = float(raw[:2]) if len(raw) > 2 else 0.0
-        minutes = float(raw[2:]) if len(raw) > 2 else float(raw)
-        decimal = deg + minutes / 60.0
-        if direction in ['S', 'W']:
-            decimal = -decimal
-        return decimal
-    except ValueError:
-        return 0.0
+def parse_any_gps_line(line):
+    # Handle GPS data (with or without "GPS:" prefix)
+    gps_line = line.replace("GPS:", "") if line.startswith("GPS:") else line
+    return parse_gps_line(gps_line)
 
 # Compass Parser
 def parse_heading_line(line):
@@ -88,44 +49,6 @@ def parse_heading_line(line):
     return None
 
 # Calculation Functions
-def haversine(lat1, lon1, lat2, lon2):
-    """
-    Calculate the great circle distance between two points 
-    on the earth (specified in decimal degrees)
-    Returns distance in meters
-    """
-    # convert decimal degrees to radians 
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    
-    # haversine formula 
-    dlon = lon2 - lon1 
-    dlat = lat2 - lat1 
-    a = sin(dlat/2)**2 + cos(lat1) * cos(lat2) * sin(dlon/2)**2
-    c = 2 * asin(sqrt(a)) 
-    
-    # Radius of earth in meters (use 6371 for kilometers)
-    r = 6371000
-    return c * r
-
-def calculate_bearing(lat1, lon1, lat2, lon2):
-    """
-    Calculate the initial bearing (azimuth) from point 1 to point 2
-    Returns bearing in degrees from north (0-360)
-    """
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    
-    dlon = lon2 - lon1
-    x = sin(dlon) * cos(lat2)
-    y = cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(dlon)
-    
-    initial_bearing = atan2(x, y)
-    
-    # Convert bearing from radians to degrees (0-360)
-    initial_bearing = degrees(initial_bearing)
-    compass_bearing = (initial_bearing + 360) % 360
-    
-    return compass_bearing
-
 def calculate_relative_bearing(current_heading, target_bearing):
     """
     Calculate the relative bearing (difference between current heading and target bearing)
@@ -150,43 +73,40 @@ def get_turn_direction(relative_bearing):
         return "straight"
 
 def init_csv():
-    with open(LOG_FILE, mode='w', newline='') as f:
-        csv.writer(f).writerow([
-            "LogTime", "Latitude", "Longitude", "Reported Date",
-            "Destination", "DistanceToDest(m)", "TargetBearing", "Direction", 
-            "CurrentHeading", "RelativeBearing", "TurnDirection", "TurnAngle"
-        ])
+    global csv_logger
+    csv_logger = BufferedCsvLogger(LOG_FILE, [
+        "LogTime", "Latitude", "Longitude", "Reported Date",
+        "Destination", "DistanceToDest(m)", "TargetBearing", "Direction", 
+        "CurrentHeading", "RelativeBearing", "TurnDirection", "TurnAngle"
+    ])
 
 def log_to_csv(lat, lon, date_str, destination_name, distance, bearing, direction, 
                real_heading, relative_bearing, turn_direction, turn_angle):
-    with open(LOG_FILE, mode='a', newline='') as f:
-        csv.writer(f).writerow([
-            datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-            lat, lon, date_str, destination_name, distance, bearing, direction, 
-            real_heading, relative_bearing, turn_direction, turn_angle
-        ])
+    csv_logger.log([
+        datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        lat, lon, date_str, destination_name, distance, bearing, direction, 
+        real_heading, relative_bearing, turn_direction, turn_angle
+    ])
 
 # MAIN LOOP
 def main():
     print("Starting REAL GPS + COMPASS Navigation")
     init_serial()
     init_csv()
-    latest_heading = None
     last_lat = last_lon = None
+    reader = SerialLineReader(serial_port, parse_any_gps_line, parse_heading_line).start()
+    last_seq = 0
 
     while True:
         try:
-            line = read_from_serial()
-            if not line:
-                continue
-
-            if line.startswith("Heading:"):
-                latest_heading = parse_heading_line(line)
+            # Always act on the newest fix and heading, older lines are skipped
+            fix = reader.wait_for_gps(last_seq, timeout=1.0)
+            if fix is None:
                 continue
-
-            # Handle GPS data (with or without "GPS:" prefix)
-            gps_line = line.replace("GPS:", "") if line.startswith("GPS:") else line
-            lat, lon, date_str = parse_gps_line(gps_line)
+            last_seq = fix.seq
+            lat, lon, date_str = fix.value
+            heading = reader.latest_heading()
+            latest_heading = heading.value if heading is not None else None
             
             if lat is not None and lon is not None:
                 last_lat, last_lon = lat, lon
@@ -224,6 +144,7 @@ def main():
 
                     if distance < ARRIVAL_THRESHOLD_METERS:
                         print(f"Arrived at {dest_name}!")
+                        reader.stop()
                         return
 
             time.sleep(NAVIGATION_UPDATE_RATE)
@@ -235,7 +156,9 @@ def main():
             print(f"Error: {e}")
             time.sleep(1)
 
+    reader.stop()
     serial_port.close()
+    csv_logger.close()
     print(f"Log saved: {LOG_FILE}")
 
 if __name__ == "__main__":
@@ -0,0 +1,161 @@
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navigation import nmea
+
+SAMPLE_WAYPOINTS = "gpslocations/sample-gpslocations.txt"
+
+
+# === Previous parsers, kept verbatim as the baseline ===
+def legacy_main_parse_nmea_gpgga(nmea_sentence):
+    # main.py
+    if not nmea_sentence.startswith("$GPGGA"):
+        return None
+    parts = nmea_sentence.split(",")
+    if len(parts) < 6 or parts[2] == '' or parts[4] == '':
+        return None
+
+    def convert_to_decimal(coord, direction):
+        if len(coord) < 4:
+            return None
+        degrees = int(coord[:2])
+        minutes = float(coord[2:])
+        decimal = degrees + minutes / 60
+        if direction in ['S', 'W']:
+            decimal *= -1
+        return decimal
+
+    try:
+        lat = convert_to_decimal(parts[2], parts[3])
+        lon = convert_to_decimal(parts[4], parts[5])
+        if lat is None or lon is None:
+            return None
+        return lat, lon
+    except (ValueError, IndexError):
+        return None
+
+
+def legacy_convert_to_decimal(raw, direction):
+    # navigation/gpsmodule.py
+    try:
+        if not raw or not direction or len(raw) < 4:
+            return None
+        value = float(raw)
+        deg = int(value / 100)
+        min = value - deg * 100
+        decimal = deg + min / 60
+        if direction in ['S', 'W']:
+            decimal = -decimal
+        if direction in ['N', 'S'] and (decimal < -90 or decimal > 90):
+            return None
+        if direction in ['E', 'W'] and (decimal < -180 or decimal > 180):
+            return None
+        return decimal
+    except:
+        return None
+
+
+def legacy_gpsmodule_parse_gps_line(line):
+    # navigation/gpsmodule.py
+    from datetime import datetime
+    if line.startswith("GPS:$GPGGA"):
+        parts = line.split(",")
+        if len(parts) > 5 and parts[2] and parts[3] and parts[4] and parts[5]:
+            lat = legacy_convert_to_decimal(parts[2], parts[3])
+            lon = legacy_convert_to_decimal(parts[4], parts[5])
+            if lat is not None and lon is not None:
+                date_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                return lat, lon, date_str
+    elif line.startswith("GPS:$GPRMC"):
+        parts = line.split(",")
+        if len(parts) > 6 and parts[3] and parts[4] and parts[5] and parts[6]:
+            lat = legacy_convert_to_decimal(parts[3], parts[4])
+            lon = legacy_convert_to_decimal(parts[5], parts[6])
+            if lat is not None and lon is not None:
+                date_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
+                return lat, lon, date_str
+    return None, None, None
+
+
+# === Test data ===
+def _with_checksum(body):
+    return f"${body}*{nmea.checksum(body.encode()):02X}"
+
+
+def _ddmm(value, positive, negative, width):
+    hemisphere = positive if value >= 0 else negative
+    value = abs(value)
+    degrees = int(value)
+    minutes = (value - degrees) * 60
+    return f"{degrees:0{width}d}{minutes:07.4f}", hemisphere
+
+
+def synthetic_log(waypoints_file=SAMPLE_WAYPOINTS, repeat=200):
+    """NMEA log (GGA, RMC, VTG, GSA per fix) built from a waypoint file."""
+    points = []
+    with open(waypoints_file) as f:
+        for line in f:
+            if "," in line:
+                lat, lon = map(float, line.split(","))
+                points.append((lat, lon))
+
+    lines = []
+    for i in range(repeat):
+        for j, (lat, lon) in enumerate(points):
+            t = f"{(i // 60) % 24:02d}{i % 60:02d}{j % 60:02d}.00"
+            lat_s, ns = _ddmm(lat, "N", "S", 2)
+            lon_s, ew = _ddmm(lon, "E", "W", 3)
+            lines.append(_with_checksum(f"GPGGA,{t},{lat_s},{ns},{lon_s},{ew},1,08,0.9,45.0,M,46.9,M,,"))
+            lines.append(_with_checksum(f"GPRMC,{t},A,{lat_s},{ns},{lon_s},{ew},1.2,184.0,170626,,,A"))
+            lines.append(_with_checksum("GPVTG,184.0,T,,M,1.2,N,2.2,K,A"))
+            lines.append(_with_checksum("GPGSA,A,3,04,05,,09,12,,,24,,,,,2.5,1.3,2.1"))
+    return lines
+
+
+def _rate(fn, items):
+    start = time.perf_counter()
+    for item in items:
+        fn(item)
+    return len(items) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the NMEA parsers on a recorded log")
+    parser.add_argument("log", nargs="?", help="recorded NMEA log, one sentence per line (default: synthetic)")
+    args = parser.parse_args()
+
+    if args.log:
+        with open(args.log, "rb") as f:
+            raw = f.read()
+        lines = [l.decode("ascii", "ignore").strip() for l in raw.splitlines() if l.strip()]
+    else:
+        lines = synthetic_log()
+        raw = "\n".join(lines).encode() + b"\n"
+    prefixed = ["GPS:" + l for l in lines]
+    raw_lines = [l.encode() for l in lines]
+
+    print(f"{len(lines)} sentences")
+    results = [
+        ("main.parse_nmea_gpgga (old)", _rate(legacy_main_parse_nmea_gpgga, lines)),
+        ("gpsmodule.parse_gps_line (old)", _rate(legacy_gpsmodule_parse_gps_line, prefixed)),
+        ("nmea.parse_sentence (str)", _rate(nmea.parse_sentence, lines)),
+        ("nmea.parse_sentence (bytes)", _rate(nmea.parse_sentence, raw_lines)),
+    ]
+    start = time.perf_counter()
+    nmea.parse_buffer(raw)
+    results.append(("nmea.parse_buffer", len(lines) / (time.perf_counter() - start)))
+
+    # main.py only understands GGA, so also compare on GGA sentences alone
+    gga = [l for l in lines if l[3:6] == "GGA"]
+    results.append(("main.parse_nmea_gpgga (old, GGA)", _rate(legacy_main_parse_nmea_gpgga, gga)))
+    results.append(("nmea.parse_sentence (GGA)", _rate(nmea.parse_sentence, gga)))
+
+    for name, rate in results:
+        print(f"{name:<32} {rate:>12,.0f} sentences/s")
+
+
+if __name__ == "__main__":
+    main()
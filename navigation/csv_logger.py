@@ -0,0 +1,70 @@
+import atexit
+import csv
+import os
+import threading
+
+
+class BufferedCsvLogger:
+    """
+    CSV log that keeps its file open and buffers rows in memory.
+
+    log() only appends to the buffer, so it is cheap to call from the
+    navigation loop. A background thread writes the rows out once
+    flush_rows rows are waiting or every flush_interval seconds, and
+    whatever is left is written on close() or at interpreter exit.
+    """
+
+    def __init__(self, path, header=None, mode="w", flush_rows=50, flush_interval=2.0, fsync=False):
+        self.path = path
+        self.flush_rows = flush_rows
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+
+        self.file = open(path, mode, newline="")
+        self.writer = csv.writer(self.file)
+        if header:
+            self.writer.writerow(header)
+            self.file.flush()
+
+        self._rows = []
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="csv-logger", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def log(self, row):
+        with self._lock:
+            self._rows.append(row)
+            pending = len(self._rows)
+        if pending >= self.flush_rows:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        with self._lock:
+            rows, self._rows = self._rows, []
+        if not rows:
+            return
+        with self._io_lock:
+            self.writer.writerows(rows)
+            self.file.flush()
+            if self.fsync:
+                os.fsync(self.file.fileno())
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        self.flush()
+        self.file.close()
+        atexit.unregister(self.close)
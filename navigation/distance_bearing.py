@@ -0,0 +1,95 @@
+import numpy as np
+
+EARTH_RADIUS_M = 6371000
+
+
+def _result(value):
+    # Plain float for scalar inputs, array otherwise
+    return float(value) if np.ndim(value) == 0 else value
+
+
+def haversine(lat1, lon1, lat2, lon2):
+    """
+    Great circle distance in meters between points in decimal degrees.
+    Works on scalars or NumPy arrays (broadcast against each other).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return _result(2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0))))
+
+
+def calculate_bearing(lat1, lon1, lat2, lon2):
+    """
+    Initial bearing from point 1 to point 2 in degrees from north (0-360).
+    Works on scalars or NumPy arrays (broadcast against each other).
+    """
+    lat1, lon1, lat2, lon2 = (np.radians(v) for v in (lat1, lon1, lat2, lon2))
+    dlon = lon2 - lon1
+    x = np.sin(dlon) * np.cos(lat2)
+    y = np.cos(lat1) * np.sin(lat2) - np.sin(lat1) * np.cos(lat2) * np.cos(dlon)
+    return _result((np.degrees(np.arctan2(x, y)) + 360) % 360)
+
+
+def distance_bearing(lat, lon, waypoints):
+    """
+    Distance (m) and bearing (deg) from one or many positions to every waypoint.
+
+    lat/lon: scalars or (M,) arrays, waypoints: (N, 2) array of (lat, lon).
+    Returns two arrays shaped (N,) for a single position or (M, N).
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64).reshape(-1, 2)
+    lat = np.asarray(lat, dtype=np.float64)[..., None]
+    lon = np.asarray(lon, dtype=np.float64)[..., None]
+    wlat, wlon = waypoints[:, 0], waypoints[:, 1]
+
+    phi1, phi2 = np.radians(lat), np.radians(wlat)
+    dphi = phi2 - phi1
+    dlmb = np.radians(wlon - lon)
+    cos1, cos2 = np.cos(phi1), np.cos(phi2)
+
+    a = np.sin(dphi / 2) ** 2 + cos1 * cos2 * np.sin(dlmb / 2) ** 2
+    distances = 2 * EARTH_RADIUS_M * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+    x = np.sin(dlmb) * cos2
+    y = cos1 * np.sin(phi2) - np.sin(phi1) * cos2 * np.cos(dlmb)
+    bearings = (np.degrees(np.arctan2(x, y)) + 360) % 360
+    return distances, bearings
+
+
+# === Local flat-earth fast path ===
+# Equirectangular projection around a reference point. Error stays well under
+# a centimetre per 100 m at rover ranges, at a fraction of the trig cost.
+
+def to_local(lat, lon, ref_lat, ref_lon):
+    """(east, north) in meters of lat/lon relative to the reference point."""
+    k = np.radians(1.0) * EARTH_RADIUS_M
+    east = (np.asarray(lon) - ref_lon) * k * np.cos(np.radians(ref_lat))
+    north = (np.asarray(lat) - ref_lat) * k
+    return east, north
+
+
+def from_local(east, north, ref_lat, ref_lon):
+    """Inverse of to_local."""
+    k = np.radians(1.0) * EARTH_RADIUS_M
+    lat = ref_lat + np.asarray(north) / k
+    lon = ref_lon + np.asarray(east) / (k * np.cos(np.radians(ref_lat)))
+    return lat, lon
+
+
+def fast_distance_bearing(lat, lon, waypoints):
+    """
+    Same as distance_bearing using the local projection around lat/lon[0].
+    Only meant for short ranges (a few km).
+    """
+    waypoints = np.asarray(waypoints, dtype=np.float64).reshape(-1, 2)
+    lat = np.asarray(lat, dtype=np.float64)
+    lon = np.asarray(lon, dtype=np.float64)
+    ref_lat = float(lat.flat[0])
+    ref_lon = float(lon.flat[0])
+
+    east, north = to_local(waypoints[:, 0], waypoints[:, 1], ref_lat, ref_lon)
+    pos_east, pos_north = to_local(lat, lon, ref_lat, ref_lon)
+    de = east - pos_east[..., None]
+    dn = north - pos_north[..., None]
+    distances = np.hypot(de, dn)
+    bearings = (np.degrees(np.arctan2(de, dn)) + 360) % 360
+    return distances, bearings
@@ -1,15 +1,24 @@
 import serial
-import time
-import csv
 from datetime import datetime
-from math import radians, cos, sin, asin, sqrt, atan2, degrees
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navigation import nmea
+from navigation.csv_logger import BufferedCsvLogger
+from navigation.distance_bearing import haversine
+from navigation.heading_filter import HeadingEstimator
+from navigation.mission import Mission
+from navigation.serial_reader import SerialLineReader
+from navigation.steering import SteeringController, DutyCycleEncoder
 
 # SETTINGS
 COMPASS_PORT = "COM12"
 COMPASS_BAUD = 9600
 LOG_FILE = "gps_navigation_log.csv"
 ARRIVAL_THRESHOLD_METERS = 5
-NAVIGATION_UPDATE_RATE = 0.25  # 1 second
+CONTROL_TICK = 0.1  # seconds between duty cycled steering commands
+FIX_TIMEOUT = 3.0  # seconds without a GPS fix before the rover is braked
 
 DESTINATIONS = [
     ((52.4764387, 13.4584166), "one"),
@@ -19,6 +28,7 @@ DESTINATIONS = [
     ((52.47645, 13.45817), "five"),
     
 ]
+MISSION_LOOKAHEAD_METERS = 4
 
 # INIT
 def init_serial():
@@ -26,50 +36,15 @@ def init_serial():
     serial_port = serial.Serial(COMPASS_PORT, COMPASS_BAUD, timeout=0.1)
     print(f"Connected to Arduino on {COMPASS_PORT}")
 
-def read_from_serial():
-    try:
-        return serial_port.readline().decode('utf-8', errors='ignore').strip()
-    except:
-        return ""
-
 # GPS Parser
 def parse_gps_line(line):
-    if line.startswith("GPS:$GPGGA"):
-        parts = line.split(",")
-        if len(parts) > 5 and parts[2] and parts[3] and parts[4] and parts[5]:
-            lat = convert_to_decimal(parts[2], parts[3])
-            lon = convert_to_decimal(parts[4], parts[5])
-            if lat is not None and lon is not None:
-                date_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-                return lat, lon, date_str
-    elif line.startswith("GPS:$GPRMC"):
-        parts = line.split(",")
-        if len(parts) > 6 and parts[3] and parts[4] and parts[5] and parts[6]:
-            lat = convert_to_decimal(parts[3], parts[4])
-            lon = convert_to_decimal(parts[5], parts[6])
-            if lat is not None and lon is not None:
-                date_str = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-                return lat, lon, date_str
-    return None, None, None
-
-def convert_to_decimal(raw, direction):
-    try:
-        if not raw or not direction or len(raw) < 4:
-            return None
-        value = float(raw)
-        deg = int(value / 100)
-        min = value - deg * 100
-        decimal = deg + min / 60
-        if direction in ['S', 'W']:
-            decimal = -decimal
-        # Sanity check for valid ranges
-        if direction in ['N', 'S'] and (decimal < -90 or decimal > 90):
-            return None
-        if direction in ['E', 'W'] and (decimal < -180 or decimal > 180):
-            return None
-        return decimal
-    except:
-        return None
+    if not line.startswith("GPS:$"):
+        return None, None, None
+    record = nmea.parse_sentence(line)
+    fix = nmea.position(record) if record is not None else None
+    if fix is None:
+        return None, None, None
+    return fix[0], fix[1], nmea.format_time(record)
 
 # Compass Parser
 def parse_heading_line(line):
@@ -81,97 +56,107 @@ def parse_heading_line(line):
     return None
 
 # Calculations
-def haversine(lat1, lon1, lat2, lon2):
-    R = 6371000
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat / 2)**2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2)**2
-    c = 2 * asin(sqrt(a))
-    return R * c
-
-def calculate_bearing(lat1, lon1, lat2, lon2):
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlon = lon2 - lon1
-    x = sin(dlon) * cos(lat2)
-    y = cos(lat1) * sin(lat2) - sin(lat1) * cos(lat2) * cos(dlon)
-    return (degrees(atan2(x, y)) + 360) % 360
-
 def bearing_to_cardinal(bearing):
     cardinals = ["N", "NE", "E", "SE", "S", "SW", "W", "NW", "N"]
     return cardinals[round(bearing / 45) % 8]
 
-# ✅ WASD logic based on heading with ±20° margin
-def get_direction_command(bearing, heading):
-    if heading is None:
-        return 'S'  # Stop if heading is unknown
-    diff = (bearing - heading + 360) % 360
-    if diff <= 20 or diff >= 340:
-        return 'W'  # Forward
-    elif diff > 20 and diff <= 180:
-        return 'D'  # Turn right
-    elif diff > 180 and diff < 340:
-        return 'A'  # Turn left
-    return 'S'
-
 def init_csv():
-    with open(LOG_FILE, mode='w', newline='') as f:
-        csv.writer(f).writerow([
-            "LogTime", "Latitude", "Longitude", "Reported Date",
-            "Destination", "DistanceToDest", "Bearing", "Direction", "RealHeading"
-        ])
+    global csv_logger
+    csv_logger = BufferedCsvLogger(LOG_FILE, [
+        "LogTime", "Latitude", "Longitude", "Reported Date",
+        "Destination", "DistanceToDest", "Bearing", "Direction", "RealHeading"
+    ])
 
 def log_to_csv(lat, lon, date_str, destination_name, distance, bearing, direction, real_heading):
-    with open(LOG_FILE, mode='a', newline='') as f:
-        csv.writer(f).writerow([
-            datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
-            lat, lon, date_str, destination_name, distance, bearing, direction, real_heading
-        ])
+    csv_logger.log([
+        datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        lat, lon, date_str, destination_name, distance, bearing, direction, real_heading
+    ])
+
+def report_event(event):
+    if event.kind == "waypoint":
+        print(f"Arrived at {event.name}!")
+    elif event.kind == "completed":
+        print("Mission complete!")
 
 # MAIN LOOP
 def main():
     print("Starting REAL GPS + COMPASS Navigation")
     init_serial()
     init_csv()
-    latest_heading = None
+    reader = SerialLineReader(serial_port, parse_gps_line, parse_heading_line).start()
+    last_seq = 0
+    last_heading_seq = 0
+    estimator = HeadingEstimator()
+    # Repeated destinations are skipped, the rover only stops at the last one
+    mission = Mission([(lat, lon, name) for (lat, lon), name in DESTINATIONS],
+                      arrival_radius=ARRIVAL_THRESHOLD_METERS, lookahead=MISSION_LOOKAHEAD_METERS,
+                      listeners=[report_event])
+    controller = SteeringController()
+    encoder = DutyCycleEncoder()
+    setpoint = None
+    last_command = None
+    last_fix_time = None
+    missed_ticks = 0  # CONTROL_TICK waits without a new fix
+    stale = False
 
     while True:
         try:
-            line = read_from_serial()
-            if not line:
-                continue
-
-            if line.startswith("Heading:"):
-                latest_heading = parse_heading_line(line)
-
-            elif line.startswith("GPS:$GPRMC") or line.startswith("GPS:$GPGGA"):
-                lat, lon, date_str = parse_gps_line(line)
-                if lat is not None and lon is not None:
-                    for dest_lat, dest_lon, dest_name in DESTINATIONS:
-                        distance = haversine(lat, lon, dest_lat, dest_lon)
-                        bearing = calculate_bearing(lat, lon, dest_lat, dest_lon)
-                        direction = bearing_to_cardinal(bearing)
-                        heading_str = f"{latest_heading:.2f}" if latest_heading is not None else "None"
-                        command = get_direction_command(bearing, latest_heading)
-                        print(f"{command},")
-                        serial_port.write(command.encode())
-
-
-                        print(f"({lat:.6f}, {lon:.6f}) -> {dest_name} | {distance:.2f} m | {direction} | Heading: {heading_str}")
-                        log_to_csv(lat, lon, date_str, dest_name, distance, bearing, direction, latest_heading)
-
-                        # ✅ Calculate direction command based on heading difference
-                        
-                        if distance < ARRIVAL_THRESHOLD_METERS:
-                            print(f"Arrived at {dest_name}!")
-                            return
-
-                    time.sleep(NAVIGATION_UPDATE_RATE)
+            # Always act on the newest fix and heading, older lines are skipped
+            fix = reader.wait_for_gps(last_seq, timeout=CONTROL_TICK)
+            missed_ticks = 0 if fix is not None else missed_ticks + 1
+            if fix is not None:
+                last_seq = fix.seq
+                lat, lon, date_str = fix.value
+                heading = reader.latest_heading()
+                latest_heading = heading.value if heading is not None else None
+
+                # Fuse the compass with the GPS track for the steering decision
+                if heading is not None and heading.seq != last_heading_seq:
+                    last_heading_seq = heading.seq
+                    estimator.update_compass(heading.value)
+                estimator.update_fix(lat, lon, fix.timestamp)
+                fused_heading = estimator.heading
+                heading_str = f"{fused_heading:.2f}" if fused_heading is not None else "None"
+
+                guidance = mission.update(lat, lon, fix.timestamp)
+                if guidance is None:
+                    serial_port.write(b"F")
+                    break
+                dest_lat, dest_lon, dest_name = mission.waypoints[guidance.index]
+                distance = haversine(lat, lon, dest_lat, dest_lon)
+                direction = bearing_to_cardinal(guidance.bearing)
+                print(f"({lat:.6f}, {lon:.6f}) -> {dest_name} | {distance:.2f} m | {direction} | Heading: {heading_str}")
+                log_to_csv(lat, lon, date_str, dest_name, distance, guidance.bearing, direction, latest_heading)
+
+                # Steer towards the lookahead point on the route
+                dt = fix.timestamp - last_fix_time if last_fix_time is not None else 0.0
+                last_fix_time = fix.timestamp
+                setpoint = controller.update(fused_heading, guidance.bearing, dt)
+                print(f"throttle={setpoint.throttle:.2f} steer={setpoint.steer:+.2f}")
+
+            # Duty cycle the steering setpoint onto W/A/D, only changes go over the wire.
+            # Brake instead of driving on the last setpoint when the fixes stop.
+            if setpoint is not None:
+                if (missed_ticks * CONTROL_TICK >= FIX_TIMEOUT) != stale:
+                    stale = not stale
+                    if stale:
+                        print(f"[WARNING] No GPS fix for {FIX_TIMEOUT:g} s. Braking until fixes return.")
+                    else:
+                        print("GPS fixes are back, resuming.")
+                command = "F" if stale else encoder.next_command(setpoint)
+                if command != last_command:
+                    print(f"{command},")
+                    serial_port.write(command.encode())
+                    last_command = command
 
         except KeyboardInterrupt:
             print("Stopped by user.")
             break
 
+    reader.stop()
     serial_port.close()
+    csv_logger.close()
     print(f"Log saved: {LOG_FILE}")
 
 if __name__ == "__main__":
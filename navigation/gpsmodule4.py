@@ -1,15 +1,22 @@
 # Add at top of file
 import serial
 import time
-import csv
 from datetime import datetime
-from math import radians, cos, sin, asin, sqrt, atan2, degrees
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navigation.csv_logger import BufferedCsvLogger
+from navigation.distance_bearing import haversine, calculate_bearing
+from navigation.serial_reader import SerialLineReader
+from navigation.steering import SteeringController, DutyCycleEncoder
 
 COMPASS_PORT = "COM12"
 COMPASS_BAUD = 9600
 LOG_FILE = "gps_navigation_log.csv"
 ARRIVAL_THRESHOLD_METERS = 5
-NAVIGATION_UPDATE_RATE = 0.25  # seconds
+CONTROL_TICK = 0.1  # seconds between duty cycled steering commands
+FIX_TIMEOUT = 3.0  # seconds without a GPS fix before the rover is braked
 
 DESTINATIONS = [
     (52.4764387, 13.4584166, "one"),
@@ -19,35 +26,6 @@ DESTINATIONS = [
     (52.47645,   13.45817,   "five"),
 ]
 
-# --- New: utility functions ---
-def haversine_distance(lat1, lon1, lat2, lon2):
-    # returns distance in meters
-    R = 6371000
-    dlat = radians(lat2 - lat1)
-    dlon = radians(lon2 - lon1)
-    a = sin(dlat/2)**2 + cos(radians(lat1))*cos(radians(lat2))*sin(dlon/2)**2
-    c = 2 * asin(sqrt(a))
-    return R * c
-
-def calculate_bearing(lat1, lon1, lat2, lon2):
-    # returns bearing in degrees [0..360)
-    lat1, lon1, lat2, lon2 = map(radians, [lat1, lon1, lat2, lon2])
-    dlon = lon2 - lon1
-    x = sin(dlon) * cos(lat2)
-    y = cos(lat1)*sin(lat2) - sin(lat1)*cos(lat2)*cos(dlon)
-    bearing = (degrees(atan2(x, y)) + 360) % 360
-    return bearing
-
-def direction_command(bearing, heading):
-    if heading is None:
-        return b'f'  # brake if no heading
-    diff = (bearing - heading + 360) % 360
-    if diff <= 20 or diff >= 340:
-        return b'w'  # forward
-    if diff > 180:
-        return b'a'  # turn left
-    return b'd'      # turn right
-
 # --- Integration to send commands ---
 def init_serial():
     global serial_port
@@ -55,52 +33,101 @@ def init_serial():
     time.sleep(2)  # ensure stable connection
     print(f"Connected to Arduino at {COMPASS_PORT}")
 
+def parse_heading_line(line):
+    try:
+        return float(line.split(":")[1].strip())
+    except (IndexError, ValueError):
+        return None
+
+def parse_gps_line(line):
+    # "GPS:lat=52.4763,lon=13.4578" -> (lat, lon)
+    if not line.startswith("GPS:"):
+        return None
+    try:
+        fields = line[len("GPS:"):].split(",")
+        return float(fields[0].split("=")[1]), float(fields[1].split("=")[1])
+    except (IndexError, ValueError):
+        return None
+
 def send_command(cmd_byte):
     serial_port.write(cmd_byte)
     print(f"Sent command: {cmd_byte.decode()}")
 
+# --- Buffered CSV log (written off the control loop) ---
+def init_csv():
+    global csv_logger
+    csv_logger = BufferedCsvLogger(LOG_FILE, [
+        "LogTime", "Latitude", "Longitude", "Reported Date",
+        "Destination", "DistanceToDest", "Bearing", "Command", "RealHeading"
+    ])
+
+def log_to_csv(lat, lon, date_str, destination_name, distance, bearing, command, real_heading):
+    csv_logger.log([
+        datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S"),
+        lat, lon, date_str, destination_name, distance, bearing, command, real_heading
+    ])
+
 # Update main loop
 def main():
     init_serial()
     init_csv()
-    latest_heading = None
     current_target = 0
+    reader = SerialLineReader(serial_port, parse_gps_line, parse_heading_line).start()
+    last_seq = 0
+    controller = SteeringController()
+    encoder = DutyCycleEncoder()
+    setpoint = None
+    last_cmd = None
+    last_fix_time = None
+    missed_ticks = 0  # CONTROL_TICK waits without a new fix
+    stale = False
 
     while current_target < len(DESTINATIONS):
-        line = read_from_serial()
-        if not line:
-            continue
-
-        if line.startswith("Heading:"):
-            try:
-                latest_heading = float(line.split(":")[1].strip())
-            except:
-                pass
-
-        elif line.startswith("GPS:"):
-            _, gpsdata = line.split("GPS:",1)
-            lat_s, lon_s = gpsdata.split(",")[0].split("=")[1], gpsdata.split(",")[1].split("=")[1]
-            try:
-                lat = float(lat_s); lon = float(lon_s)
-            except:
-                continue
+        # Always act on the newest fix and heading, older lines are skipped
+        fix = reader.wait_for_gps(last_seq, timeout=CONTROL_TICK)
+        missed_ticks = 0 if fix is not None else missed_ticks + 1
+        if fix is not None:
+            last_seq = fix.seq
+            lat, lon = fix.value
+            heading = reader.latest_heading()
+            latest_heading = heading.value if heading is not None else None
 
             dest_lat, dest_lon, dest_name = DESTINATIONS[current_target]
-            distance = haversine_distance(lat, lon, dest_lat, dest_lon)
+            distance = haversine(lat, lon, dest_lat, dest_lon)
             bearing = calculate_bearing(lat, lon, dest_lat, dest_lon)
-            cmd = direction_command(bearing, latest_heading)
-            send_command(cmd)
+            dt = fix.timestamp - last_fix_time if last_fix_time is not None else 0.0
+            last_fix_time = fix.timestamp
+            setpoint = controller.update(latest_heading, bearing, dt)
 
-            print(f"{cmd.decode()}, {lat:.6f},{lon:.6f} → {dest_name} | {distance:.2f} m | bear={bearing:.1f} ° | head={latest_heading}")
-            log_to_csv(lat, lon, datetime.utcnow().isoformat(), dest_name, distance, bearing, cmd.decode(), latest_heading)
+            print(f"throttle={setpoint.throttle:.2f} steer={setpoint.steer:+.2f}, {lat:.6f},{lon:.6f} → {dest_name} | {distance:.2f} m | bear={bearing:.1f} ° | head={latest_heading}")
+            log_to_csv(lat, lon, datetime.utcnow().isoformat(), dest_name, distance, bearing,
+                       f"{setpoint.throttle:.2f}/{setpoint.steer:+.2f}", latest_heading)
 
             if distance < ARRIVAL_THRESHOLD_METERS:
                 print(f"✅ Arrived at {dest_name}")
                 send_command(b'f')
                 current_target += 1
-            time.sleep(NAVIGATION_UPDATE_RATE)
+                controller.reset()
+                setpoint = last_cmd = None
+                continue
 
+        # Duty cycle the steering setpoint onto w/a/d, only changes go over the wire.
+        # Brake instead of driving on the last setpoint when the fixes stop.
+        if setpoint is not None:
+            if (missed_ticks * CONTROL_TICK >= FIX_TIMEOUT) != stale:
+                stale = not stale
+                if stale:
+                    print(f"[WARNING] No GPS fix for {FIX_TIMEOUT:g} s. Braking until fixes return.")
+                else:
+                    print("GPS fixes are back, resuming.")
+            cmd = b'f' if stale else encoder.next_command(setpoint).lower().encode()
+            if cmd != last_cmd:
+                send_command(cmd)
+                last_cmd = cmd
+
+    reader.stop()
     serial_port.close()
+    csv_logger.close()
     print("Navigation complete.")
 
 if __name__ == "__main__":
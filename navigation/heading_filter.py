@@ -0,0 +1,100 @@
+import math
+
+from navigation.distance_bearing import to_local, from_local
+from navigation.headinglogic import heading_error
+
+
+class HeadingEstimator:
+    """
+    Complementary filter for heading (and a smoothed position) that takes
+    each sensor at its own rate, every update is O(1):
+
+      predict(turn_rate, dt)      dead reckoning from the commanded turn rate
+      update_compass(heading)     magnetic compass ("Heading:" lines)
+      update_course(course, mps)  GPS course over ground (RMC/VTG), only when moving
+      update_fix(lat, lon, t)     GPS fixes; the bearing of the displacement is
+                                  used once the rover moved at least min_move metres
+
+    Position and velocity are smoothed with an alpha-beta filter in a local
+    east/north frame anchored at the first fix.
+    """
+
+    def __init__(self, compass_gain=0.3, course_gain=0.5, fix_gain=0.5, min_speed=0.5, min_move=2.0,
+                 compass_offset=0.0, alpha=0.6, beta=0.2):
+        self.compass_gain = compass_gain
+        self.course_gain = course_gain
+        self.fix_gain = fix_gain
+        self.min_speed = min_speed
+        self.min_move = min_move
+        self.compass_offset = compass_offset
+        self.alpha = alpha
+        self.beta = beta
+
+        self.heading = None
+        self.ref = None
+        self.east = self.north = 0.0
+        self.v_east = self.v_north = 0.0
+        self.last_fix_time = None
+        self.anchor = None  # (east, north) the last displacement bearing was measured from
+
+    def _blend(self, measurement, gain):
+        if self.heading is None:
+            self.heading = measurement % 360
+        else:
+            self.heading = (self.heading + gain * heading_error(self.heading, measurement)) % 360
+
+    def predict(self, turn_rate, dt):
+        if self.heading is not None and dt > 0:
+            self.heading = (self.heading + turn_rate * dt) % 360
+
+    def update_compass(self, heading):
+        if heading is not None:
+            self._blend(heading + self.compass_offset, self.compass_gain)
+
+    def update_course(self, course, speed_mps):
+        # Course over ground is meaningless when (nearly) standing still
+        if course is None or speed_mps is None or speed_mps < self.min_speed:
+            return
+        gain = self.course_gain * min(1.0, speed_mps / (2 * self.min_speed))
+        self._blend(course, gain)
+
+    def update_fix(self, lat, lon, t):
+        if self.ref is None:
+            self.ref = (lat, lon)
+            self.last_fix_time = t
+            self.anchor = (0.0, 0.0)
+            return
+
+        east, north = to_local(lat, lon, *self.ref)
+        dt = t - self.last_fix_time
+        self.last_fix_time = t
+        if dt > 0:
+            # alpha-beta: predict, then correct with the residual
+            pred_east = self.east + self.v_east * dt
+            pred_north = self.north + self.v_north * dt
+            res_east, res_north = east - pred_east, north - pred_north
+            self.east = pred_east + self.alpha * res_east
+            self.north = pred_north + self.alpha * res_north
+            self.v_east += self.beta * res_east / dt
+            self.v_north += self.beta * res_north / dt
+        else:
+            self.east, self.north = float(east), float(north)
+
+        de = self.east - self.anchor[0]
+        dn = self.north - self.anchor[1]
+        if math.hypot(de, dn) >= self.min_move:
+            self._blend(math.degrees(math.atan2(de, dn)), self.fix_gain)
+            self.anchor = (self.east, self.north)
+
+    def reset_anchor(self):
+        """Call after turning in place so the next displacement bearing starts fresh."""
+        self.anchor = (self.east, self.north)
+
+    def position(self):
+        if self.ref is None:
+            return None
+        lat, lon = from_local(self.east, self.north, *self.ref)
+        return float(lat), float(lon)
+
+    def speed(self):
+        return math.hypot(self.v_east, self.v_north)
@@ -0,0 +1,16 @@
+HEADING_TOLERANCE = 20  # degrees either side of the target bearing that count as "ahead"
+
+
+def heading_error(current_heading, target_bearing):
+    """Signed turn from heading to bearing in degrees (-180, 180], positive = clockwise."""
+    return (target_bearing - current_heading + 180) % 360 - 180
+
+
+def decide_movement(current_heading, target_bearing, tolerance=HEADING_TOLERANCE):
+    """'forward' when roughly facing the target, otherwise 'left' or 'right'."""
+    if current_heading is None:
+        return "stop"
+    error = heading_error(current_heading, target_bearing)
+    if abs(error) <= tolerance:
+        return "forward"
+    return "right" if error > 0 else "left"
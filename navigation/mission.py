@@ -0,0 +1,170 @@
+from collections import namedtuple
+
+import numpy as np
+
+from navigation.distance_bearing import haversine, calculate_bearing, to_local, from_local
+
+ARRIVAL_RADIUS_M = 3.0
+LOOKAHEAD_M = 4.0
+DUPLICATE_RADIUS_M = 0.5
+
+# kind: "started", "waypoint" (reached index) or "completed"
+MissionEvent = namedtuple("MissionEvent", ["kind", "index", "name", "position", "time"])
+# What the steering loop needs after each fix
+Guidance = namedtuple("Guidance", ["target", "distance", "bearing", "index", "name"])
+
+
+def load_waypoints(filename):
+    """
+    Reads "lat, lon[, name]" lines (the gpslocations/*.txt format).
+    Returns a list of (lat, lon, name); unnamed points get their line number.
+    """
+    waypoints = []
+    with open(filename, 'r') as file:
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if not line or ',' not in line:
+                continue  # skip empty or bad lines
+            fields = [f.strip() for f in line.split(',')]
+            try:
+                lat, lon = float(fields[0]), float(fields[1])
+            except ValueError:
+                print(f"[WARNING] Skipping malformed line: {line}")
+                continue
+            name = fields[2] if len(fields) > 2 and fields[2] else str(number)
+            waypoints.append((lat, lon, name))
+    return waypoints
+
+
+def dedupe_waypoints(waypoints, radius=DUPLICATE_RADIUS_M):
+    """Drops waypoints within radius metres of the previous kept one (repeated coordinates)."""
+    kept = []
+    for waypoint in waypoints:
+        if kept and haversine(kept[-1][0], kept[-1][1], waypoint[0], waypoint[1]) < radius:
+            continue
+        kept.append(waypoint)
+    return kept
+
+
+class Mission:
+    """
+    Runs through a waypoint list with pure-pursuit lookahead: update() is
+    called with every fix and returns a Guidance whose target is the point
+    lookahead metres further along the route, so the rover rounds
+    intermediate waypoints instead of stopping at each one. A waypoint
+    counts as reached when the rover gets within arrival_radius of it or
+    passes it along the route. Only the last one is a real stop.
+
+    Listeners (callables taking a MissionEvent) get "started", "waypoint"
+    and "completed" events.
+    """
+
+    def __init__(self, waypoints, arrival_radius=ARRIVAL_RADIUS_M, lookahead=LOOKAHEAD_M,
+                 duplicate_radius=DUPLICATE_RADIUS_M, listeners=()):
+        points = [tuple(w) if len(w) > 2 else (w[0], w[1], str(i + 1)) for i, w in enumerate(waypoints)]
+        self.waypoints = dedupe_waypoints(points, duplicate_radius) if duplicate_radius else points
+        self.skipped = len(points) - len(self.waypoints)
+        self.arrival_radius = arrival_radius
+        self.lookahead = lookahead
+        self.listeners = list(listeners)
+
+        self.index = 0  # waypoint currently driven to
+        self.started = False
+        if self.waypoints:
+            self.ref = self.waypoints[0][:2]
+            lats = np.array([w[0] for w in self.waypoints])
+            lons = np.array([w[1] for w in self.waypoints])
+            east, north = to_local(lats, lons, *self.ref)
+            self.points = np.column_stack([east, north])
+            seg = np.diff(self.points, axis=0)
+            self.seg_length = np.hypot(seg[:, 0], seg[:, 1])
+            self.remaining_after = np.concatenate([np.cumsum(self.seg_length[::-1])[::-1], [0.0]])
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def _emit(self, kind, index, position, t):
+        name = self.waypoints[index][2] if index is not None and index < len(self.waypoints) else None
+        event = MissionEvent(kind, index, name, position, t)
+        for callback in self.listeners:
+            callback(event)
+
+    @property
+    def done(self):
+        return self.index >= len(self.waypoints)
+
+    @property
+    def reached(self):
+        return self.index
+
+    def _segment_progress(self, p, i):
+        # Fraction along segment i -> i+1 of the projection of p
+        a, b = self.points[i], self.points[i + 1]
+        length = self.seg_length[i]
+        if length == 0:
+            return 1.0
+        return float(np.dot(p - a, b - a)) / (length * length)
+
+    def _lookahead_point(self, p):
+        """Point lookahead metres along the route from the projection of p on the current leg."""
+        i = self.index
+        if i == 0 or i >= len(self.points):
+            return self.points[min(i, len(self.points) - 1)]
+        t = min(max(self._segment_progress(p, i - 1), 0.0), 1.0)
+        along = t * self.seg_length[i - 1] + self.lookahead
+        seg = i - 1
+        while seg < len(self.seg_length) and along > self.seg_length[seg]:
+            along -= self.seg_length[seg]
+            seg += 1
+        if seg >= len(self.seg_length):
+            return self.points[-1]
+        a, b = self.points[seg], self.points[seg + 1]
+        return a + (b - a) * (along / self.seg_length[seg])
+
+    def update(self, lat, lon, t=None):
+        """Advances the mission with a fix; returns a Guidance, or None once completed."""
+        if self.done:
+            return None
+        if not self.started:
+            self.started = True
+            self._emit("started", self.index, (lat, lon), t)
+
+        p = np.array(to_local(lat, lon, *self.ref), dtype=np.float64)
+        while not self.done:
+            wlat, wlon = self.waypoints[self.index][:2]
+            close = haversine(lat, lon, wlat, wlon) < self.arrival_radius
+            # Passed it: already beyond the waypoint along the next leg
+            last = self.index == len(self.waypoints) - 1
+            passed = (not last and self.index > 0
+                      and self._segment_progress(p, self.index) > 0.0
+                      and self._segment_progress(p, self.index - 1) >= 1.0)
+            if not (close or passed):
+                break
+            self.index += 1
+            self._emit("waypoint", self.index - 1, (lat, lon), t)
+        if self.done:
+            self._emit("completed", len(self.waypoints) - 1, (lat, lon), t)
+            return None
+
+        if self.index == len(self.waypoints) - 1 or self.lookahead <= 0:
+            target = self.waypoints[self.index][:2]
+        else:
+            east, north = self._lookahead_point(p)
+            tlat, tlon = from_local(east, north, *self.ref)
+            target = (float(tlat), float(tlon))
+        return Guidance(target, haversine(lat, lon, *target), calculate_bearing(lat, lon, *target),
+                        self.index, self.waypoints[self.index][2])
+
+    def remaining_distance(self, lat, lon):
+        """Metres left: to the current waypoint, then along the route."""
+        if self.done:
+            return 0.0
+        wlat, wlon = self.waypoints[self.index][:2]
+        return haversine(lat, lon, wlat, wlon) + float(self.remaining_after[self.index])
+
+    def progress(self, lat, lon):
+        """Fraction of the route covered, 0..1."""
+        total = float(self.remaining_after[0]) if self.waypoints else 0.0
+        if self.done or total == 0:
+            return 1.0 if self.done else 0.0
+        return max(0.0, min(1.0, 1.0 - self.remaining_distance(lat, lon) / total))
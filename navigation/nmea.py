@@ -0,0 +1,195 @@
+from collections import namedtuple
+
+import numpy as np
+
+# Parsed sentences. Times/dates stay as the raw ASCII bytes (hhmmss.ss / ddmmyy),
+# numeric fields are None when the receiver left them empty.
+GGA = namedtuple("GGA", ["time", "lat", "lon", "quality", "satellites", "hdop", "altitude"])
+RMC = namedtuple("RMC", ["time", "valid", "lat", "lon", "speed_knots", "course", "date"])
+VTG = namedtuple("VTG", ["course", "speed_knots", "speed_kmh"])
+GSA = namedtuple("GSA", ["mode", "fix_type", "satellites", "pdop", "hdop", "vdop"])
+
+KNOTS_TO_MPS = 0.514444
+
+
+def _coord(raw, hemisphere):
+    # (d)ddmm.mmmm + N/S/E/W -> signed decimal degrees
+    if not raw:
+        return None
+    value = float(raw)
+    degrees = int(value / 100)
+    decimal = degrees + (value - degrees * 100) / 60.0
+    if hemisphere == b"S" or hemisphere == b"W":
+        return -decimal
+    return decimal
+
+
+def _num(raw):
+    return float(raw) if raw else None
+
+
+def _int(raw):
+    return int(raw) if raw else None
+
+
+# Builds the namedtuples without going through their Python level __new__
+_tuple_new = tuple.__new__
+
+
+def _parse_gga(body):
+    # Hot path: only the 10 fields used are split off, the conversions are inlined
+    t, lat, ns, lon, ew, quality, satellites, hdop, altitude = body.split(b",", 10)[1:10]
+    if lat:
+        lat = float(lat)
+        degrees = int(lat / 100)
+        lat = degrees + (lat - degrees * 100) / 60.0
+        if ns == b"S" or ns == b"W":
+            lat = -lat
+    else:
+        lat = None
+    if lon:
+        lon = float(lon)
+        degrees = int(lon / 100)
+        lon = degrees + (lon - degrees * 100) / 60.0
+        if ew == b"S" or ew == b"W":
+            lon = -lon
+    else:
+        lon = None
+    return _tuple_new(GGA, (t, lat, lon, int(quality) if quality else None, int(satellites) if satellites else None,
+                            float(hdop) if hdop else None, float(altitude) if altitude else None))
+
+
+def _parse_rmc(body):
+    f = body.split(b",", 10)
+    return _tuple_new(RMC, (f[1], f[2] == b"A", _coord(f[3], f[4]), _coord(f[5], f[6]), _num(f[7]), _num(f[8]), f[9]))
+
+
+def _parse_vtg(body):
+    f = body.split(b",", 8)
+    return _tuple_new(VTG, (_num(f[1]), _num(f[5]), _num(f[7])))
+
+
+def _parse_gsa(body):
+    f = body.split(b",", 18)
+    used = 12 - f[3:15].count(b"")
+    return _tuple_new(GSA, (f[1], _int(f[2]), used, _num(f[15]), _num(f[16]), _num(f[17])))
+
+
+_PARSERS = {b"GGA,": _parse_gga, b"RMC,": _parse_rmc, b"VTG,": _parse_vtg, b"GSA,": _parse_gsa}
+
+
+def checksum(body):
+    """XOR of all bytes between '$' and '*'."""
+    # Folds the body as one integer instead of looping over bytes in Python:
+    # after folding by 64, 32, ... 1 bytes the low byte is the XOR of the first 128
+    value = int.from_bytes(body, "little")
+    while value >> 1024:
+        value = (value >> 1024) ^ (value & ((1 << 1024) - 1))
+    value ^= value >> 512
+    value ^= value >> 256
+    value ^= value >> 128
+    value ^= value >> 64
+    value ^= value >> 32
+    value ^= value >> 16
+    value ^= value >> 8
+    return value & 0xFF
+
+
+def _parse_body(body):
+    # body is the sentence between '$' and '*': "GPGGA,..."
+    parser = _PARSERS.get(body[2:6])
+    if parser is None:
+        return None
+    try:
+        return parser(body)
+    except (ValueError, IndexError):
+        return None
+
+
+def parse_sentence(line, require_checksum=False):
+    """
+    Parses one GGA/RMC/VTG/GSA sentence from any talker ($GP, $GN, ...).
+    Accepts bytes or str, ignores anything before '$' (e.g. a "GPS:" prefix)
+    and validates the *hh checksum when present.
+    Returns a GGA/RMC/VTG/GSA tuple, or None for bad or unsupported sentences.
+    """
+    if isinstance(line, str):
+        line = line.encode("ascii", "ignore")
+    start = line.find(b"$")
+    if start < 0:
+        return None
+
+    star = line.find(b"*", start)
+    if star >= 0:
+        body = line[start + 1:star]
+        try:
+            if int(line[star + 1:star + 3], 16) != checksum(body):
+                return None
+        except ValueError:
+            return None
+    elif require_checksum:
+        return None
+    else:
+        body = line[start + 1:].rstrip()
+    return _parse_body(body)
+
+
+def parse_buffer(buffer, require_checksum=False):
+    """
+    Parses every complete (newline terminated) sentence in a buffer.
+    Returns (records, leftover) where leftover is the trailing partial line.
+    Checksums are validated in bulk from one running XOR over the buffer.
+    """
+    end = buffer.rfind(b"\n") + 1
+    leftover = buffer[end:]
+    # running[i] is the XOR of buffer[:i], so a body start..star-1 XORs to running[star] ^ running[start]
+    running = np.zeros(end + 1, dtype=np.uint8)
+    np.bitwise_xor.accumulate(np.frombuffer(buffer, dtype=np.uint8, count=end), out=running[1:])
+    running = running.tobytes()
+
+    records = []
+    pos = 0
+    while pos < end:
+        newline = buffer.index(b"\n", pos)
+        start = buffer.find(b"$", pos, newline) + 1
+        pos = newline + 1
+        if not start:
+            continue
+        star = buffer.find(b"*", start, newline)
+        if star >= 0:
+            try:
+                if int(buffer[star + 1:star + 3], 16) != running[star] ^ running[start]:
+                    continue
+            except ValueError:
+                continue
+            body = buffer[start:star]
+        elif require_checksum:
+            continue
+        else:
+            body = buffer[start:newline].rstrip()
+        record = _parse_body(body)
+        if record is not None:
+            records.append(record)
+    return records, leftover
+
+
+def position(record):
+    """(lat, lon) of a GGA/RMC record, None when it carries no position or RMC says the fix is not valid."""
+    if isinstance(record, RMC) and not record.valid:
+        return None
+    if isinstance(record, (GGA, RMC)) and record.lat is not None and record.lon is not None:
+        return record.lat, record.lon
+    return None
+
+
+def format_time(record):
+    """
+    GPS reported date and time as "YYYY-MM-DD HH:MM:SS" for the "Reported Date"
+    log column. Only RMC carries a date, so GGA records (and RMC without one) give None.
+    """
+    t = record.time
+    date = getattr(record, "date", None)
+    if not t or len(t) < 6 or not date or len(date) < 6:
+        return None
+    clock = f"{t[0:2].decode()}:{t[2:4].decode()}:{t[4:6].decode()}"
+    return f"20{date[4:6].decode()}-{date[2:4].decode()}-{date[0:2].decode()} {clock}"
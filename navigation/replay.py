@@ -0,0 +1,293 @@
+import argparse
+import csv
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from navigation import nmea
+from navigation.distance_bearing import to_local, from_local
+from navigation.steering import DECISION_TO_COMMAND
+
+GPS_RATE_HZ = 1.0
+SERIAL_TIMEOUT = 1.0
+
+
+class SimClock:
+    """
+    Stand-in for the time module: time() is simulated time and sleep()
+    advances it instantly, stepping every registered model on the way.
+    """
+
+    def __init__(self, start=0.0, step=0.05):
+        self.now = start
+        self.step = step
+        self.models = []
+
+    def time(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.advance_to(self.now + max(0.0, seconds))
+
+    def advance_to(self, target):
+        while self.now < target:
+            dt = min(self.step, target - self.now)
+            for model in self.models:
+                model.step(dt)
+            self.now += dt
+
+
+class KinematicRover:
+    """
+    Skid-steer rover in a local east/north frame: W/S drive straight,
+    A/D pivot in place, F brakes. Fractional commands from a speed
+    setpoint are supported through set_motion().
+    """
+
+    def __init__(self, lat, lon, heading=0.0, speed=1.0, turn_rate=60.0):
+        self.ref_lat, self.ref_lon = lat, lon
+        self.east = 0.0
+        self.north = 0.0
+        self.heading = heading
+        self.max_speed = speed
+        self.max_turn_rate = turn_rate
+        self.speed = 0.0  # m/s, forward positive
+        self.turn_rate = 0.0  # deg/s, clockwise positive
+        self.distance_travelled = 0.0
+
+    def command(self, cmd):
+        cmd = cmd.upper()
+        if cmd == "W":
+            self.set_motion(1.0, 0.0)
+        elif cmd == "S":
+            self.set_motion(-1.0, 0.0)
+        elif cmd == "A":
+            self.set_motion(0.0, -1.0)
+        elif cmd == "D":
+            self.set_motion(0.0, 1.0)
+        elif cmd == "F":
+            self.set_motion(0.0, 0.0)
+
+    def set_motion(self, throttle, steer):
+        """throttle and steer in [-1, 1] of the maximum speed / turn rate."""
+        self.speed = throttle * self.max_speed
+        self.turn_rate = steer * self.max_turn_rate
+
+    def step(self, dt):
+        self.heading = (self.heading + self.turn_rate * dt) % 360
+        rad = math.radians(self.heading)
+        self.east += self.speed * dt * math.sin(rad)
+        self.north += self.speed * dt * math.cos(rad)
+        self.distance_travelled += abs(self.speed) * dt
+
+    def position(self):
+        lat, lon = from_local(self.east, self.north, self.ref_lat, self.ref_lon)
+        return float(lat), float(lon)
+
+
+def gga_sentence(lat, lon, t):
+    """Checksummed $GPGGA sentence for a position at simulated time t (seconds)."""
+    seconds = int(t) % 86400
+    stamp = f"{seconds // 3600:02d}{(seconds // 60) % 60:02d}{seconds % 60:02d}.{int((t % 1) * 100):02d}"
+    lat_deg = int(abs(lat))
+    lon_deg = int(abs(lon))
+    lat_s = f"{lat_deg:02d}{(abs(lat) - lat_deg) * 60:07.4f}"
+    lon_s = f"{lon_deg:03d}{(abs(lon) - lon_deg) * 60:07.4f}"
+    body = (f"GPGGA,{stamp},{lat_s},{'N' if lat >= 0 else 'S'},{lon_s},{'E' if lon >= 0 else 'W'},"
+            f"1,08,0.9,40.0,M,46.9,M,,")
+    return f"${body}*{nmea.checksum(body.encode()):02X}"
+
+
+class SimulatedGpsSerial:
+    """
+    Fake serial port in closed loop with a KinematicRover: readline() waits
+    (in simulated time) for the next GPS fix and returns it as a GGA
+    sentence, write() forwards command bytes to the rover.
+    After max_time it only times out, like a GPS that went silent.
+    """
+
+    def __init__(self, rover, clock, rate=GPS_RATE_HZ, noise_m=0.0, max_time=None, seed=0):
+        self.rover = rover
+        self.clock = clock
+        self.period = 1.0 / rate
+        self.noise_m = noise_m
+        self.max_time = max_time
+        self.random = random.Random(seed)
+        self.next_fix = clock.time()
+        self.written = []
+        clock.models.append(rover)
+
+    @property
+    def in_waiting(self):
+        return 0
+
+    def readline(self):
+        if self.max_time is not None and self.clock.time() >= self.max_time:
+            self.clock.sleep(SERIAL_TIMEOUT)
+            return b""
+        if self.next_fix > self.clock.time():
+            self.clock.advance_to(self.next_fix)
+        self.next_fix = max(self.next_fix, self.clock.time() - self.period) + self.period
+
+        east, north = self.rover.east, self.rover.north
+        if self.noise_m:
+            east += self.random.gauss(0, self.noise_m)
+            north += self.random.gauss(0, self.noise_m)
+        lat, lon = from_local(east, north, self.rover.ref_lat, self.rover.ref_lon)
+        return (gga_sentence(float(lat), float(lon), self.clock.time()) + "\r\n").encode()
+
+    def read(self, size=1):
+        return self.readline()
+
+    def write(self, data):
+        for cmd in data.decode(errors="ignore"):
+            self.written.append((self.clock.time(), cmd))
+            self.rover.command(cmd)
+        return len(data)
+
+    def close(self):
+        pass
+
+
+class ReplaySerial:
+    """
+    Open-loop fake serial port that plays back recorded data: an NMEA log
+    (one sentence per line, "GPS:" prefixes allowed) or a
+    gps_navigation_log.csv. Lines are released at the given rate in
+    simulated time; writes are recorded but change nothing.
+    """
+
+    def __init__(self, path, clock, rate=GPS_RATE_HZ):
+        self.clock = clock
+        self.period = 1.0 / rate
+        self.lines = self._load(path)
+        self.index = 0
+        self.next_line = clock.time()
+        self.written = []
+
+    def _load(self, path):
+        with open(path, newline="") as f:
+            first = f.readline()
+            f.seek(0)
+            if first.startswith("LogTime"):
+                lines = []
+                for i, row in enumerate(csv.DictReader(f)):
+                    try:
+                        lat, lon = float(row["Latitude"]), float(row["Longitude"])
+                    except (KeyError, ValueError):
+                        continue
+                    lines.append(gga_sentence(lat, lon, i * self.period))
+                return lines
+            return [line.strip() for line in f if "$" in line]
+
+    @property
+    def in_waiting(self):
+        return 0
+
+    def readline(self):
+        if self.index >= len(self.lines):
+            self.clock.sleep(SERIAL_TIMEOUT)
+            return b""
+        if self.next_line > self.clock.time():
+            self.clock.advance_to(self.next_line)
+        self.next_line = self.clock.time() + self.period
+        line = self.lines[self.index]
+        self.index += 1
+        return (line + "\r\n").encode()
+
+    def read(self, size=1):
+        return self.readline()
+
+    def write(self, data):
+        self.written.append((self.clock.time(), data))
+        return len(data)
+
+    def close(self):
+        pass
+
+
+class SimMotorController:
+    """Replaces motor_control.RoverMotorController by sending WASD bytes to the fake serial port."""
+
+    def __init__(self, port):
+        self.port = port
+
+    def send(self, cmd):
+        self.port.write(cmd.encode())
+
+    def stop(self):
+        self.send("F")
+
+    def cleanup(self):
+        self.stop()
+
+
+def sim_execute_movement(decision, motor_controller):
+    motor_controller.send(DECISION_TO_COMMAND.get(decision, "F"))
+
+
+def start_pose(waypoints, back_off_m=10.0):
+    """Start position back_off_m before the first waypoint, facing it."""
+    (lat1, lon1), (lat2, lon2) = waypoints[0], waypoints[min(1, len(waypoints) - 1)]
+    east, north = to_local(lat2, lon2, lat1, lon1)
+    heading = math.degrees(math.atan2(east, north)) % 360 if (east or north) else 0.0
+    rad = math.radians(heading)
+    lat, lon = from_local(-back_off_m * math.sin(rad), -back_off_m * math.cos(rad), lat1, lon1)
+    return float(lat), float(lon), heading
+
+
+def run_main_navigation(waypoints, replay=None, max_time=600.0, noise_m=0.0, seed=0, verbose=False, steering=True):
+    """
+    Runs main.navigate against a simulated (or replayed) GPS.
+    Returns a dict with reached waypoints, simulated and wall time.
+    """
+    import main
+
+    clock = SimClock()
+    lat, lon, heading = start_pose(waypoints)
+    rover = KinematicRover(lat, lon, heading)
+    if replay:
+        port = ReplaySerial(replay, clock)
+    else:
+        port = SimulatedGpsSerial(rover, clock, noise_m=noise_m, max_time=max_time, seed=seed)
+
+    wall_start = time.perf_counter()
+    reached = main.navigate(port, waypoints, SimMotorController(port), sim_execute_movement,
+                            clock=clock, verbose=verbose, steering=steering)
+    wall = time.perf_counter() - wall_start
+    return {
+        "reached": reached,
+        "waypoints": len(waypoints),
+        "sim_time": clock.time(),
+        "wall_time": wall,
+        "speedup": clock.time() / wall if wall > 0 else float("inf"),
+        "distance": rover.distance_travelled,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay / simulate main.py navigation faster than real time")
+    parser.add_argument("waypoints", nargs="?", default="gpslocations/sample-gpslocations.txt")
+    parser.add_argument("--replay", help="recorded NMEA log or gps_navigation_log.csv to play back (open loop)")
+    parser.add_argument("--max-time", type=float, default=600.0, help="simulated seconds before giving up")
+    parser.add_argument("--noise", type=float, default=0.0, help="GPS noise (m, 1 sigma)")
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--bang-bang", action="store_true", help="use the old ±20° forward/left/right steering")
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    import main as rover_main
+    waypoints = rover_main.load_gps_waypoints(args.waypoints)
+    for run in range(args.runs):
+        stats = run_main_navigation(waypoints, args.replay, args.max_time, args.noise, run, args.verbose,
+                                    steering=not args.bang_bang)
+        print(f"Run {run + 1}: reached {stats['reached']}/{stats['waypoints']} in {stats['sim_time']:.1f} s "
+              f"simulated ({stats['distance']:.1f} m), {stats['wall_time']:.2f} s wall, "
+              f"{stats['speedup']:.0f}x real time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+# Latest parsed value of one kind of line, with the time its line was framed
+# and a sequence number that grows with every new value
+Snapshot = namedtuple("Snapshot", ["value", "timestamp", "seq"])
+
+
+class SerialLineReader:
+    """
+    Drains a serial port on a background thread so the navigation loop
+    always works on the newest data instead of whatever line is next in
+    the OS buffer.
+
+    Bytes are read in bulk (read(in_waiting)), framed into lines in a
+    bounded buffer, and the recent lines are kept in a ring. Lines the GPS
+    and heading parsers accept become the latest GPS fix / heading snapshot.
+    """
+
+    def __init__(self, serial_port, gps_parser=None, heading_parser=None, max_buffer=4096, history=256):
+        self.serial_port = serial_port
+        self.gps_parser = gps_parser
+        self.heading_parser = heading_parser
+        self.max_buffer = max_buffer
+
+        self.buffer = bytearray()
+        self.lines = deque(maxlen=history)  # (timestamp, line) ring
+
+        self._gps = None
+        self._heading = None
+        self._cond = threading.Condition()
+        self._running = threading.Event()
+        self._thread = None
+
+        # Counters
+        self.bytes_read = 0
+        self.lines_read = 0
+        self.overflows = 0
+
+    def start(self):
+        if self._running.is_set():
+            return self
+        self._running.set()
+        self._thread = threading.Thread(target=self._run, name="serial-reader", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._running.clear()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def _run(self):
+        while self._running.is_set():
+            try:
+                # Blocks for at most the port timeout when nothing is waiting
+                data = self.serial_port.read(self.serial_port.in_waiting or 1)
+            except Exception as e:
+                print(f"[WARNING] Serial read error: {e}")
+                time.sleep(0.1)
+                continue
+            if data:
+                self.feed(data)
+
+    def feed(self, data, now=None):
+        """Frames raw bytes into lines and updates the snapshots."""
+        now = time.time() if now is None else now
+        self.bytes_read += len(data)
+        self.buffer += data
+        if len(self.buffer) > self.max_buffer:
+            # No newline for too long: drop the oldest bytes
+            del self.buffer[:len(self.buffer) - self.max_buffer]
+            self.overflows += 1
+
+        if b"\n" not in data:
+            return
+        *complete, rest = self.buffer.split(b"\n")
+        self.buffer = bytearray(rest)
+        for raw in complete:
+            line = raw.decode('utf-8', errors='ignore').strip()
+            if line:
+                self._dispatch(line, now)
+
+    def _dispatch(self, line, now):
+        self.lines_read += 1
+        self.lines.append((now, line))
+
+        if line.startswith("Heading:"):
+            if self.heading_parser is None:
+                return
+            value = self.heading_parser(line)
+            if value is not None:
+                with self._cond:
+                    seq = self._heading.seq + 1 if self._heading else 1
+                    self._heading = Snapshot(value, now, seq)
+                    self._cond.notify_all()
+            return
+
+        if self.gps_parser is None:
+            return
+        value = self.gps_parser(line)
+        if value is None or (isinstance(value, tuple) and value[0] is None):
+            return
+        with self._cond:
+            seq = self._gps.seq + 1 if self._gps else 1
+            self._gps = Snapshot(value, now, seq)
+            self._cond.notify_all()
+
+    def latest_gps(self):
+        with self._cond:
+            return self._gps
+
+    def latest_heading(self):
+        with self._cond:
+            return self._heading
+
+    def wait_for_gps(self, after_seq=0, timeout=None):
+        """
+        Blocks until a GPS fix newer than after_seq is available.
+        Returns the snapshot, or None on timeout.
+        """
+        with self._cond:
+            self._cond.wait_for(lambda: self._gps is not None and self._gps.seq > after_seq, timeout)
+            if self._gps is not None and self._gps.seq > after_seq:
+                return self._gps
+            return None
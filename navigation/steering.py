@@ -0,0 +1,116 @@
+from collections import namedtuple
+
+from navigation.headinglogic import heading_error
+
+# Rover command bytes (same letters the firmware and WASD controllers use)
+DECISION_TO_COMMAND = {"forward": "W", "backward": "S", "left": "A", "right": "D", "stop": "F"}
+
+# throttle and steer in [-1, 1] of the rover's top speed / pivot rate, steer > 0 = clockwise
+Setpoint = namedtuple("Setpoint", ["throttle", "steer"])
+
+
+def _clamp(value, low, high):
+    return max(low, min(high, value))
+
+
+class SteeringController:
+    """
+    PID on the heading error that outputs a continuous Setpoint instead
+    of the bang-bang forward/left/right decision. Steer is rate limited
+    so it cannot flip sides between two updates, and throttle fades out
+    as the error grows so large errors turn (nearly) in place:
+
+      |error| <= full_throttle_error   full throttle
+      |error| >= stop_throttle_error   pivot only
+    """
+
+    def __init__(self, kp=1 / 45.0, ki=0.0, kd=0.0, max_steer_rate=2.0, integral_limit=0.3,
+                 full_throttle_error=10.0, stop_throttle_error=60.0):
+        self.kp = kp
+        self.ki = ki
+        self.kd = kd
+        self.max_steer_rate = max_steer_rate  # steer units per second
+        self.integral_limit = integral_limit
+        self.full_throttle_error = full_throttle_error
+        self.stop_throttle_error = stop_throttle_error
+        self.reset()
+
+    def reset(self):
+        self.integral = 0.0
+        self.prev_error = None
+        self.steer = 0.0
+
+    def update(self, current_heading, target_bearing, dt):
+        """Returns the Setpoint for this step; a stop while the heading is unknown."""
+        if current_heading is None:
+            self.reset()
+            return Setpoint(0.0, 0.0)
+        error = heading_error(current_heading, target_bearing)
+
+        derivative = 0.0
+        if dt > 0:
+            if self.ki:
+                self.integral = _clamp(self.integral + error * dt, -self.integral_limit / self.ki,
+                                       self.integral_limit / self.ki)
+            if self.prev_error is not None:
+                derivative = heading_error(self.prev_error, error) / dt
+        self.prev_error = error
+
+        target = _clamp(self.kp * error + self.ki * self.integral + self.kd * derivative, -1.0, 1.0)
+        if dt > 0:
+            max_step = self.max_steer_rate * dt
+            self.steer += _clamp(target - self.steer, -max_step, max_step)
+        else:
+            self.steer = target
+
+        span = self.stop_throttle_error - self.full_throttle_error
+        throttle = _clamp((self.stop_throttle_error - abs(error)) / span, 0.0, 1.0) if span > 0 else 1.0
+        return Setpoint(throttle, self.steer)
+
+
+class DutyCycleEncoder:
+    """
+    Turns a continuous Setpoint into the existing single-byte commands by
+    duty cycling: called once per control tick it returns "forward",
+    "left", "right" or "stop" so that, averaged over a few ticks, the time
+    spent pivoting matches |steer| and the time driving matches throttle
+    (sigma-delta, so no fixed PWM period is needed).
+    """
+
+    def __init__(self):
+        self.turn_acc = 0.0
+        self.drive_acc = 0.0
+
+    def reset(self):
+        self.turn_acc = self.drive_acc = 0.0
+
+    def next(self, setpoint):
+        turn = abs(setpoint.steer)
+        drive = max(0.0, setpoint.throttle)
+        # The rover either drives or pivots during a tick, share the time if both are asked for
+        total = turn + drive
+        if total > 1.0:
+            turn, drive = turn / total, drive / total
+        self.turn_acc += turn
+        self.drive_acc += drive
+
+        if max(self.turn_acc, self.drive_acc) < 0.5 - 1e-9:
+            return "stop"
+        if self.turn_acc >= self.drive_acc:
+            self.turn_acc -= 1.0
+            return "right" if setpoint.steer > 0 else "left"
+        self.drive_acc -= 1.0
+        return "forward"
+
+    def next_command(self, setpoint):
+        return DECISION_TO_COMMAND[self.next(setpoint)]
+
+
+def speed_command(setpoint, max_pwm=200):
+    """
+    Compact differential speed command b"M<left>,<right>\\n" (PWM -max_pwm..max_pwm)
+    for firmware that drives the motors proportionally instead of by WASD letters.
+    """
+    left = _clamp(setpoint.throttle + setpoint.steer, -1.0, 1.0)
+    right = _clamp(setpoint.throttle - setpoint.steer, -1.0, 1.0)
+    return f"M{round(left * max_pwm)},{round(right * max_pwm)}\n".encode()
@@ -0,0 +1,198 @@
+import os
+
+import numpy as np
+
+from navigation.distance_bearing import to_local
+from navigation.mission import load_waypoints
+
+GRID_CELL_M = 25.0
+CACHE_SUFFIX = ".cache.npz"
+
+
+class WaypointStore:
+    """
+    Waypoints kept as flat NumPy arrays (lat, lon, local east/north in
+    metres and names) with a uniform grid index for nearest and radius
+    queries, so lookups stay cheap with thousands of surveyed points.
+    Distances come from the local equirectangular frame (see
+    distance_bearing.to_local), which is accurate at rover ranges.
+    """
+
+    def __init__(self, lat, lon, names=None, cell_size=GRID_CELL_M):
+        self.lat = np.asarray(lat, dtype=np.float64).ravel()
+        self.lon = np.asarray(lon, dtype=np.float64).ravel()
+        if names is None:
+            names = [str(i + 1) for i in range(len(self.lat))]
+        self.names = np.asarray(names, dtype=str)
+        self.cell_size = float(cell_size)
+        self.ref = (float(self.lat.mean()), float(self.lon.mean())) if len(self.lat) else (0.0, 0.0)
+        east, north = to_local(self.lat, self.lon, *self.ref)
+        self.xy = np.column_stack([east, north]) if len(self.lat) else np.empty((0, 2))
+        self._build_index()
+
+    def __len__(self):
+        return len(self.lat)
+
+    def __getitem__(self, i):
+        return float(self.lat[i]), float(self.lon[i]), str(self.names[i])
+
+    def as_waypoints(self):
+        """List of (lat, lon, name), the format Mission takes."""
+        return [self[i] for i in range(len(self))]
+
+    # === Grid index ===
+    # Points are sorted by cell; each occupied cell maps to a slice of self.order.
+
+    def _cell(self, xy):
+        return np.floor(np.asarray(xy) / self.cell_size).astype(np.int64)
+
+    def _build_index(self):
+        self.cells = {}
+        if not len(self):
+            self.order = np.empty(0, dtype=np.int64)
+            return
+        cells = self._cell(self.xy)
+        self.order = np.lexsort((cells[:, 1], cells[:, 0]))
+        sorted_cells = cells[self.order]
+        change = np.flatnonzero(np.any(np.diff(sorted_cells, axis=0), axis=1)) + 1
+        starts = np.concatenate([[0], change])
+        ends = np.concatenate([change, [len(self.order)]])
+        for start, end in zip(starts, ends):
+            self.cells[tuple(int(v) for v in sorted_cells[start])] = (start, end)
+        self.cell_min = cells.min(axis=0)
+        self.cell_max = cells.max(axis=0)
+
+    def _indices_in_cells(self, cx0, cx1, cy0, cy1):
+        chunks = []
+        for cx in range(max(cx0, self.cell_min[0]), min(cx1, self.cell_max[0]) + 1):
+            for cy in range(max(cy0, self.cell_min[1]), min(cy1, self.cell_max[1]) + 1):
+                span = self.cells.get((cx, cy))
+                if span is not None:
+                    chunks.append(self.order[span[0]:span[1]])
+        return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+    def _local(self, lat, lon):
+        east, north = to_local(lat, lon, *self.ref)
+        return np.array([float(east), float(north)])
+
+    def nearest(self, lat, lon, k=1):
+        """
+        Indices and distances (m) of the k nearest waypoints, closest first.
+        Searches rings of grid cells outwards until no closer point can exist.
+        """
+        k = min(k, len(self))
+        if k == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        p = self._local(lat, lon)
+        cx, cy = self._cell(p)
+        max_ring = int(max(abs(cx - self.cell_min[0]), abs(cx - self.cell_max[0]),
+                           abs(cy - self.cell_min[1]), abs(cy - self.cell_max[1])))
+        ring = 0
+        while True:
+            candidates = self._indices_in_cells(cx - ring, cx + ring, cy - ring, cy + ring)
+            if len(candidates) >= k:
+                d = np.hypot(*(self.xy[candidates] - p).T)
+                best = np.argsort(d)[:k]
+                # Everything within ring * cell_size has been seen, closer points can't hide further out
+                if d[best[-1]] <= ring * self.cell_size or ring >= max_ring:
+                    return candidates[best], d[best]
+            elif ring >= max_ring:
+                candidates = np.arange(len(self))
+                d = np.hypot(*(self.xy - p).T)
+                best = np.argsort(d)[:k]
+                return candidates[best], d[best]
+            ring += 1
+
+    def within(self, lat, lon, radius):
+        """Indices and distances (m) of all waypoints within radius metres, closest first."""
+        if not len(self):
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        p = self._local(lat, lon)
+        (cx0, cy0), (cx1, cy1) = self._cell(p - radius), self._cell(p + radius)
+        candidates = self._indices_in_cells(cx0, cx1, cy0, cy1)
+        d = np.hypot(*(self.xy[candidates] - p).T) if len(candidates) else np.empty(0)
+        keep = np.flatnonzero(d <= radius)
+        keep = keep[np.argsort(d[keep])]
+        return candidates[keep], d[keep]
+
+    # === Files ===
+
+    @classmethod
+    def from_file(cls, path, cell_size=GRID_CELL_M, cache=True):
+        """
+        Loads a "lat, lon[, name]" waypoint file. With cache=True a binary
+        copy is kept next to it (path + CACHE_SUFFIX) and used as long as
+        the source file's size and modification time match.
+        """
+        cache_path = path + CACHE_SUFFIX
+        stat = os.stat(path)
+        if cache and os.path.isfile(cache_path):
+            try:
+                with np.load(cache_path) as data:
+                    if int(data["source_size"]) == stat.st_size and int(data["source_mtime_ns"]) == stat.st_mtime_ns:
+                        return cls(data["lat"], data["lon"], data["names"], cell_size)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"[WARNING] Ignoring waypoint cache {cache_path}: {e}")
+
+        waypoints = load_waypoints(path)
+        store = cls([w[0] for w in waypoints], [w[1] for w in waypoints], [w[2] for w in waypoints], cell_size)
+        if cache:
+            try:
+                store.save(cache_path, source_size=stat.st_size, source_mtime_ns=stat.st_mtime_ns)
+            except OSError as e:
+                print(f"[WARNING] Could not write waypoint cache {cache_path}: {e}")
+        return store
+
+    def save(self, path, **extra):
+        # Written via a file object so np.savez keeps the exact file name
+        with open(path, "wb") as f:
+            np.savez(f, lat=self.lat, lon=self.lon, names=self.names, **extra)
+
+    @classmethod
+    def load(cls, path, cell_size=GRID_CELL_M):
+        with np.load(path) as data:
+            return cls(data["lat"], data["lon"], data["names"], cell_size)
+
+
+class Geofence:
+    """
+    Polygon of (lat, lon) vertices. contains() is a vectorised even-odd
+    ray casting test in the local frame, with a bounding box check first.
+    """
+
+    def __init__(self, vertices, name="geofence"):
+        vertices = np.asarray([v[:2] for v in vertices], dtype=np.float64)
+        if len(vertices) < 3:
+            raise ValueError("A geofence needs at least 3 vertices")
+        self.name = name
+        self.vertices = vertices
+        self.ref = (float(vertices[:, 0].mean()), float(vertices[:, 1].mean()))
+        east, north = to_local(vertices[:, 0], vertices[:, 1], *self.ref)
+        self.x, self.y = np.asarray(east), np.asarray(north)
+        self.x_next, self.y_next = np.roll(self.x, -1), np.roll(self.y, -1)
+        self.bbox = (self.x.min(), self.x.max(), self.y.min(), self.y.max())
+
+    @classmethod
+    def from_file(cls, path, name=None):
+        """Vertices from a "lat, lon" file, in order."""
+        return cls(load_waypoints(path), name or os.path.splitext(os.path.basename(path))[0])
+
+    def contains(self, lat, lon):
+        """True where the point(s) lie inside the polygon; scalars give a bool."""
+        east, north = to_local(lat, lon, *self.ref)
+        east = np.asarray(east, dtype=np.float64)
+        north = np.asarray(north, dtype=np.float64)
+        # Cheap bounding box test first, the ray cast only runs for points inside it
+        x0, x1, y0, y1 = self.bbox
+        inside = (east >= x0) & (east <= x1) & (north >= y0) & (north <= y1)
+        candidates = np.nonzero(inside.reshape(-1))[0]
+        if candidates.size:
+            px = east.reshape(-1)[candidates, None]
+            py = north.reshape(-1)[candidates, None]
+            crosses = (self.y > py) != (self.y_next > py)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                x_at = self.x + (py - self.y) * (self.x_next - self.x) / (self.y_next - self.y)
+            flat = inside.reshape(-1)
+            flat[candidates] = np.count_nonzero(crosses & (px < x_at), axis=-1) % 2 == 1
+            inside = flat.reshape(inside.shape)
+        return bool(inside) if inside.ndim == 0 else inside
@@ -0,0 +1,319 @@
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import serial
+
+from navigation import nmea
+from navigation.heading_filter import HeadingEstimator
+from navigation.mission import Mission
+from navigation.steering import SteeringController, DutyCycleEncoder, Setpoint
+from navigation.waypoint_store import WaypointStore
+
+TURN_RATE = 60.0  # deg/s of the rover pivoting in place, for dead reckoning between sensor updates
+CONTROL_TICK = 0.1  # seconds between duty cycled W/A/D commands
+LINE_QUEUE_SIZE = 256
+FIX_TIMEOUT = 3.0  # seconds without a GPS fix before the rover is braked
+
+
+class LatestQueue(asyncio.Queue):
+    """
+    Bounded asyncio queue where the newest item wins: put_latest() never
+    blocks, it drops the oldest item when full and counts the drops.
+    """
+
+    def __init__(self, maxsize=1):
+        super().__init__(maxsize)
+        self.dropped = 0
+
+    def put_latest(self, item):
+        while True:
+            try:
+                self.put_nowait(item)
+                return
+            except asyncio.QueueFull:
+                try:
+                    self.get_nowait()
+                    self.dropped += 1
+                except asyncio.QueueEmpty:
+                    pass
+
+
+def parse_heading_line(line):
+    try:
+        return float(line.split(":")[1].strip())
+    except (IndexError, ValueError):
+        return None
+
+
+class RoverRuntime:
+    """
+    Runs the rover as asyncio tasks connected by bounded queues:
+
+      read_serial     port bytes -> lines (blocking reads in a thread)
+      parse_lines     lines -> GPS fixes / compass headings, NMEA course into the estimator
+      detect_tags     ArUcoDetector in its own executor -> confirmed tag ids
+      on_fix          fix -> heading estimate + mission -> steering setpoint
+      on_heading      compass heading -> heading estimate -> steering setpoint
+      write_commands  setpoint -> duty cycled W/A/D bytes every CONTROL_TICK,
+                      F while the last fix is older than FIX_TIMEOUT
+
+    Lines, fixes and headings go through LatestQueues so a slow consumer
+    only ever sees the newest value, and each sensor is handled at its own
+    rate instead of the slowest one's.
+    """
+
+    def __init__(self, port, waypoints, detector=None, verbose=True):
+        self.port = port
+        self.detector = detector
+        self.verbose = verbose
+
+        self.lines = LatestQueue(LINE_QUEUE_SIZE)
+        self.fixes = LatestQueue()
+        self.headings = LatestQueue()
+
+        self.estimator = HeadingEstimator()
+        self.mission = Mission(waypoints, listeners=[self.report_event])
+        self.controller = SteeringController()
+        self.encoder = DutyCycleEncoder()
+        self.guidance = None
+        self.setpoint = None
+        self.turn_rate = 0.0
+        self.last_predict = time.monotonic()
+        self.last_steer = None
+        self.last_fix = None
+        self.seen_tags = set()
+        self.finished = asyncio.Event()
+
+        # Counters
+        self.lines_read = 0
+        self.fixes_read = 0
+        self.headings_read = 0
+        self.commands_sent = 0
+        self.fix_timeouts = 0
+
+    def report_event(self, event):
+        if event.kind == "waypoint":
+            print(f"✅ Reached waypoint {event.index + 1}/{len(self.mission.waypoints)}")
+        elif event.kind == "completed":
+            print("🏁 Mission complete")
+            self.finished.set()
+
+    # === Sensor tasks ===
+
+    async def read_serial(self):
+        loop = asyncio.get_running_loop()
+        buffer = bytearray()
+        while True:
+            try:
+                # Blocks for at most the port timeout, off the event loop
+                data = await loop.run_in_executor(None, self.port.read, self.port.in_waiting or 1)
+            except serial.SerialException as e:
+                print(f"[WARNING] Serial read error: {e}")
+                await asyncio.sleep(0.1)
+                continue
+            if not data:
+                continue
+            buffer += data
+            if b"\n" not in data:
+                continue
+            *complete, rest = buffer.split(b"\n")
+            buffer = bytearray(rest)
+            now = time.monotonic()
+            for raw in complete:
+                line = raw.decode('utf-8', errors='ignore').strip()
+                if line:
+                    self.lines.put_latest((now, line))
+
+    async def parse_lines(self):
+        while True:
+            now, line = await self.lines.get()
+            self.lines_read += 1
+            if line.startswith("Heading:"):
+                heading = parse_heading_line(line)
+                if heading is not None:
+                    self.headings.put_latest((now, heading))
+                continue
+
+            record = nmea.parse_sentence(line[len("GPS:"):] if line.startswith("GPS:") else line)
+            if isinstance(record, (nmea.RMC, nmea.VTG)) and record.speed_knots is not None:
+                self.estimator.update_course(record.course, record.speed_knots * nmea.KNOTS_TO_MPS)
+            elif isinstance(record, nmea.GGA):
+                fix = nmea.position(record)
+                if fix is not None:
+                    self.fixes.put_latest((now, fix))
+
+    async def detect_tags(self, executor):
+        from detection.tag_utils import TagDebouncer
+
+        loop = asyncio.get_running_loop()
+        debouncer = TagDebouncer()
+        while True:
+            tags = await loop.run_in_executor(executor, self.detector.get_tags)
+            confirmed = debouncer.update(tags)
+            new = [int(tag) for tag in confirmed if int(tag) not in self.seen_tags]
+            if new:
+                self.seen_tags.update(new)
+                print(f"✅ Detected ArUco Tag ID(s): {new}")
+
+    # === Navigation ===
+
+    def _predict(self, now):
+        self.estimator.predict(self.turn_rate, now - self.last_predict)
+        self.last_predict = now
+
+    def _steer(self, now):
+        if self.guidance is None:
+            return
+        if self.estimator.heading is None:
+            self.setpoint = Setpoint(1.0, 0.0)  # No heading yet: drive straight until the fixes give one
+            return
+        dt = now - self.last_steer if self.last_steer is not None else 0.0
+        self.last_steer = now
+        self.setpoint = self.controller.update(self.estimator.heading, self.guidance.bearing, dt)
+        if self.setpoint.throttle == 0.0:
+            self.estimator.reset_anchor()
+
+    async def on_fix(self):
+        while not self.mission.done:
+            now, (lat, lon) = await self.fixes.get()
+            self.fixes_read += 1
+            self.last_fix = now
+            self._predict(now)
+            self.estimator.update_fix(lat, lon, now)
+            self.guidance = self.mission.update(lat, lon, now)
+            if self.guidance is None:
+                self.setpoint = Setpoint(0.0, 0.0)
+                return
+            self._steer(now)
+            if self.verbose:
+                heading = self.estimator.heading
+                print(f"📍 ({lat:.6f}, {lon:.6f}) -> {self.guidance.name} | "
+                      f"{self.mission.remaining_distance(lat, lon):.1f} m to go | "
+                      f"heading {heading if heading is None else round(heading, 1)} | "
+                      f"bearing {self.guidance.bearing:.1f} | {self.setpoint}")
+
+    async def on_heading(self):
+        while True:
+            now, heading = await self.headings.get()
+            self.headings_read += 1
+            self._predict(now)
+            self.estimator.update_compass(heading)
+            self._steer(now)
+
+    def fix_is_stale(self, now):
+        return self.last_fix is not None and now - self.last_fix > FIX_TIMEOUT
+
+    async def write_commands(self):
+        last_command = None
+        stale = False
+        while True:
+            if self.setpoint is not None:
+                now = time.monotonic()
+                if self.fix_is_stale(now) != stale:
+                    stale = not stale
+                    if stale:
+                        self.fix_timeouts += 1
+                        print(f"[WARNING] No GPS fix for {FIX_TIMEOUT:g} s. Braking until fixes return.")
+                    else:
+                        print("📍 GPS fixes are back, resuming.")
+                if self.finished.is_set() or stale:
+                    command = "F"
+                else:
+                    command = self.encoder.next_command(self.setpoint)
+                if command != last_command:
+                    self._predict(time.monotonic())
+                    self.port.write(command.encode())
+                    self.commands_sent += 1
+                    last_command = command
+                    self.turn_rate = {"A": -TURN_RATE, "D": TURN_RATE}.get(command, 0.0)
+            await asyncio.sleep(CONTROL_TICK)
+
+    async def run(self):
+        """
+        Runs until the mission is complete (or the task is cancelled); the
+        rover is braked on exit. A task failing stops the runtime and its
+        exception is raised from here.
+        """
+        if not self.mission.waypoints:
+            print("❌ No GPS waypoints loaded.")
+            return
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="aruco") if self.detector else None
+        tasks = [
+            asyncio.create_task(self.read_serial()),
+            asyncio.create_task(self.parse_lines()),
+            asyncio.create_task(self.on_fix()),
+            asyncio.create_task(self.on_heading()),
+            asyncio.create_task(self.write_commands()),
+        ]
+        if self.detector is not None:
+            tasks.append(asyncio.create_task(self.detect_tags(executor)))
+        finished = asyncio.create_task(self.finished.wait())
+        try:
+            # on_fix also returns once the mission is done, every other task only ends by failing
+            done, _ = await asyncio.wait(tasks + [finished], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task is not finished and task.exception() is not None:
+                    print(f"[ERROR] Runtime task failed: {task.exception()!r}. Braking.")
+                    raise task.exception()
+        finally:
+            finished.cancel()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self.port.write(b"F")
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def stats(self):
+        return {
+            "lines": self.lines_read,
+            "fixes": self.fixes_read,
+            "headings": self.headings_read,
+            "commands": self.commands_sent,
+            "fix_timeouts": self.fix_timeouts,
+            "dropped_lines": self.lines.dropped,
+            "dropped_fixes": self.fixes.dropped,
+            "dropped_headings": self.headings.dropped,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Asyncio rover runtime: GPS, compass, camera and commands")
+    parser.add_argument("--port", default="COM8")
+    parser.add_argument("--baud", type=int, default=9600)
+    parser.add_argument("--waypoints", default="gpslocations/sample-gpslocations.txt")
+    parser.add_argument("--camera", type=int, help="camera id for ArUco detection (off when not given)")
+    parser.add_argument("--quiet", action="store_true")
+    args = parser.parse_args()
+
+    detector = None
+    if args.camera is not None:
+        from detection.aruco_detector import ArUcoDetector
+        detector = ArUcoDetector(camera_id=args.camera, lock_on=True)
+
+    try:
+        ser = serial.Serial(args.port, args.baud, timeout=0.1)
+        print(f"✅ Connected to rover on {args.port} at {args.baud} baud")
+    except Exception as e:
+        print(f"[ERROR] Could not open serial port: {e}")
+        return
+
+    runtime = RoverRuntime(ser, WaypointStore.from_file(args.waypoints).as_waypoints(), detector,
+                           verbose=not args.quiet)
+    try:
+        asyncio.run(runtime.run())
+    except KeyboardInterrupt:
+        print("\n🛑 Stopped by user.")
+        ser.write(b"F")
+    finally:
+        ser.close()
+        if detector is not None:
+            detector.release()
+        print(f"🧹 Cleaned up resources. {runtime.stats()}")
+
+
+# === Main Execution ===
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+# Tests import the packages the same way the scripts do, from the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class FakeClock:
+    """clock= stand-in for the groundstation classes; tests move time by setting .now."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePort:
+    """Serial port stand-in that records every write."""
+
+    def __init__(self):
+        self.writes = []
+
+    def write(self, data):
+        self.writes.append(bytes(data))
+
+    @property
+    def written(self):
+        return b"".join(self.writes)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def port():
+    return FakePort()
@@ -0,0 +1,45 @@
+import pytest
+
+from groundstation.binary_frame import FRAME_SENSORS, FRAME_TELEMETRY, MAX_PAYLOAD, FrameDecoder, crc16, encode_frame
+
+SENSORS = {"TEMP": 23.4, "HUM": 45.6, "PRES": 1013.2, "GAS": 12.3, "CH4": 200, "LPG": 300, "LIGHT": 800,
+           "LAT": 52.4764387, "LON": 13.4584166}
+
+
+def test_crc16_ccitt_false_check_value():
+    assert crc16(b"123456789") == 0x29B1
+
+
+def test_frame_round_trip_fits_nrf24_packet():
+    frame = encode_frame(FRAME_SENSORS, 7, SENSORS)
+    assert len(frame) <= 32
+    decoded, = FrameDecoder().feed(frame)
+    assert (decoded.type, decoded.seq) == (FRAME_SENSORS, 7)
+    for name, value in SENSORS.items():
+        assert decoded.fields[name] == pytest.approx(value, abs=1e-6)
+
+
+def test_payload_too_long():
+    with pytest.raises(ValueError):
+        encode_frame(0x7F, 0, payload=bytes(MAX_PAYLOAD + 1))
+
+
+def test_split_reads_and_resync_after_corruption():
+    frames = [encode_frame(FRAME_TELEMETRY, i, {"TEMP": 20 + i, "HUM": 50, "TAG": i, "TIMESTAMP": i}) for i in range(5)]
+    corrupted = bytearray(frames[2])
+    corrupted[7] ^= 0xFF
+    stream = b"noise" + frames[0] + frames[1] + bytes(corrupted) + frames[3] + frames[4]
+
+    decoder = FrameDecoder()
+    decoded = []
+    for i in range(0, len(stream), 5):
+        decoded.extend(decoder.feed(stream[i:i + 5]))
+    assert [f.seq for f in decoded] == [0, 1, 3, 4]
+    assert decoder.crc_errors == 1
+    assert decoder.malformed == 1
+
+
+def test_unknown_type_is_counted():
+    decoder = FrameDecoder()
+    assert decoder.feed(encode_frame(0x7F, 0, payload=b"xy")) == []
+    assert decoder.unknown_types == 1
@@ -0,0 +1,61 @@
+from groundstation.command_channel import CommandChannel
+
+
+def test_repeated_drive_commands_are_coalesced(port, clock):
+    channel = CommandChannel(port, clock=clock)
+    for _ in range(10):
+        channel.set_drive("W")
+        channel.poll()
+        clock.now += 0.01
+    assert port.writes == [b"W"]
+    assert channel.coalesced == 9
+
+
+def test_keepalive_resends_current_command(port, clock):
+    channel = CommandChannel(port, clock=clock, keepalive=0.5)
+    channel.set_drive("W")
+    channel.poll()
+    clock.now = 0.6
+    channel.poll()
+    assert port.writes == [b"W", b"W"]
+    assert channel.keepalives == 1
+
+
+def test_brake_is_immediate(port, clock):
+    channel = CommandChannel(port, clock=clock)
+    channel.set_drive("W")
+    channel.poll()
+    channel.set_drive("F")
+    assert port.writes == [b"W", b"F"]
+
+
+def test_changes_respect_min_interval(port, clock):
+    channel = CommandChannel(port, clock=clock, min_interval=0.02)
+    channel.set_drive("W")
+    channel.poll()
+    channel.set_drive("A")
+    channel.poll()
+    assert port.writes == [b"W"]
+    clock.now = 0.03
+    channel.poll()
+    assert port.writes == [b"W", b"A"]
+
+
+def test_aux_bytes_are_rate_limited_and_do_not_force_a_drive_resend(port, clock):
+    channel = CommandChannel(port, clock=clock, baud=9600, max_utilization=0.01, window=1.0)
+    channel.set_drive("W")
+    channel.poll()
+    for _ in range(20):
+        channel.send_aux("o")
+    clock.now = 0.05
+    channel.poll()
+    assert port.writes.count(b"o") < 20
+    assert channel.aux_deferred > 0
+    # Aux bytes do not trigger a drive resend, only the keepalive does
+    clock.now = 0.1
+    channel.poll()
+    assert port.writes.count(b"W") == 1
+    clock.now = 0.5
+    channel.poll()
+    assert port.writes.count(b"W") == 2
+
@@ -0,0 +1,78 @@
+import csv
+import time
+
+from navigation.csv_logger import BufferedCsvLogger
+
+HEADER = ["LogTime", "Latitude", "Longitude"]
+
+
+def read_rows(path):
+    with open(path, newline="") as f:
+        return list(csv.reader(f))
+
+
+def wait_for_rows(path, count, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        rows = read_rows(path)
+        if len(rows) >= count:
+            return rows
+        time.sleep(0.01)
+    return read_rows(path)
+
+
+def test_flushes_when_row_count_is_reached(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = BufferedCsvLogger(path, HEADER, flush_rows=3, flush_interval=60.0)
+    try:
+        logger.log([1, 52.0, 13.0])
+        logger.log([2, 52.1, 13.1])
+        time.sleep(0.05)
+        assert read_rows(path) == [HEADER]  # still buffered
+        logger.log([3, 52.2, 13.2])
+        assert len(wait_for_rows(path, 4)) == 4
+    finally:
+        logger.close()
+
+
+def test_flushes_after_interval(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = BufferedCsvLogger(path, HEADER, flush_rows=1000, flush_interval=0.05)
+    try:
+        logger.log([1, 52.0, 13.0])
+        assert wait_for_rows(path, 2) == [HEADER, ["1", "52.0", "13.0"]]
+    finally:
+        logger.close()
+
+
+def test_close_writes_the_rest(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = BufferedCsvLogger(path, HEADER, flush_rows=1000, flush_interval=60.0)
+    for i in range(5):
+        logger.log([i, 52.0, 13.0])
+    assert read_rows(path) == [HEADER]
+    logger.close()
+    assert len(read_rows(path)) == 6
+    assert logger.file.closed
+    logger.close()  # second close is a no-op
+
+
+def test_header_written_exactly_once(tmp_path):
+    path = tmp_path / "log.csv"
+    logger = BufferedCsvLogger(path, HEADER, flush_rows=2, flush_interval=0.01)
+    for i in range(10):
+        logger.log([i, 52.0, 13.0])
+        logger.flush()
+    logger.close()
+    rows = read_rows(path)
+    assert rows.count(HEADER) == 1
+    assert rows[0] == HEADER
+    assert [row[0] for row in rows[1:]] == [str(i) for i in range(10)]
+
+    # Appending without a header keeps the existing one
+    logger = BufferedCsvLogger(path, None, mode="a")
+    logger.log([10, 52.0, 13.0])
+    logger.close()
+    rows = read_rows(path)
+    assert rows.count(HEADER) == 1
+    assert len(rows) == 12
@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from navigation.distance_bearing import (calculate_bearing, distance_bearing, fast_distance_bearing, from_local,
+                                         haversine, to_local)
+
+BERLIN = (52.4764387, 13.4584166)
+
+
+def test_haversine_one_degree_of_latitude():
+    assert haversine(0.0, 0.0, 1.0, 0.0) == pytest.approx(111195, rel=1e-4)
+    assert haversine(*BERLIN, *BERLIN) == 0.0
+    assert isinstance(haversine(0.0, 0.0, 1.0, 0.0), float)
+
+
+def test_bearing_cardinal_directions():
+    assert calculate_bearing(0, 0, 1, 0) == pytest.approx(0)
+    assert calculate_bearing(0, 0, 0, 1) == pytest.approx(90)
+    assert calculate_bearing(0, 0, -1, 0) == pytest.approx(180)
+    assert calculate_bearing(0, 0, 0, -1) == pytest.approx(270)
+
+
+def test_distance_bearing_matches_scalar_functions():
+    waypoints = [(52.4765, 13.4590), (52.4750, 13.4570), (52.4770, 13.4584)]
+    distances, bearings = distance_bearing(*BERLIN, waypoints)
+    assert distances.shape == (3,)
+    for (lat, lon), d, b in zip(waypoints, distances, bearings):
+        assert d == pytest.approx(haversine(*BERLIN, lat, lon))
+        assert b == pytest.approx(calculate_bearing(*BERLIN, lat, lon))
+
+    many_d, _ = distance_bearing(np.array([BERLIN[0]] * 4), np.array([BERLIN[1]] * 4), waypoints)
+    assert many_d.shape == (4, 3)
+
+
+def test_fast_path_close_to_great_circle_at_rover_range():
+    waypoints = [(52.4765, 13.4590), (52.4750, 13.4570), (52.4800, 13.4650)]
+    exact_d, exact_b = distance_bearing(*BERLIN, waypoints)
+    fast_d, fast_b = fast_distance_bearing(BERLIN[0], BERLIN[1], waypoints)
+    np.testing.assert_allclose(fast_d, exact_d, atol=0.05)
+    np.testing.assert_allclose(fast_b, exact_b, atol=0.05)
+
+
+def test_local_projection_round_trip():
+    east, north = to_local(52.4770, 13.4600, *BERLIN)
+    lat, lon = from_local(east, north, *BERLIN)
+    assert (lat, lon) == (pytest.approx(52.4770), pytest.approx(13.4600))
+    assert north > 0 and east > 0
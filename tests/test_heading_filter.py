@@ -0,0 +1,72 @@
+import pytest
+
+from navigation.distance_bearing import from_local
+from navigation.heading_filter import HeadingEstimator
+
+REF = (52.4764, 13.4584)
+
+
+def feed_fix(estimator, east, north, t):
+    lat, lon = from_local(float(east), float(north), *REF)
+    estimator.update_fix(float(lat), float(lon), float(t))
+
+
+def test_first_compass_reading_sets_heading():
+    estimator = HeadingEstimator()
+    estimator.update_compass(123.0)
+    assert estimator.heading == pytest.approx(123.0)
+
+
+def test_course_blends_with_compass_by_speed():
+    estimator = HeadingEstimator(course_gain=0.5, min_speed=0.5)
+    estimator.update_compass(0.0)
+    estimator.update_course(90.0, 0.2)  # too slow, ignored
+    assert estimator.heading == pytest.approx(0.0)
+    estimator.update_course(90.0, 0.5)  # half gain below 2 * min_speed
+    assert estimator.heading == pytest.approx(22.5)
+    estimator.update_course(90.0, 5.0)
+    assert estimator.heading == pytest.approx(22.5 + 0.5 * 67.5)
+
+
+def test_blend_wraps_around_north():
+    estimator = HeadingEstimator(compass_gain=0.3, course_gain=0.5)
+    estimator.update_compass(350.0)
+    estimator.update_compass(10.0)
+    assert estimator.heading == pytest.approx(356.0)
+
+    estimator = HeadingEstimator(compass_gain=0.3, course_gain=0.5)
+    estimator.update_compass(10.0)
+    estimator.update_compass(350.0)
+    assert estimator.heading == pytest.approx(4.0)
+    estimator.update_course(340.0, 5.0)
+    assert estimator.heading == pytest.approx(352.0)
+
+
+def test_predict_wraps_around_north():
+    estimator = HeadingEstimator()
+    estimator.update_compass(350.0)
+    estimator.predict(20.0, 1.0)
+    assert estimator.heading == pytest.approx(10.0)
+    estimator.predict(-30.0, 1.0)
+    assert estimator.heading == pytest.approx(340.0)
+
+
+def test_fix_displacement_gives_heading():
+    estimator = HeadingEstimator(min_move=2.0)
+    for t in range(8):
+        feed_fix(estimator, t, 0.0, t)  # east at 1 m/s
+    assert estimator.heading == pytest.approx(90.0, abs=1.0)
+    assert estimator.speed() == pytest.approx(1.0, abs=0.1)
+
+
+def test_stale_fix_falls_back_to_compass():
+    estimator = HeadingEstimator(min_move=2.0)
+    for t in range(10):
+        feed_fix(estimator, 0.0, t, t)  # north at 1 m/s
+    assert estimator.heading == pytest.approx(0.0, abs=1.0)
+
+    # The receiver keeps repeating its last position while the compass says east
+    for t in range(10, 25):
+        feed_fix(estimator, 0.0, 9.0, t)
+        estimator.update_compass(90.0)
+    assert estimator.heading == pytest.approx(90.0, abs=2.0)
@@ -0,0 +1,95 @@
+import pytest
+
+from groundstation.binary_frame import FRAME_ACK, FRAME_COMMAND, FrameDecoder, encode_frame
+from groundstation.command_channel import CommandChannel
+from groundstation.link_metrics import LinkMetrics
+from groundstation.telemetry_ingest import TelemetryIngest
+
+
+def test_loss_duplicates_and_reordering(clock):
+    metrics = LinkMetrics(clock=clock)
+    for seq in [0, 1, 2, 2, 5, 4, 6]:
+        metrics.telemetry_received(seq)
+    s = metrics.snapshot()
+    assert (s.telemetry_received, s.telemetry_lost, s.duplicates, s.reordered) == (6, 1, 1, 1)
+    assert s.telemetry_loss == pytest.approx(1 / 7)
+
+
+def test_sequence_wraps_without_loss(clock):
+    metrics = LinkMetrics(clock=clock)
+    for seq in [65534, 65535, 0, 1]:
+        metrics.telemetry_received(seq)
+    assert metrics.snapshot().telemetry_lost == 0
+
+
+def test_counter_restart_resyncs(clock):
+    metrics = LinkMetrics(clock=clock)
+    for seq in list(range(1000, 1010)) + list(range(0, 20)):
+        metrics.telemetry_received(seq)
+    metrics.telemetry_received(22)
+    s = metrics.snapshot()
+    assert (s.resyncs, s.reordered, s.telemetry_lost) == (1, 0, 2)
+
+
+def test_loss_covers_the_window_only(clock):
+    metrics = LinkMetrics(clock=clock, window=5.0)
+    metrics.telemetry_received(0)
+    metrics.telemetry_received(10)  # 9 lost
+    clock.now = 10.0
+    metrics.telemetry_received(11)
+    s = metrics.snapshot()
+    assert s.telemetry_loss == 0.0
+    assert s.telemetry_lost == 9
+
+
+def test_round_trip_and_ack_timeout(clock):
+    metrics = LinkMetrics(clock=clock, ack_timeout=2.0)
+    metrics.command_sent(9, seq=1)
+    metrics.command_sent(9, seq=2)
+    clock.now = 0.05
+    assert metrics.ack_received(1) == pytest.approx(0.05)
+    assert metrics.ack_received(7) is None
+    clock.now = 3.0
+    s = metrics.snapshot()
+    assert s.ack_timeouts == 1
+    assert s.acks_pending == 0
+
+
+def test_rates_and_buffer_depth(clock):
+    metrics = LinkMetrics(clock=clock, window=2.0)
+    metrics.command_sent(10)
+    metrics.bytes_received(100)
+    metrics.buffer_depth(rx_waiting=42, tx_waiting=3)
+    s = metrics.snapshot()
+    assert (s.tx_bps, s.rx_bps, s.rx_buffer, s.tx_buffer) == (5.0, 50.0, 42, 3)
+    clock.now = 5.0
+    assert metrics.snapshot().rx_bps == 0.0
+
+
+def test_framed_commands_carry_sequence_numbers(port):
+    metrics = LinkMetrics()
+    channel = CommandChannel(port, metrics=metrics, framed=True)
+    channel.set_drive("W")
+    channel.poll()
+    channel.send_aux("op")
+    channel.poll()
+    frames = FrameDecoder().feed(port.written)
+    assert [(f.type, f.seq, f.fields["CMD"]) for f in frames] == [
+        (FRAME_COMMAND, 0, "W"), (FRAME_COMMAND, 1, "o"), (FRAME_COMMAND, 2, "p")]
+    assert sorted(metrics.pending) == [0, 1, 2]
+
+
+def test_ingest_reports_sequence_and_acks():
+    metrics = LinkMetrics()
+    metrics.command_sent(9, seq=0)
+    ingest = TelemetryIngest(None, codec=FrameDecoder(), metrics=metrics)
+    stream = b"".join(encode_frame(FRAME_ACK, seq, {"ACK": 0}) for seq in (0, 1, 3))
+    ingest.feed(stream)
+    s = metrics.snapshot()
+    assert (s.telemetry_received, s.telemetry_lost, s.acks_pending) == (3, 1, 0)
+    assert s.rtt_ms is not None
+    assert s.rx_bps > 0
+
+    text = LinkMetrics()
+    TelemetryIngest(None, metrics=text).feed(b"TEMP:21,SEQ:1\nTEMP:22,SEQ:3\n")
+    assert text.snapshot().telemetry_lost == 1
@@ -0,0 +1,70 @@
+import pytest
+
+from navigation.distance_bearing import from_local
+from navigation.mission import Mission, dedupe_waypoints, load_waypoints
+
+REF = (52.4760, 13.4570)
+
+
+def local(east, north, name):
+    lat, lon = from_local(east, north, *REF)
+    return float(lat), float(lon), name
+
+
+# Straight line north: 0 m, 20 m, 40 m
+ROUTE = [local(0, 0, "a"), local(0, 20, "b"), local(0, 40, "c")]
+
+
+def test_load_and_dedupe(tmp_path):
+    path = tmp_path / "route.txt"
+    path.write_text("52.1, 13.1, start\n\nnot a line\n52.1, 13.1, again\nx, y\n52.2, 13.2\n")
+    waypoints = load_waypoints(str(path))
+    assert waypoints == [(52.1, 13.1, "start"), (52.1, 13.1, "again"), (52.2, 13.2, "6")]
+    assert [w[2] for w in dedupe_waypoints(waypoints)] == ["start", "6"]
+
+
+def test_duplicates_are_skipped_first_one_kept():
+    mission = Mission(ROUTE + [local(0, 40.1, "d")])
+    assert [w[2] for w in mission.waypoints] == ["a", "b", "c"]
+    assert mission.skipped == 1
+
+
+def test_events_and_completion():
+    events = []
+    mission = Mission(ROUTE, listeners=[events.append])
+    for north in range(0, 42, 2):
+        lat, lon, _ = local(0.5, north, None)
+        guidance = mission.update(lat, lon, t=north)
+        if guidance is None:
+            break
+    assert mission.done
+    assert [(e.kind, e.name) for e in events] == [
+        ("started", "a"), ("waypoint", "a"), ("waypoint", "b"), ("waypoint", "c"), ("completed", "c")]
+    assert mission.update(lat, lon) is None
+
+
+def test_lookahead_target_is_ahead_on_the_route():
+    mission = Mission(ROUTE, lookahead=4.0)
+    mission.update(*local(0, 0, None)[:2])  # reaches "a"
+    guidance = mission.update(*local(1, 10, None)[:2])
+    assert guidance.name == "b"
+    assert guidance.distance == pytest.approx(4.1, abs=0.2)
+    assert guidance.bearing == pytest.approx(346, abs=1)  # back towards the line, slightly west of north
+
+
+def test_passed_waypoint_counts_as_reached():
+    mission = Mission(ROUTE, arrival_radius=1.0)
+    mission.update(*local(0, 0, None)[:2])
+    guidance = mission.update(*local(2, 22, None)[:2])  # beyond "b" by more than the radius, on the next leg
+    assert guidance.name == "c"
+
+
+def test_remaining_distance_and_progress():
+    mission = Mission(ROUTE)
+    lat, lon, _ = local(0, -10, None)
+    assert mission.remaining_distance(lat, lon) == pytest.approx(50, abs=0.1)
+    assert mission.progress(lat, lon) == 0.0
+    mission.update(*local(0, 0, None)[:2])
+    lat, lon, _ = local(0, 30, None)
+    mission.update(lat, lon)  # passes "b"
+    assert mission.progress(lat, lon) == pytest.approx(0.75, abs=0.01)
@@ -0,0 +1,74 @@
+import pytest
+
+from navigation import nmea
+
+GGA = b"$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47"
+RMC_VALID = b"$GPRMC,123519,A,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W*6A"
+RMC_VOID = b"$GPRMC,123519,V,4807.038,N,01131.000,E,022.4,084.4,230394,003.1,W"
+
+
+def test_gga_position():
+    record = nmea.parse_sentence(GGA)
+    assert isinstance(record, nmea.GGA)
+    assert record.lat == pytest.approx(48.1173)
+    assert record.lon == pytest.approx(11.516667, abs=1e-6)
+    assert record.satellites == 8
+    assert nmea.position(record) == (record.lat, record.lon)
+
+
+def test_prefix_str_and_other_talkers():
+    assert nmea.parse_sentence("GPS:" + GGA.decode()) == nmea.parse_sentence(GGA)
+    body = GGA[1:GGA.index(b"*")].replace(b"GP", b"GN", 1)
+    assert isinstance(nmea.parse_sentence(b"$%s*%02X" % (body, nmea.checksum(body))), nmea.GGA)
+
+
+def test_bad_checksum_is_rejected():
+    assert nmea.parse_sentence(GGA[:-2] + b"00") is None
+
+
+def test_require_checksum():
+    assert nmea.parse_sentence(RMC_VOID, require_checksum=True) is None
+    assert nmea.parse_sentence(RMC_VOID) is not None
+
+
+def test_southern_western_hemispheres():
+    line = b"$GPGGA,123519,3351.000,S,15112.000,W,1,05,1.0,10.0,M,0.0,M,,"
+    record = nmea.parse_sentence(line)
+    assert record.lat == pytest.approx(-33.85)
+    assert record.lon == pytest.approx(-151.2)
+
+
+def test_rmc_without_valid_fix_has_no_position():
+    record = nmea.parse_sentence(RMC_VOID)
+    assert record.valid is False
+    assert nmea.position(record) is None
+
+
+def test_format_time_needs_a_date():
+    assert nmea.format_time(nmea.parse_sentence(RMC_VALID)) == "2094-03-23 12:35:19"
+    assert nmea.format_time(nmea.parse_sentence(GGA)) is None
+
+
+def test_parse_buffer_keeps_partial_line():
+    records, leftover = nmea.parse_buffer(GGA + b"\n" + b"garbage\n" + RMC_VALID[:20])
+    assert len(records) == 1
+    assert leftover == RMC_VALID[:20]
+
+
+@pytest.mark.parametrize("length", [0, 1, 7, 8, 82, 128, 129, 300])
+def test_checksum_matches_bytewise_xor(length):
+    body = bytes((i * 37 + 11) & 0xFF for i in range(length))
+    expected = 0
+    for byte in body:
+        expected ^= byte
+    assert nmea.checksum(body) == expected
+
+
+def test_parse_buffer_validates_checksums_in_bulk():
+    buffer = b"GPS:" + GGA + b"\r\n" + GGA[:-2] + b"00\n" + RMC_VALID + b"\n" + RMC_VOID + b"\n"
+    records, leftover = nmea.parse_buffer(buffer)
+    assert [type(r) for r in records] == [nmea.GGA, nmea.RMC, nmea.RMC]
+    assert records[0] == nmea.parse_sentence(GGA)
+    assert leftover == b""
+    records, _ = nmea.parse_buffer(buffer, require_checksum=True)
+    assert len(records) == 2
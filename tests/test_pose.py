@@ -0,0 +1,71 @@
+import cv2
+import numpy as np
+import pytest
+
+from detection.pose import _rotation_to_rvec, estimate_marker_poses, marker_object_points
+
+CAMERA = np.array([[800.0, 0.0, 320.0], [0.0, 800.0, 240.0], [0.0, 0.0, 1.0]])
+DIST = np.array([0.1, -0.05, 0.001, 0.002, 0.0])
+MARKER = 0.1
+
+POSES = [
+    ([0.0, 0.0, 0.0], [0.0, 0.0, 1.0]),
+    ([0.3, -0.2, 0.1], [0.1, -0.05, 0.8]),
+    ([-0.5, 0.4, 1.2], [-0.2, 0.1, 1.5]),
+    ([0.0, 0.0, np.pi], [0.05, 0.05, 1.2]),  # upside down: the 180 degree branch
+    ([0.2, 0.1, np.pi - 1e-7], [0.0, 0.1, 0.9]),
+]
+
+
+def rotation(rvec):
+    return cv2.Rodrigues(np.asarray(rvec, dtype=np.float64))[0]
+
+
+def project(rvec, tvec, dist=None):
+    points, _ = cv2.projectPoints(marker_object_points(MARKER), np.asarray(rvec, dtype=np.float64),
+                                  np.asarray(tvec, dtype=np.float64), CAMERA, dist)
+    return points.reshape(4, 2)
+
+
+def test_batched_poses_match_ground_truth_and_solvepnp():
+    corners = np.stack([project(r, t) for r, t in POSES])
+    rvecs, tvecs = estimate_marker_poses(corners, MARKER, CAMERA)
+    assert rvecs.shape == tvecs.shape == (len(POSES), 3)
+    for (rvec, tvec), est_r, est_t, image in zip(POSES, rvecs, tvecs, corners):
+        np.testing.assert_allclose(rotation(est_r), rotation(rvec), atol=1e-6)
+        np.testing.assert_allclose(est_t, tvec, atol=1e-6)
+
+        np.testing.assert_allclose(project(est_r, est_t), image, atol=1e-4)
+
+        # SOLVEPNP_IPPE_SQUARE returns identity for the upside down marker, the iterative solver does not
+        ok, pnp_r, pnp_t = cv2.solvePnP(marker_object_points(MARKER), image, CAMERA, None)
+        assert ok
+        np.testing.assert_allclose(rotation(est_r), rotation(pnp_r), atol=1e-5)
+        np.testing.assert_allclose(est_t, pnp_t.ravel(), atol=1e-5)
+
+
+def test_distorted_corners_are_undistorted_first():
+    rvec, tvec = POSES[2]
+    rvecs, tvecs = estimate_marker_poses(project(rvec, tvec, DIST)[None], MARKER, CAMERA, DIST)
+    np.testing.assert_allclose(rotation(rvecs[0]), rotation(rvec), atol=1e-4)
+    np.testing.assert_allclose(tvecs[0], tvec, atol=1e-4)
+
+
+def test_no_markers():
+    rvecs, tvecs = estimate_marker_poses(np.empty((0, 4, 2)), MARKER, CAMERA)
+    assert rvecs.shape == tvecs.shape == (0, 3)
+
+
+@pytest.mark.parametrize("rvec", [
+    [0.0, 0.0, 0.0],
+    [1e-9, 0.0, 0.0],
+    [0.4, -0.3, 0.2],
+    [0.0, np.pi, 0.0],
+    [np.pi / np.sqrt(3)] * 3,
+    [0.0, 0.6 * (np.pi - 1e-8), 0.8 * (np.pi - 1e-8)],
+])
+def test_rotation_to_rvec_round_trips(rvec):
+    R = rotation(rvec)
+    out = _rotation_to_rvec(R[None])[0]
+    np.testing.assert_allclose(rotation(out), R, atol=1e-7)
+    assert np.linalg.norm(out) == pytest.approx(np.linalg.norm(rvec), abs=1e-7)
@@ -0,0 +1,97 @@
+import threading
+import time
+
+from navigation.serial_reader import SerialLineReader
+
+
+def parse_gps(line):
+    if not line.startswith("GPS:"):
+        return None
+    try:
+        lat, lon = line[len("GPS:"):].split(",")
+        return float(lat), float(lon)
+    except ValueError:
+        return None
+
+
+def parse_heading(line):
+    return float(line.split(":")[1])
+
+
+def make_reader(**kwargs):
+    return SerialLineReader(None, parse_gps, parse_heading, **kwargs)
+
+
+def test_line_split_across_reads():
+    reader = make_reader()
+    reader.feed(b"GPS:52.1", now=1.0)
+    reader.feed(b"2,13.", now=2.0)
+    assert reader.latest_gps() is None
+    reader.feed(b"45\r\nHead", now=3.0)
+    assert reader.latest_gps() == ((52.12, 13.45), 3.0, 1)
+    assert reader.buffer == b"Head"
+    reader.feed(b"ing: 90.5\n", now=4.0)
+    assert reader.latest_heading() == (90.5, 4.0, 1)
+
+
+def test_several_lines_in_one_read():
+    reader = make_reader()
+    reader.feed(b"GPS:1,2\nHeading: 10\nnoise\nGPS:3,4\nHeading: 20\nGPS:5", now=1.0)
+    assert reader.lines_read == 5
+    assert reader.latest_gps().value == (3.0, 4.0)
+    assert reader.latest_heading().value == 20.0
+    assert [line for _, line in reader.lines] == ["GPS:1,2", "Heading: 10", "noise", "GPS:3,4", "Heading: 20"]
+    assert reader.buffer == b"GPS:5"
+
+
+def test_overflow_keeps_the_newest_bytes():
+    reader = make_reader(max_buffer=16)
+    reader.feed(b"x" * 40)
+    assert reader.overflows == 1
+    assert len(reader.buffer) == 16
+    reader.feed(b"GPS:7,8\n")  # overflows again, the line still starts with junk and is rejected
+    assert reader.overflows == 2
+    assert reader.latest_gps() is None
+    reader.feed(b"GPS:7,8\n")
+    assert reader.latest_gps().value == (7.0, 8.0)
+
+
+def test_snapshot_sequence_numbers_advance():
+    reader = make_reader()
+    reader.feed(b"GPS:1,1\nGPS:bad\nHeading: 1\n")
+    reader.feed(b"GPS:2,2\nHeading: 2\nHeading: 3\n")
+    assert reader.latest_gps().seq == 2  # rejected lines do not count
+    assert reader.latest_heading().seq == 3
+    assert reader.wait_for_gps(after_seq=2, timeout=0.01) is None
+    assert reader.wait_for_gps(after_seq=1, timeout=0.01).value == (2.0, 2.0)
+
+
+class ChunkPort:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+        self.lock = threading.Lock()
+
+    @property
+    def in_waiting(self):
+        with self.lock:
+            return len(self.chunks[0]) if self.chunks else 0
+
+    def read(self, size):
+        with self.lock:
+            if self.chunks:
+                return self.chunks.pop(0)
+        time.sleep(0.01)  # like a port timeout
+        return b""
+
+
+def test_background_thread_delivers_fixes():
+    port = ChunkPort([b"GPS:1,", b"2\nGPS:3,4\n"])
+    reader = SerialLineReader(port, parse_gps).start()
+    try:
+        fix = reader.wait_for_gps(1, timeout=2.0)
+        assert fix is not None
+        assert fix.value == (3.0, 4.0)
+        assert fix.seq == 2
+    finally:
+        reader.stop()
+    assert reader.bytes_read == 16
@@ -0,0 +1,84 @@
+import threading
+import time
+
+from groundstation.binary_frame import FRAME_ACK, FRAME_COMMAND, FRAME_SENSORS, FrameDecoder, encode_frame
+from groundstation.station import GroundStation
+
+SENSORS = {"TEMP": 21.5, "HUM": 40.0, "PRES": 1013.0, "GAS": 50.0, "CH4": 100, "LPG": 120, "LIGHT": 300,
+           "LAT": 52.4763, "LON": 13.4578}
+
+
+class RadioPort:
+    """Non-blocking serial port stand-in: bytes pushed by the test are read by the ingest thread."""
+
+    def __init__(self):
+        self.written = bytearray()
+        self.incoming = bytearray()
+        self.lock = threading.Lock()
+        self.closed = False
+
+    @property
+    def in_waiting(self):
+        with self.lock:
+            return len(self.incoming)
+
+    def read(self, size):
+        with self.lock:
+            data = bytes(self.incoming[:size])
+            del self.incoming[:size]
+            return data
+
+    def write(self, data):
+        with self.lock:
+            self.written += data
+
+    def push(self, data):
+        with self.lock:
+            self.incoming += data
+
+    def close(self):
+        self.closed = True
+
+
+def wait_until(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.005)
+    return True
+
+
+def test_framed_station_reports_frame_sequence_and_acks():
+    port = RadioPort()
+    station = GroundStation(port, log_dir=None, framed=True, command_tick=0.001).start()
+    subscription = station.subscribe()
+    try:
+        station.drive("W")
+        assert wait_until(lambda: b"W" in [f.fields["CMD"].encode() for f in FrameDecoder().feed(bytes(port.written))])
+        commands = [f for f in FrameDecoder().feed(bytes(port.written)) if f.type == FRAME_COMMAND]
+
+        # Rover frames share one counter: sensors 10, 11, (12 lost), 13, then the acks
+        stream = b"".join(encode_frame(FRAME_SENSORS, seq, SENSORS) for seq in (10, 11, 13))
+        stream += b"".join(encode_frame(FRAME_ACK, 14 + i, {"ACK": f.seq}) for i, f in enumerate(commands))
+        port.push(stream[:20])  # arrives in pieces like a real radio
+        port.push(stream[20:])
+        assert wait_until(lambda: station.metrics.snapshot().telemetry_received == 3 + len(commands))
+
+        s = station.metrics.snapshot()
+        assert s.telemetry_lost == 1
+        assert s.rtt_ms is not None
+        assert station.metrics.acks == len(commands)
+        assert station.ingest.packets == 3
+        assert station.ingest.link_packets == len(commands)
+        assert station.codec.malformed == 0
+
+        # Only the sensor frames reach the frontends
+        assert wait_until(lambda: subscription.records.qsize() == 3)
+        latest, count = subscription.drain()
+        assert count == 3
+        assert latest["TEMP"] == 21.5 and latest["SEQ"] == 13
+        assert "ACK" not in latest
+    finally:
+        station.stop()
+    assert port.closed
@@ -0,0 +1,55 @@
+from collections import Counter
+
+import pytest
+
+from navigation.steering import DutyCycleEncoder, Setpoint, SteeringController, speed_command
+
+
+def test_unknown_heading_stops():
+    assert SteeringController().update(None, 90, 0.1) == Setpoint(0.0, 0.0)
+
+
+def test_small_error_full_throttle_large_error_pivots():
+    controller = SteeringController()
+    ahead = controller.update(0, 5, 0.0)
+    assert ahead.throttle == 1.0
+    assert ahead.steer == pytest.approx(5 / 45.0)
+
+    behind = SteeringController().update(0, 90, 0.0)
+    assert behind.throttle == 0.0
+    assert behind.steer == 1.0
+    assert SteeringController().update(90, 0, 0.0).steer == -1.0
+
+
+def test_steer_is_rate_limited():
+    controller = SteeringController(max_steer_rate=2.0)
+    controller.update(0, 0, 0.0)
+    setpoint = controller.update(0, 90, 0.1)
+    assert setpoint.steer == pytest.approx(0.2)
+
+
+def test_integral_is_clamped():
+    controller = SteeringController(kp=0.0, ki=0.1, integral_limit=0.3, max_steer_rate=100)
+    for _ in range(100):
+        setpoint = controller.update(0, 30, 1.0)
+    assert setpoint.steer == pytest.approx(0.3)
+
+
+def test_duty_cycle_averages_match_setpoint():
+    encoder = DutyCycleEncoder()
+    counts = Counter(encoder.next(Setpoint(0.5, 0.25)) for _ in range(400))
+    assert counts["forward"] == pytest.approx(200, abs=2)
+    assert counts["right"] == pytest.approx(100, abs=2)
+    assert counts["left"] == 0
+
+
+def test_duty_cycle_full_throttle_never_stops():
+    encoder = DutyCycleEncoder()
+    assert {encoder.next_command(Setpoint(1.0, 0.0)) for _ in range(50)} == {"W"}
+    encoder.reset()
+    assert {encoder.next_command(Setpoint(0.0, 0.0)) for _ in range(50)} == {"F"}
+
+
+def test_speed_command():
+    assert speed_command(Setpoint(1.0, 0.0)) == b"M200,200\n"
+    assert speed_command(Setpoint(0.5, 0.5), max_pwm=100) == b"M100,0\n"
@@ -0,0 +1,56 @@
+import numpy as np
+
+from detection.aruco_detector import TagDetections
+from detection.tag_utils import TagDebouncer
+
+
+def feed(debouncer, frames):
+    # Returns the confirmed ids after each frame, as lists
+    return [debouncer.update(ids).tolist() for ids in frames]
+
+
+def test_confirms_after_threshold_hits():
+    debouncer = TagDebouncer(threshold=3)
+    assert feed(debouncer, [[7], [7], [7]]) == [[], [], [7]]
+    assert debouncer.is_confirmed(7)
+    assert not debouncer.is_confirmed(8)
+
+
+def test_a_miss_breaks_the_streak():
+    debouncer = TagDebouncer(threshold=3, decay=1)
+    assert feed(debouncer, [[7], [7], [], [7]]) == [[], [], [], []]
+    assert feed(debouncer, [[7]]) == [[7]]
+
+
+def test_decays_and_releases_after_misses():
+    debouncer = TagDebouncer(threshold=3, release=1, decay=1)
+    feed(debouncer, [[7], [7], [7]])
+    # Count 3: still held for two empty frames (2, 1), released at 0
+    assert feed(debouncer, [[], [], []]) == [[7], [7], []]
+    assert not debouncer.is_confirmed(7)
+
+
+def test_reacquired_after_release():
+    debouncer = TagDebouncer(threshold=3, release=1, decay=1)
+    feed(debouncer, [[7], [7], [7], [], [], []])
+    assert feed(debouncer, [[7], [7], [7]]) == [[], [], [7]]
+
+
+def test_counter_saturates():
+    debouncer = TagDebouncer(threshold=3, release=1, decay=1, max_count=5)
+    feed(debouncer, [[7]] * 50)
+    assert debouncer.counts[7] == 5
+    # A long sighting only buys max_count - release frames of hold
+    assert feed(debouncer, [[]] * 5) == [[7], [7], [7], [7], []]
+
+
+def test_accepts_tag_detections_and_id_lists():
+    debouncer = TagDebouncer(threshold=2)
+    detections = TagDetections(np.array([[3], [5]], dtype=np.int32), np.zeros((2, 4, 2)), None, None, None, None)
+    debouncer.update(detections)
+    assert debouncer.update([3, 5]).tolist() == [3, 5]
+
+    debouncer = TagDebouncer(threshold=2)
+    feed(debouncer, [[3, 3, 9999, -1], None])
+    assert debouncer.counts[3] == 1  # duplicates count once, out-of-range ids are ignored
+    assert debouncer.update(np.array([3])).tolist() == []
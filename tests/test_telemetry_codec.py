@@ -0,0 +1,37 @@
+from groundstation.telemetry_codec import HUM_RANGE, TEMP_RANGE, TelemetryCodec
+
+
+def test_key_value_packet_is_typed():
+    record = TelemetryCodec().decode_line("TEMP:25.5,HUM:40,GPS:FIX,MQ2_RAW:512.0,TAG:7")
+    assert record == {"TEMP": 25.5, "HUM": 40.0, "GPS": "FIX", "MQ2_RAW": 512, "TAG": 7}
+
+
+def test_positional_packet():
+    record = TelemetryCodec().decode_line("TELEMETRY,21.25,55.5,3,12000")
+    assert record == {"TEMP": 21.25, "HUM": 55.5, "TAG": 3, "TIMESTAMP": 12000}
+
+
+def test_counters_for_bad_input():
+    codec = TelemetryCodec()
+    assert codec.decode_line("GARBAGE") is None
+    assert codec.decode_line("TELEMETRY,1,2") is None
+    assert codec.decode_line("TEMP:hot,NEW:1") == {"TEMP": "hot", "NEW": "1"}
+    assert codec.stats() == {"packets": 1, "malformed": 2, "bad_values": 1, "unknown_keys": 1}
+
+
+def test_decode_keeps_partial_line_across_reads():
+    codec = TelemetryCodec()
+    assert codec.decode(b"TEMP:2") == []
+    records = codec.decode(b"1.5,HUM:50\n\nTEMP:2")
+    assert records == [{"TEMP": 21.5, "HUM": 50.0}]
+    assert codec.buffer == b"TEMP:2"
+    assert codec.decode(b"2\r\n") == [{"TEMP": 22.0}]
+
+
+def test_ranges():
+    codec = TelemetryCodec()
+    assert codec.in_range("TEMP", TEMP_RANGE[0]) is True
+    assert codec.in_range("HUM", HUM_RANGE[1] + 1) is False
+    assert codec.in_range("TEMP", "n/a") is None
+    assert codec.in_range("GPS", 1.0) is None
+    assert TelemetryCodec(ranges={"TEMP": (0, 5)}).in_range("TEMP", 10) is False
@@ -0,0 +1,52 @@
+import csv
+
+import numpy as np
+
+from groundstation.telemetry_store import TelemetryRecorder, export_csv, read_segment, segment_paths
+
+
+def test_round_trip(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), flush_rows=3, flush_interval=60)
+    for i in range(10):
+        recorder.log(100.0 + i, {"TEMP": 20 + i, "HUM": "45.5", "GPS": "FIX" if i % 2 else "NOFIX", "ORI": "1/2/3"})
+    recorder.close()
+
+    paths = segment_paths([str(tmp_path)])
+    assert len(paths) == 1
+    numeric, text, columns = read_segment(paths[0])
+    assert numeric[:2] == ["TEMP", "HUM"]
+    np.testing.assert_array_equal(columns["timestamp"], 100.0 + np.arange(10))
+    np.testing.assert_allclose(columns["TEMP"], 20 + np.arange(10))
+    np.testing.assert_allclose(columns["HUM"], 45.5)
+    assert np.isnan(columns["LIGHT"]).all()
+    assert list(columns["GPS"][:2]) == ["NOFIX", "FIX"]
+
+
+def test_truncated_block_is_ignored(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), flush_interval=60)
+    recorder.log(1.0, {"TEMP": 21})
+    recorder.flush()
+    recorder.log(2.0, {"TEMP": 22})
+    recorder.close()
+    path = segment_paths([str(tmp_path)])[0]
+    with open(path, "r+b") as f:
+        f.truncate(f.seek(0, 2) - 3)
+    _, _, columns = read_segment(path)
+    assert list(columns["TEMP"]) == [21.0]
+
+
+def test_rollover_and_csv_export(tmp_path):
+    recorder = TelemetryRecorder(str(tmp_path), flush_interval=60, segment_bytes=1)
+    recorder.log(1.0, {"TEMP": "25.3", "HUM": "ERR", "GPS": "FIX", "MQ2_V": 1.5})
+    recorder.flush()
+    recorder.log(2.0, {"TEMP": 26, "BME": "OK"})
+    recorder.close()
+    assert len(recorder.segments) == 2
+
+    out = tmp_path / "out.csv"
+    assert export_csv(segment_paths([str(tmp_path)]), str(out)) == 2
+    with open(out, newline="") as f:
+        rows = list(csv.reader(f))
+    assert rows[0] == ["timestamp", "TEMP", "HUM", "GPS", "LIGHT", "ORI", "BME", "MQ2_RAW", "MQ2_V"]
+    assert rows[1] == ["1.0", "25.3", "ERR", "FIX", "", "", "", "", "1.5"]
+    assert rows[2] == ["2.0", "26", "", "", "", "", "OK", "", ""]
@@ -0,0 +1,69 @@
+import os
+
+import numpy as np
+import pytest
+
+from navigation.distance_bearing import from_local
+from navigation.waypoint_store import CACHE_SUFFIX, Geofence, WaypointStore
+
+REF = (52.4760, 13.4570)
+
+
+@pytest.fixture
+def store():
+    rng = np.random.default_rng(0)
+    east, north = rng.uniform(-500, 500, (2, 2000))
+    lat, lon = from_local(east, north, *REF)
+    return WaypointStore(lat, lon, cell_size=25)
+
+
+def brute_force(store, lat, lon):
+    p = store._local(lat, lon)
+    return np.hypot(*(store.xy - p).T)
+
+
+@pytest.mark.parametrize("east,north", [(0, 0), (480, -490), (2000, 2000)])
+def test_nearest_matches_brute_force(store, east, north):
+    lat, lon = from_local(east, north, *REF)
+    indices, distances = store.nearest(float(lat), float(lon), k=5)
+    expected = np.sort(brute_force(store, float(lat), float(lon)))[:5]
+    np.testing.assert_allclose(distances, expected)
+    assert list(distances) == sorted(distances)
+
+
+def test_within_matches_brute_force(store):
+    lat, lon = from_local(30, -40, *REF)
+    indices, distances = store.within(float(lat), float(lon), 60)
+    d = brute_force(store, float(lat), float(lon))
+    assert set(indices) == set(np.flatnonzero(d <= 60))
+    assert list(distances) == sorted(distances)
+
+
+def test_empty_store():
+    store = WaypointStore([], [])
+    assert len(store.nearest(*REF)[0]) == 0
+    assert len(store.within(*REF, 10)[0]) == 0
+
+
+def test_from_file_cache_follows_source(tmp_path):
+    path = tmp_path / "route.txt"
+    path.write_text("52.1, 13.1, a\n52.2, 13.2, b\n")
+    store = WaypointStore.from_file(str(path))
+    assert store.as_waypoints() == [(52.1, 13.1, "a"), (52.2, 13.2, "b")]
+    assert os.path.isfile(str(path) + CACHE_SUFFIX)
+    assert WaypointStore.from_file(str(path)).as_waypoints() == store.as_waypoints()
+
+    path.write_text("52.3, 13.3, c\n")
+    assert WaypointStore.from_file(str(path)).as_waypoints() == [(52.3, 13.3, "c")]
+
+
+def test_geofence_contains():
+    square = [from_local(e, n, *REF) for e, n in [(-50, -50), (50, -50), (50, 50), (-50, 50)]]
+    fence = Geofence(square)
+    assert fence.contains(*REF) is True
+    assert fence.contains(*from_local(80, 0, *REF)) is False
+    lat, lon = from_local(np.array([0, 49, 51, -200]), np.array([0, 0, 0, 0]), *REF)
+    assert list(fence.contains(lat, lon)) == [True, True, False, False]
+
+    with pytest.raises(ValueError):
+        Geofence(square[:2])